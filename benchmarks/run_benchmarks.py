@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+"""Time the four checkers on a synthetic repository and compare results between versions.
+
+Each checker is timed end to end, from walking the tree to writing its
+errors, and per phase:
+
+- walk: listing the tree
+- exclude: matching paths against the exclude patterns
+- rules: checking names, or file sizes for the empty file checker
+- hashing: finding duplicate contents (duplicate checker only)
+- output: writing the errors
+
+Every measurement is repeated, with fresh checkers. Each of the repeats
+runs the checker enough times to take a share of --min-time, and the
+median of the repeats is kept, so that single slow or fast runs do not
+decide a comparison. Results are written as JSON, as time per run.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import math
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCHMARKS_DIR, '..', 'src'))
+
+from directory_checker import DirectoryChecker
+from duplicate_file_checker import DuplicateFileChecker
+from empty_file_checker import EmptyFileChecker
+from file_name_checker import FileNameChecker
+from scanner import find_all_files, find_directories
+from synthetic_repo import add_spec_arguments, generate_repo, spec_from_args
+
+RESULTS_VERSION = 2
+
+DEFAULT_REPEAT = 5
+
+# Minimum time of each measurement, in seconds, split across its repeats
+DEFAULT_MIN_TIME = 1.0
+
+# A checker this much slower than the baseline end to end counts as a regression
+DEFAULT_THRESHOLD = 0.10
+
+# ... and at least this much slower per run, in seconds; smaller changes are noise
+DEFAULT_NOISE_FLOOR = 0.005
+
+
+class PhaseTimer:
+    """Collect the wall and CPU time of named phases over several repeats, keeping the median.
+
+    Each repeat may run the phases several times; end_repeat() records the
+    average time per run of that repeat.
+    """
+
+    def __init__(self):
+        self.totals = {}
+        self.samples = {}
+
+    @contextlib.contextmanager
+    def phase(self, name: str):
+        """Time the block as one run of the named phase."""
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        yield
+        wall, cpu = self.totals.get(name, (0.0, 0.0))
+        self.totals[name] = (wall + time.perf_counter() - wall_start, cpu + time.process_time() - cpu_start)
+
+    def end_repeat(self, loops: int = 1):
+        """Record the phases timed since the last repeat, which ran them loops times."""
+        for name, (wall, cpu) in self.totals.items():
+            self.samples.setdefault(name, []).append((wall / loops, cpu / loops))
+        self.totals = {}
+
+    @property
+    def phases(self) -> Dict[str, Dict[str, float]]:
+        """Return the median wall and CPU time per run of each phase."""
+        return {name: {'wall': statistics.median(wall for wall, _ in samples),
+                       'cpu': statistics.median(cpu for _, cpu in samples)}
+                for name, samples in self.samples.items()}
+
+
+def _write_errors(errors: List[str]):
+    """Write errors the way the checkers do, to stderr."""
+    for error in errors:
+        print(error, file=sys.stderr)
+
+
+def bench_file_names(root: str, timer: PhaseTimer) -> int:
+    """Run FileNameChecker phase by phase and return the number of errors."""
+    checker = FileNameChecker()
+    with timer.phase('walk'):
+        paths = find_all_files(root)
+    with timer.phase('exclude'):
+        paths = [path for path in paths if not checker.is_excluded(path)]
+    with timer.phase('rules'):
+        errors = [error for path in paths for error in checker.check_file(path)]
+    with timer.phase('output'):
+        _write_errors(errors)
+    return len(errors)
+
+
+def bench_directory_names(root: str, timer: PhaseTimer) -> int:
+    """Run DirectoryChecker phase by phase and return the number of errors."""
+    checker = DirectoryChecker()
+    with timer.phase('walk'):
+        paths = find_directories(root)
+    with timer.phase('exclude'):
+        paths = [path for path in paths if not checker.is_excluded(path)]
+    with timer.phase('rules'):
+        errors = [error for path in paths for error in checker.check_directory(path)]
+    with timer.phase('output'):
+        _write_errors(errors)
+    return len(errors)
+
+
+def bench_empty_files(root: str, timer: PhaseTimer) -> int:
+    """Run EmptyFileChecker phase by phase and return the number of errors."""
+    checker = EmptyFileChecker()
+    with timer.phase('walk'):
+        paths = find_all_files(root)
+    with timer.phase('exclude'):
+        paths = [path for path in paths if not checker.is_excluded(path)]
+    with timer.phase('rules'):
+        errors = [error for path in paths for error in checker.check_file(path)]
+    with timer.phase('output'):
+        _write_errors(errors)
+    return len(errors)
+
+
+def bench_duplicate_files(root: str, timer: PhaseTimer) -> int:
+    """Run DuplicateFileChecker phase by phase, without its hash cache, and return the number of errors."""
+    checker = DuplicateFileChecker(cache_file='')
+    with timer.phase('walk'):
+        paths = find_all_files(root)
+    with timer.phase('exclude'):
+        paths = [path for path in paths if not checker.is_excluded(path)]
+    with timer.phase('hashing'):
+        groups = checker.find_duplicates(paths)
+    with timer.phase('output'):
+        errors = checker.duplicate_errors(groups)
+        _write_errors(errors)
+    return len(errors)
+
+
+def end_to_end(name: str, root: str) -> int:
+    """Run a checker the way its command line entry point does."""
+    if name == 'FileNameChecker':
+        return FileNameChecker().check_files(find_all_files(root))
+    if name == 'DirectoryChecker':
+        return DirectoryChecker().check_directories(find_directories(root))
+    if name == 'EmptyFileChecker':
+        return EmptyFileChecker().check_files(find_all_files(root))
+    return DuplicateFileChecker(cache_file='').check_files(find_all_files(root))
+
+
+BENCHMARKS = {
+    'FileNameChecker': bench_file_names,
+    'DirectoryChecker': bench_directory_names,
+    'EmptyFileChecker': bench_empty_files,
+    'DuplicateFileChecker': bench_duplicate_files,
+}
+
+
+def calibrate(name: str, root: str, repeat: int, min_time: float) -> int:
+    """Return how many runs each repeat needs for the measurement of a checker to last min_time."""
+    with contextlib.redirect_stderr(io.StringIO()):
+        # The first run warms the file system cache and imports
+        end_to_end(name, root)
+        start = time.perf_counter()
+        end_to_end(name, root)
+        elapsed = time.perf_counter() - start
+    if elapsed <= 0:
+        return 1
+    return max(1, math.ceil(min_time / repeat / elapsed))
+
+
+def run_benchmarks(root: str, repeat: int = DEFAULT_REPEAT, checkers: Optional[List[str]] = None,
+                   min_time: float = DEFAULT_MIN_TIME) -> Dict[str, Any]:
+    """Time each checker on the tree at root and return the results per checker."""
+    results = {}
+    for name in checkers or list(BENCHMARKS):
+        benchmark: Callable[[str, PhaseTimer], int] = BENCHMARKS[name]
+        loops = calibrate(name, root, repeat, min_time)
+        phase_timer = PhaseTimer()
+        total_timer = PhaseTimer()
+        errors = 0
+        for _ in range(repeat):
+            with contextlib.redirect_stderr(io.StringIO()):
+                for _ in range(loops):
+                    errors = benchmark(root, phase_timer)
+                with total_timer.phase('end_to_end'):
+                    for _ in range(loops):
+                        end_to_end(name, root)
+            phase_timer.end_repeat(loops)
+            total_timer.end_repeat(loops)
+        results[name] = {
+            'end_to_end': total_timer.phases['end_to_end'],
+            'phases': phase_timer.phases,
+            'errors': errors,
+            'loops': loops,
+        }
+    return results
+
+
+def git_commit() -> Optional[str]:
+    """Return the commit of the checked-out linter, if it is a git checkout."""
+    try:
+        result = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=BENCHMARKS_DIR,
+                                stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, universal_newlines=True)
+    except OSError:
+        return None
+    return result.stdout.strip() if result.returncode == 0 else None
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float = DEFAULT_THRESHOLD,
+            noise_floor: float = DEFAULT_NOISE_FLOOR) -> List[str]:
+    """Print the change of every timing against a baseline and return the end-to-end regressions."""
+    if baseline.get('version') != RESULTS_VERSION:
+        print(f"Baseline has results version {baseline.get('version')}, not {RESULTS_VERSION}; "
+              f"its timings may not be comparable", file=sys.stderr)
+    regressions = []
+    for name, result in current['checkers'].items():
+        base = baseline.get('checkers', {}).get(name)
+        if base is None:
+            continue
+        timings = [('end_to_end', base['end_to_end'], result['end_to_end'])]
+        timings.extend((phase, base['phases'][phase], timing)
+                       for phase, timing in result['phases'].items() if phase in base['phases'])
+        for label, before, after in timings:
+            change = (after['wall'] - before['wall']) / before['wall'] if before['wall'] else 0.0
+            print(f"{name:22} {label:11} {before['wall'] * 1000:10.1f} ms -> {after['wall'] * 1000:10.1f} ms  {change:+7.1%}")
+            if label == 'end_to_end' and change > threshold and after['wall'] - before['wall'] > noise_floor:
+                regressions.append(f"{name}: {change:+.1%} end to end")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None):
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description='Benchmark the checkers on a synthetic repository')
+    parser.add_argument('--root', help='Benchmark an existing tree instead of generating one')
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT,
+                        help='Repeats per measurement; the median is kept (default: %(default)s)')
+    parser.add_argument('--min-time', type=float, default=DEFAULT_MIN_TIME,
+                        help='Minimum time of each measurement in seconds; fast checkers are run several '
+                             'times per repeat (default: %(default)s)')
+    parser.add_argument('--checkers', help=f"Comma-separated checkers to run (default: {','.join(BENCHMARKS)})")
+    parser.add_argument('--output', help='Write the results as JSON to this file')
+    parser.add_argument('--compare', help='Compare with the results in this JSON file')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='End-to-end slowdown that fails --compare, as a fraction (default: %(default)s)')
+    parser.add_argument('--noise-floor', type=float, default=DEFAULT_NOISE_FLOOR,
+                        help='Smallest end-to-end slowdown per run, in seconds, that fails --compare '
+                             '(default: %(default)s)')
+    add_spec_arguments(parser)
+
+    args = parser.parse_args(argv)
+
+    checkers = args.checkers.split(',') if args.checkers else None
+    unknown = [name for name in checkers or [] if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown checkers: {', '.join(unknown)}")
+    if args.repeat < 1:
+        parser.error('--repeat must be at least 1')
+    try:
+        spec = spec_from_args(args)
+    except ValueError as e:
+        parser.error(str(e))
+
+    with tempfile.TemporaryDirectory(prefix='filename-linter-bench-') as temp_dir:
+        root = args.root
+        repo = {'root': root}
+        if root is None:
+            root = os.path.join(temp_dir, 'repo')
+            repo = {'spec': spec.to_dict(), 'counts': generate_repo(root, spec)}
+        results = {
+            'version': RESULTS_VERSION,
+            'created': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+            'commit': git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'repeat': args.repeat,
+            'min_time': args.min_time,
+            'repo': repo,
+            'checkers': run_benchmarks(root, args.repeat, checkers, args.min_time),
+        }
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+            f.write('\n')
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(baseline, results, args.threshold, args.noise_floor)
+        for regression in regressions:
+            print(f"Slower than baseline: {regression}", file=sys.stderr)
+        return 1 if regressions else 0
+
+    for name, result in results['checkers'].items():
+        phases = ', '.join(f"{phase} {timing['wall'] * 1000:.1f}" for phase, timing in result['phases'].items())
+        print(f"{name}: {result['end_to_end']['wall'] * 1000:.1f} ms end to end ({phases} ms), {result['errors']} errors")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""Deterministic generator of synthetic repositories for benchmarks."""
+
+import argparse
+import json
+import os
+import random
+import sys
+from typing import Any, Dict, List, Optional
+
+WORDS = [
+    'account', 'api', 'auth', 'billing', 'cache', 'client', 'config', 'core', 'data', 'event',
+    'gateway', 'handler', 'index', 'invoice', 'job', 'layout', 'loader', 'model', 'order', 'parser',
+    'payment', 'profile', 'queue', 'report', 'router', 'schema', 'search', 'service', 'session', 'store',
+    'stream', 'task', 'token', 'user', 'util', 'view', 'widget', 'worker',
+]
+
+EXTENSIONS = ['.md', '.py', '.txt', '.json', '.yaml', '.js', '.ts', '.html']
+
+# Relative weights of the naming styles of generated names
+DEFAULT_NAME_STYLES = {
+    'kebab': 60,
+    'snake': 15,
+    'pascal': 8,
+    'camel': 7,
+    'screaming': 3,
+    'generic': 4,
+    'invalid': 3,
+}
+
+
+class RepoSpec:
+    """Shape of a synthetic repository.
+
+    The tree has depth levels of directories below the root, each with
+    fanout subdirectories and files_per_directory files. Sizes of non-empty
+    files are log-uniform between min_size and max_size bytes.
+    """
+
+    def __init__(self, depth: int = 3, fanout: int = 4, files_per_directory: int = 20,
+                 name_styles: Optional[Dict[str, int]] = None, duplicate_ratio: float = 0.05,
+                 empty_ratio: float = 0.02, min_size: int = 64, max_size: int = 16384, seed: int = 0):
+        if min_size < 1 or max_size < min_size:
+            raise ValueError(f"invalid file sizes: min-size {min_size}, max-size {max_size}")
+        self.depth = depth
+        self.fanout = fanout
+        self.files_per_directory = files_per_directory
+        self.name_styles = dict(name_styles or DEFAULT_NAME_STYLES)
+        self.duplicate_ratio = duplicate_ratio
+        self.empty_ratio = empty_ratio
+        self.min_size = min_size
+        self.max_size = max_size
+        self.seed = seed
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the spec as a JSON-serialisable dict."""
+        return dict(vars(self))
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'RepoSpec':
+        """Create a spec from a dict such as the one to_dict() returns."""
+        return cls(**data)
+
+
+def make_name(rng: random.Random, style: str) -> str:
+    """Return a name stem in the given naming style."""
+    words = [rng.choice(WORDS) for _ in range(rng.randint(1, 3))]
+    if style == 'kebab':
+        return '-'.join(words)
+    if style == 'snake':
+        return '_'.join(words)
+    if style == 'pascal':
+        return ''.join(word.capitalize() for word in words)
+    if style == 'camel':
+        return words[0] + ''.join(word.capitalize() for word in words[1:])
+    if style == 'screaming':
+        return '_'.join(words).upper()
+    if style == 'generic':
+        return rng.choice(['file', 'temp', 'test', 'doc', 'new']) + str(rng.randint(0, 9))
+    # invalid: spaces and special characters
+    return ' '.join(words) + rng.choice(['!', '@', '#', ' copy', '(1)'])
+
+
+def generate_repo(root: str, spec: RepoSpec) -> Dict[str, int]:
+    """Create the repository described by spec under root and return its counts.
+
+    The same spec always produces the same tree, names and contents.
+    """
+    rng = random.Random(spec.seed)
+    styles = sorted(spec.name_styles)
+    weights = [spec.name_styles[style] for style in styles]
+    contents = []
+    counts = {'files': 0, 'directories': 0, 'empty_files': 0, 'duplicate_files': 0, 'bytes': 0}
+
+    def unique_name(directory: str, used: set, extension: str = '') -> str:
+        while True:
+            name = make_name(rng, rng.choices(styles, weights)[0]) + extension
+            if name not in used:
+                used.add(name)
+                return os.path.join(directory, name)
+
+    os.makedirs(root, exist_ok=True)
+    directories = [(root, 0)]
+    while directories:
+        directory, level = directories.pop()
+        used = set()
+        for _ in range(spec.files_per_directory):
+            path = unique_name(directory, used, rng.choice(EXTENSIONS))
+            draw = rng.random()
+            if draw < spec.empty_ratio:
+                data = b''
+                counts['empty_files'] += 1
+            elif draw < spec.empty_ratio + spec.duplicate_ratio and contents:
+                data = rng.choice(contents)
+                counts['duplicate_files'] += 1
+            else:
+                size = int(spec.min_size * (spec.max_size / spec.min_size) ** rng.random())
+                # A unique header keeps equally sized files from being identical
+                header = f'{counts["files"]}\n'.encode('ascii')
+                data = header + rng.getrandbits(8 * size).to_bytes(size, 'little')
+                contents.append(data)
+            with open(path, 'wb') as f:
+                f.write(data)
+            counts['files'] += 1
+            counts['bytes'] += len(data)
+
+        if level < spec.depth:
+            subdirectories = [unique_name(directory, used) for _ in range(spec.fanout)]
+            for subdirectory in subdirectories:
+                os.mkdir(subdirectory)
+                counts['directories'] += 1
+            directories.extend((subdirectory, level + 1) for subdirectory in reversed(subdirectories))
+    return counts
+
+
+def add_spec_arguments(parser: argparse.ArgumentParser):
+    """Add the options of RepoSpec to a command line parser."""
+    defaults = RepoSpec()
+    parser.add_argument('--depth', type=int, default=defaults.depth, help='Directory levels below the root (default: %(default)s)')
+    parser.add_argument('--fanout', type=int, default=defaults.fanout, help='Subdirectories per directory (default: %(default)s)')
+    parser.add_argument('--files-per-directory', type=int, default=defaults.files_per_directory,
+                        help='Files per directory (default: %(default)s)')
+    parser.add_argument('--name-styles', type=json.loads,
+                        help='JSON object of naming style weights, e.g. \'{"kebab": 9, "invalid": 1}\' '
+                             f'(styles: {", ".join(sorted(DEFAULT_NAME_STYLES))})')
+    parser.add_argument('--duplicate-ratio', type=float, default=defaults.duplicate_ratio,
+                        help='Fraction of files that copy another file (default: %(default)s)')
+    parser.add_argument('--empty-ratio', type=float, default=defaults.empty_ratio,
+                        help='Fraction of empty files (default: %(default)s)')
+    parser.add_argument('--min-size', type=int, default=defaults.min_size, help='Smallest non-empty file in bytes (default: %(default)s)')
+    parser.add_argument('--max-size', type=int, default=defaults.max_size, help='Largest file in bytes (default: %(default)s)')
+    parser.add_argument('--seed', type=int, default=defaults.seed, help='Random seed (default: %(default)s)')
+
+
+def spec_from_args(args: argparse.Namespace) -> RepoSpec:
+    """Create a spec from options added by add_spec_arguments()."""
+    return RepoSpec(depth=args.depth, fanout=args.fanout, files_per_directory=args.files_per_directory,
+                    name_styles=args.name_styles, duplicate_ratio=args.duplicate_ratio, empty_ratio=args.empty_ratio,
+                    min_size=args.min_size, max_size=args.max_size, seed=args.seed)
+
+
+def main(argv: Optional[List[str]] = None):
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description='Generate a deterministic synthetic repository for benchmarks')
+    parser.add_argument('root', help='Directory to create the repository in')
+    add_spec_arguments(parser)
+
+    args = parser.parse_args(argv)
+    try:
+        spec = spec_from_args(args)
+    except ValueError as e:
+        parser.error(str(e))
+
+    if os.path.exists(args.root) and os.listdir(args.root):
+        print(f"{args.root}: Directory is not empty", file=sys.stderr)
+        return 1
+    counts = generate_repo(args.root, spec)
+    print(json.dumps(counts))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
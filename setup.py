@@ -14,6 +14,9 @@ setup(
             'directory-linter=src.directory_checker:main',
             'empty-file-linter=src.empty_file_checker:main',
             'duplicate-file-linter=src.duplicate_file_checker:main',
+            'naming-linter=src.naming_linter:main',
+            'naming-linter-daemon=src.linter_daemon:main',
+            'naming-linter-client=src.linter_client:main',
         ],
     },
     install_requires=[
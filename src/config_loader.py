@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""Load .naming-convention.yaml with a parsed-config cache shared by all hooks."""
+
+import marshal
+import os
+from typing import Any, Optional
+
+try:
+    from .state_store import default_state_dir, write_bytes_atomic
+except ImportError:
+    from state_store import default_state_dir, write_bytes_atomic
+
+CACHE_VERSION = 1
+
+# Configs kept in the cache file; older ones are dropped first
+MAX_CACHED_CONFIGS = 16
+
+# Parsed configs of this process, keyed like the cache file, as marshal data
+# so that every caller gets its own copy
+_loaded = {}
+
+
+def default_cache_file(root_path: str = '.') -> Optional[str]:
+    """Return the config cache path inside the repository's .git directory."""
+    state_dir = default_state_dir(root_path)
+    if state_dir is None:
+        return None
+    return os.path.join(state_dir, 'config-cache.marshal')
+
+
+def load_config(config_file: str, cache_file: Optional[str] = None) -> Any:
+    """Load a YAML configuration file, or {} if it cannot be read or parsed.
+
+    Parsed configs are stored in cache_file (by default in .git/filename-linter)
+    in marshal format, keyed by the file's absolute path, mtime and content
+    hash, so repeated hook invocations skip YAML parsing entirely. Only the
+    parsed config is cached; the rule plans compiled from it hold compiled
+    regexes and closures, which marshal cannot store, so each checker
+    compiles them again.
+    """
+    try:
+        with open(config_file, 'rb') as f:
+            file_stat = os.fstat(f.fileno())
+            content = f.read()
+    except Exception:
+        return {}
+
+    import hashlib
+    path = os.path.abspath(config_file)
+    key = (file_stat.st_mtime_ns, hashlib.sha1(content).hexdigest())
+    loaded = _loaded.get(path)
+    if loaded is not None and loaded[:2] == key:
+        return marshal.loads(loaded[2])
+
+    if cache_file is None:
+        cache_file = default_cache_file('.')
+    entries = _read_cache(cache_file) if cache_file else {}
+
+    entry = entries.get(path)
+    if entry is not None and tuple(entry[:2]) == key:
+        data = entry[2]
+    else:
+        try:
+            config = _parse(content)
+        except Exception:
+            return {}
+        try:
+            data = marshal.dumps(config)
+        except ValueError:
+            # Values such as dates have no marshal form; use the config uncached
+            return config
+        if cache_file:
+            entries.pop(path, None)
+            entries[path] = [key[0], key[1], data]
+            _write_cache(cache_file, entries)
+
+    _loaded[path] = (key[0], key[1], data)
+    return marshal.loads(data)
+
+
+def _parse(content: bytes) -> Any:
+    """Parse YAML content, with the libyaml C loader when it is available."""
+    import yaml
+    loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+    return yaml.load(content, Loader=loader)
+
+
+def _read_cache(cache_file: str) -> dict:
+    """Read the cache entries, or {} if the cache is missing, stale or corrupt."""
+    try:
+        with open(cache_file, 'rb') as f:
+            cache = marshal.load(f)
+    except Exception:
+        return {}
+    if not isinstance(cache, dict) or cache.get('version') != CACHE_VERSION:
+        return {}
+    return cache.get('entries', {})
+
+
+def _write_cache(cache_file: str, entries: dict):
+    """Write the cache entries, ignoring failures; the cache is only an optimisation."""
+    while len(entries) > MAX_CACHED_CONFIGS:
+        del entries[next(iter(entries))]
+    try:
+        write_bytes_atomic(cache_file, marshal.dumps({'version': CACHE_VERSION, 'entries': entries}))
+    except OSError:
+        pass
@@ -3,246 +3,219 @@
 
 import argparse
 import os
-import re
 import sys
-import yaml
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple
+
+try:
+    from .config_loader import load_config
+    from .rule_plan import (CAMEL_CASE, GENERIC_DIRECTORY_NAMES, PASCAL_CASE, SCREAMING_SNAKE_CASE, SNAKE_CASE,
+                            check_name, compile_directory_plan, is_alphanumeric, is_kebab_case, suggest_name)
+    from .scanner import DEFAULT_EXCLUDE_PATTERNS, SCANNERS, SKIPPED_DIRECTORY_NAMES, exclude_matcher, find_directories
+    from .state_store import default_state_dir
+    from .stats import add_stats_arguments, stats_from_args, timed, timed_phase
+    from .verdict_cache import VerdictCache
+    from .verdict_store import VerdictStore, store_fingerprint
+    from .violations import ERROR, TextWriter, Violation, add_format_argument, create_writer, write_violations
+except ImportError:
+    from config_loader import load_config
+    from rule_plan import (CAMEL_CASE, GENERIC_DIRECTORY_NAMES, PASCAL_CASE, SCREAMING_SNAKE_CASE, SNAKE_CASE,
+                           check_name, compile_directory_plan, is_alphanumeric, is_kebab_case, suggest_name)
+    from scanner import DEFAULT_EXCLUDE_PATTERNS, SCANNERS, SKIPPED_DIRECTORY_NAMES, exclude_matcher, find_directories
+    from state_store import default_state_dir
+    from stats import add_stats_arguments, stats_from_args, timed, timed_phase
+    from verdict_cache import VerdictCache
+    from verdict_store import VerdictStore, store_fingerprint
+    from violations import ERROR, TextWriter, Violation, add_format_argument, create_writer, write_violations
 
 
 class DirectoryChecker:
     """Check directory names against naming conventions."""
 
-    def __init__(self, exclude_patterns=None, config_file=None, allow_unicode=False):
+    def __init__(self, exclude_patterns=None, config_file=None, allow_unicode=False, verdict_cache=None, config=None,
+                 stats=None):
         self.errors = []
         self.exclude_patterns = exclude_patterns or []
         self.allow_unicode = allow_unicode
         # Add default exclusions
-        self.exclude_patterns.extend([r'\.git/', r'__pycache__', r'\.pytest_cache', r'node_modules'])
-        self.config = self.load_config(config_file) if config_file else None
+        self.exclude_patterns.extend(DEFAULT_EXCLUDE_PATTERNS)
+        # A config already loaded by the caller is used as is
+        if config is None and config_file:
+            config = self.load_config(config_file)
+        self.config = config
         if self.config and 'exclude-patterns' in self.config:
             self.exclude_patterns.extend(self.config['exclude-patterns'])
         # Override allow_unicode from config if specified
         if self.config and 'directories' in self.config:
             self.allow_unicode = self.config['directories'].get('allow-unicode', self.allow_unicode)
+        self.plan = compile_directory_plan(self.config, self.allow_unicode)
+        self.verdict_cache = verdict_cache if verdict_cache is not None else VerdictCache()
+        # Collects timings and rule counts when set
+        self.stats = stats
 
     def check_directory(self, dirpath: str) -> List[str]:
         """Check a directory name against naming conventions."""
-        dirname = os.path.basename(dirpath)
-        errors = []
-
-        # Skip hidden directories and common directories
-        if dirname.startswith('.') or dirname in {'__pycache__', 'node_modules', '.git', '.pytest_cache'}:
-            return errors
-
         # Skip if excluded by patterns
         if self.is_excluded(dirpath):
-            return errors
-
-        if self.config:
-            return self.check_directory_with_config(dirpath, dirname)
-
-        # Default directory checks
-        return self.check_directory_default(dirpath, dirname)
-
-    def check_directory_with_config(self, dirpath: str, dirname: str) -> List[str]:
-        """Check directory using configuration rules."""
-        errors = []
-
-        # Get directory configuration section
-        dir_config = self.config.get('directories', {})
-
-        # Check spaces
-        if not dir_config.get('allow-spaces', False) and ' ' in dirname:
-            errors.append(f"{dirpath}: Directory name contains spaces")
-
-        # Check capital letters
-        if not dir_config.get('use-capital', False) and any(c.isupper() for c in dirname):
-            errors.append(f"{dirpath}: Directory name should be lowercase")
-
-        # Check length
-        min_len = dir_config.get('min-length', 1)
-        max_len = dir_config.get('max-length', 100)
-        if len(dirname) < min_len or len(dirname) > max_len:
-            errors.append(f"{dirpath}: Directory name length should be between {min_len} and {max_len}")
-
-        # Check reject patterns
-        for pattern in dir_config.get('reject-patterns', []):
-            if re.match(pattern, dirname):
-                errors.append(f"{dirpath}: Directory name matches rejected pattern: {pattern}")
-
-        # Check for Unicode characters when not allowed
-        if not self.allow_unicode and not bool(re.match(r'^[a-zA-Z0-9._-]+$', dirname)):
-            errors.append(f"{dirpath}: Directory name contains non-English characters (set allow-unicode: true to allow)")
-
-        # General directory naming
-        use_hyphen = dir_config.get('use-hyphen', True)
-        use_underscore = dir_config.get('use-underscore', False)
-        use_pascal = dir_config.get('use-pascal-case', False)
-        use_camel = dir_config.get('use-camel-case', False)
-        use_screaming = dir_config.get('use-screaming-snake-case', False)
-
-        has_underscore = '_' in dirname
-        has_hyphen = '-' in dirname
-
-        if not use_underscore and not use_screaming and has_underscore:
-            errors.append(f"{dirpath}: Underscores not allowed in directory name (use hyphens(-) instead, e.g., user-service/)")
-        if not use_hyphen and has_hyphen:
-            errors.append(f"{dirpath}: Hyphens not allowed in directory name")
-
-        # Check case styles
-        valid_case = False
-        if use_hyphen and self.check_kebab_case_directory(dirname):
-            valid_case = True
-        elif use_underscore and self.check_snake_case_directory(dirname):
-            valid_case = True
-        elif use_pascal and self.check_pascal_case_directory(dirname):
-            valid_case = True
-        elif use_camel and self.check_camel_case_directory(dirname):
-            valid_case = True
-        elif use_screaming and self.check_screaming_snake_case_directory(dirname):
-            valid_case = True
-
-        if not valid_case:
-            case_options = []
-            if use_hyphen: case_options.append('kebab-case')
-            if use_underscore: case_options.append('snake_case')
-            if use_pascal: case_options.append('PascalCase')
-            if use_camel: case_options.append('camelCase')
-            if use_screaming: case_options.append('SCREAMING_SNAKE_CASE')
-
-            if case_options:
-                errors.append(f"{dirpath}: Directory should use {' or '.join(case_options)}")
-            else:
-                errors.append(f"{dirpath}: Directory should use kebab-case (default)")
-
-        return errors
-
-    def check_directory_default(self, dirpath: str, dirname: str) -> List[str]:
-        """Default directory checking logic."""
-        errors = []
-
-        # Check for spaces
-        if ' ' in dirname:
-            errors.append(f"{dirpath}: Directory name contains spaces")
-
-        # Check for special characters
-        if self.allow_unicode:
-            if not bool(re.match(r'^[a-zA-Z0-9çğıöşüÇĞIİÖŞÜâêîôûÂÊÎÔÛ._-]+$', dirname, re.UNICODE)):
-                errors.append(f"{dirpath}: Directory name contains disallowed special characters")
-        else:
-            if not bool(re.match(r'^[a-zA-Z0-9._-]+$', dirname)):
-                errors.append(f"{dirpath}: Directory name contains non-English characters (set allow-unicode: true to allow)")
+            return []
 
-        # Check if descriptive
-        if not self.is_descriptive_directory(dirname):
-            errors.append(f"{dirpath}: Directory name is not descriptive enough")
+        dirname = os.path.basename(dirpath)
+        return [f"{dirpath}: {message}" for _, message in self.check_name(dirname)]
 
-        # Check kebab-case for directories
-        if not self.check_kebab_case_directory(dirname):
-            errors.append(f"{dirpath}: Directory should use kebab-case (use hyphens(-) between words, e.g., user-service/)")
+    def directory_violations(self, dirpath: str, suggest: bool = True) -> List[Violation]:
+        """Return the naming violations of a directory, with a suggested name if suggest is set."""
+        if self.is_excluded(dirpath):
+            return []
 
-        # Check if uppercase
-        if any(c.isupper() for c in dirname):
-            errors.append(f"{dirpath}: Directory name should be lowercase")
+        dirname = os.path.basename(dirpath)
+        verdict = self.check_name(dirname)
+        if not verdict:
+            return []
+        suggestion = suggest_name(self.plan, dirname, has_suffix=False) if suggest else None
+        return [Violation(dirpath, 'directories', rule_id, ERROR, message, suggestion) for rule_id, message in verdict]
+
+    def check_name(self, dirname: str) -> Tuple[Tuple[str, str], ...]:
+        """Return (rule ID, message) for each naming rule a directory name violates."""
+        # Skip hidden directories and common directories
+        if dirname.startswith('.') or dirname in SKIPPED_DIRECTORY_NAMES:
+            return ()
 
-        return errors
+        verdict = self.verdict_cache.get(dirname, self.plan.fingerprint)
+        if verdict is None:
+            verdict = tuple(check_name(self.plan, dirname, dirname))
+            self.verdict_cache.put(dirname, self.plan.fingerprint, verdict)
+        return verdict
 
     def check_kebab_case_directory(self, dirname: str) -> bool:
         """Check if directory name follows kebab-case convention."""
-        # Reject if contains underscores
-        if '_' in dirname:
-            return False
-
-        # Allow single words without hyphens
-        if '-' not in dirname:
-            return dirname.islower() and self.is_alphanumeric_unicode(dirname.replace('.', ''))
-
-        # Check kebab-case pattern
-        if self.allow_unicode:
-            return bool(re.match(r'^[a-z0-9çğıöşüâêîôû]+(-[a-z0-9çğıöşüâêîôû]+)*$', dirname, re.UNICODE))
-        else:
-            return bool(re.match(r'^[a-z0-9]+(-[a-z0-9]+)*$', dirname))
+        return is_kebab_case(dirname, self.allow_unicode)
 
     def check_snake_case_directory(self, dirname: str) -> bool:
         """Check if directory name follows snake_case convention."""
-        return bool(re.match(r'^[a-z0-9]+(_[a-z0-9]+)*$', dirname))
+        return bool(SNAKE_CASE(dirname))
 
     def check_pascal_case_directory(self, dirname: str) -> bool:
         """Check if directory name follows PascalCase convention."""
-        return bool(re.match(r'^[A-Z][a-zA-Z0-9]*$', dirname))
+        return bool(PASCAL_CASE(dirname))
 
     def check_camel_case_directory(self, dirname: str) -> bool:
         """Check if directory name follows camelCase convention."""
-        return bool(re.match(r'^[a-z][a-zA-Z0-9]*$', dirname))
+        return bool(CAMEL_CASE(dirname))
 
     def check_screaming_snake_case_directory(self, dirname: str) -> bool:
         """Check if directory name follows SCREAMING_SNAKE_CASE convention."""
-        return bool(re.match(r'^[A-Z0-9]+(_[A-Z0-9]+)*$', dirname))
+        return bool(SCREAMING_SNAKE_CASE(dirname))
 
     def is_alphanumeric_unicode(self, text: str) -> bool:
         """Check if text contains only alphanumeric characters including Unicode characters."""
-        if self.allow_unicode:
-            return bool(re.match(r'^[a-zA-Z0-9çğıöşüÇĞIİÖŞÜâêîôûÂÊÎÔÛ]+$', text, re.UNICODE))
-        else:
-            return bool(re.match(r'^[a-zA-Z0-9]+$', text))
+        return is_alphanumeric(text, self.allow_unicode)
 
     def is_descriptive_directory(self, dirname: str) -> bool:
         """Check if directory name is descriptive (not generic)."""
-        generic_names = {
-            'dir', 'directory', 'folder', 'temp', 'tmp', 'test', 'example',
-            'sample', 'data', 'info', 'item', 'thing', 'stuff', 'misc',
-            'dir1', 'dir2', 'folder1', 'folder2', 'test1', 'test2'
-        }
-        return dirname.lower() not in generic_names
+        return dirname.lower() not in GENERIC_DIRECTORY_NAMES
 
     def load_config(self, config_file: str) -> Dict[str, Any]:
         """Load configuration from YAML file."""
-        try:
-            with open(config_file, 'r') as f:
-                return yaml.safe_load(f)
-        except Exception:
-            return {}
+        return load_config(config_file)
 
     def is_excluded(self, dirpath: str) -> bool:
         """Check if directory should be excluded based on patterns."""
-        for pattern in self.exclude_patterns:
-            if re.search(pattern, dirpath):
-                return True
-        return False
-
-    def check_directories(self, dirpaths: List[str]) -> int:
-        """Check multiple directories and return exit code."""
-        all_errors = []
-
-        for dirpath in dirpaths:
-            if os.path.isdir(dirpath) and not self.is_excluded(dirpath):
-                errors = self.check_directory(dirpath)
-                all_errors.extend(errors)
-
-        if all_errors:
-            for error in all_errors:
-                print(error, file=sys.stderr)
-            return 1
-
-        return 0
+        return exclude_matcher(self.exclude_patterns).matches(dirpath)
 
+    def store_fingerprint(self, walk_patterns: Iterable[str] = ()) -> str:
+        """Return the fingerprint of everything a stored listing depends on."""
+        return store_fingerprint(self.plan.fingerprint, tuple(self.exclude_patterns), tuple(walk_patterns))
 
-def find_directories(root_path='.', exclude_patterns=None):
-    """Find all directories in the repository."""
-    exclude_patterns = exclude_patterns or []
-    directories = []
+    def check_directories(self, dirpaths: List[str], writer=None) -> int:
+        """Check multiple directories, writing each violation as it is found, and return exit code.
 
-    for root, dirs, files in os.walk(root_path):
-        # Filter out excluded directories from further traversal
-        dirs[:] = [d for d in dirs if not any(re.search(pattern, os.path.join(root, d)) for pattern in exclude_patterns)]
+        Without a writer, errors are printed as text on stderr.
+        """
+        writer = writer if writer is not None else TextWriter()
+        return write_violations(self.iter_violations(dirpaths, writer.suggests), writer, self.stats)
 
-        for dirname in dirs:
-            dir_path = os.path.join(root, dirname)
-            # Only add if not excluded by DirectoryChecker's exclusion logic
-            if not dirname.startswith('.') and dirname not in {'__pycache__', 'node_modules', '.git', '.pytest_cache'}:
-                directories.append(dir_path)
+    def iter_violations(self, dirpaths: List[str], suggest: bool = True) -> Iterator[Violation]:
+        """Yield the naming violations of existing, not excluded directories as they are found."""
+        is_dir = timed(self.stats, 'stat', os.path.isdir)
+        is_excluded = timed(self.stats, 'exclude', self.is_excluded)
+        directory_violations = timed(self.stats, 'rules', self.directory_violations)
 
-    return directories
+        for dirpath in dirpaths:
+            if not is_dir(dirpath) or is_excluded(dirpath):
+                continue
+            yield from directory_violations(dirpath, suggest)
+
+    def check_tree(self, root_path: str, walk_patterns: Iterable[str], verdict_store: VerdictStore, writer=None) -> int:
+        """Walk root_path and check the directories found, like find_directories() and check_directories().
+
+        Each listed directory is stored in verdict_store, keyed by its stat
+        identity, with the subdirectories the walk descends into and the
+        violations of its subdirectories. On later runs, a directory whose
+        modification time is unchanged is not listed again: only the
+        directory itself is stat()ed, and its stored violations are replayed.
+        """
+        writer = writer if writer is not None else TextWriter()
+        return write_violations(self.iter_tree_violations(root_path, walk_patterns, verdict_store), writer, self.stats)
+
+    def iter_tree_violations(self, root_path: str, walk_patterns: Iterable[str],
+                             verdict_store: VerdictStore) -> Iterator[Violation]:
+        """Yield the violations of check_tree() in walk order."""
+        matcher = exclude_matcher(walk_patterns)
+        list_directory = timed(self.stats, 'walk', self._list_directory)
+        directory_violations = timed(self.stats, 'rules', self.directory_violations)
+        stack = [root_path]
+        while stack:
+            root = stack.pop()
+            try:
+                root_stat = os.stat(root)
+            except OSError:
+                continue
+            identity = VerdictStore.identity(root_stat)
+            listing = verdict_store.get(root, identity)
+            if listing is None:
+                listing = list_directory(root, matcher, directory_violations)
+                if listing is None:
+                    continue
+                verdict_store.put(root, identity, listing, root_stat)
+            if self.stats is not None:
+                self.stats.count('directories_visited')
+
+            subdirs = []
+            for item in listing:
+                # 'd/name' is a subdirectory to descend into, 'v/name/violation' a violation of one
+                kind, name = item.split('/', 1)
+                if kind == 'd':
+                    subdirs.append(os.path.join(root, name))
+                else:
+                    name, text = name.split('/', 1)
+                    yield Violation.decode(os.path.join(root, name), text)
+            stack.extend(reversed(subdirs))
+
+    def _list_directory(self, root: str, matcher, directory_violations) -> Optional[List[str]]:
+        """Return the stored listing of a directory, or None if it cannot be read.
+
+        Directories are pruned and skipped as by walk() and
+        find_directories(). Violations are kept with suggestions, so that
+        any output format can replay them.
+        """
+        try:
+            with os.scandir(root) as iterator:
+                entries = list(iterator)
+        except OSError:
+            return None
+
+        listing = []
+        for entry in entries:
+            try:
+                if not entry.is_dir() or matcher.matches(entry.path):
+                    continue
+                name = entry.name
+                if not name.startswith('.') and name not in SKIPPED_DIRECTORY_NAMES:
+                    listing.extend(f"v/{name}/{violation.encode()}" for violation in directory_violations(entry.path))
+                if not entry.is_symlink() and not matcher.prunes(entry.path):
+                    listing.append(f"d/{name}")
+            except OSError:
+                continue
+        return listing
 
 
 def main():
@@ -252,18 +225,57 @@ def main():
     parser.add_argument('--exclude', action='append', help='Exclude directories matching regex pattern')
     parser.add_argument('--config', help='Path to YAML configuration file')
     parser.add_argument('--allow-unicode', action='store_true', help='Allow non-English characters (Turkish, etc.)')
+    parser.add_argument('--jobs', type=int, help='Number of directories to scan in parallel (default: 1)')
+    parser.add_argument('--scanner', choices=SCANNERS, default='walk',
+                        help='Walk the working tree, or list files known to git (default: walk)')
+    parser.add_argument('--untracked', action='store_true', help='With --scanner git, also check untracked files that are not ignored')
+    parser.add_argument('--verdict-store', action='store_true',
+                        help='Reuse the stored listings and verdicts of directories unchanged since the last walk')
+    parser.add_argument('--verdict-store-file', help='Path to the verdict store (default: .git/filename-linter/verdicts.sqlite3)')
+    add_format_argument(parser)
+    add_stats_arguments(parser)
 
     args = parser.parse_args()
-
-    checker = DirectoryChecker(exclude_patterns=args.exclude or [], config_file=args.config, allow_unicode=args.allow_unicode)
-
-    # If no directories specified, scan the current repository
-    if not args.directories:
-        directories = find_directories('.', args.exclude or [])
+    stats = stats_from_args(args)
+    writer = create_writer(args.format, 'directory-linter')
+
+    with timed_phase(stats, 'setup'):
+        checker = DirectoryChecker(exclude_patterns=args.exclude or [], config_file=args.config,
+                                   allow_unicode=args.allow_unicode, stats=stats)
+
+    # Stored listings replace the walk; explicit directories and the git scanner are checked as usual
+    walk_patterns = args.exclude or []
+    verdict_store = None
+    if (args.verdict_store or args.verdict_store_file) and not args.directories and args.scanner == 'walk':
+        store_file = args.verdict_store_file
+        state_dir = default_state_dir('.')
+        if store_file is None and state_dir:
+            store_file = os.path.join(state_dir, 'verdicts.sqlite3')
+        if store_file:
+            with timed_phase(stats, 'store'):
+                verdict_store = VerdictStore(store_file, 'directories', checker.store_fingerprint(walk_patterns))
+
+    if verdict_store is not None:
+        exit_code = checker.check_tree('.', walk_patterns, verdict_store, writer)
     else:
-        directories = args.directories
-
-    return checker.check_directories(directories)
+        # If no directories specified, scan the current repository
+        if not args.directories:
+            with timed_phase(stats, 'walk'):
+                directories = find_directories('.', walk_patterns, args.scanner, args.untracked, args.jobs, stats)
+        else:
+            directories = args.directories
+        exit_code = checker.check_directories(directories, writer)
+    writer.close()
+    if verdict_store is not None:
+        with timed_phase(stats, 'store'):
+            verdict_store.save()
+    if stats is not None:
+        cache = checker.verdict_cache
+        stats.add_cache('verdict_cache', cache.hits, cache.misses, len(cache.entries))
+        if verdict_store is not None:
+            stats.add_cache('verdict_store', verdict_store.hits, verdict_store.misses, len(verdict_store.used))
+        stats.report(args.stats_format, args.format)
+    return exit_code
 
 
 if __name__ == '__main__':
@@ -5,105 +5,584 @@
 import argparse
 import hashlib
 import os
-import re
+import stat
 import sys
-import yaml
-from typing import List, Dict, Any, Set
+from collections import namedtuple
+from functools import partial
+from itertools import islice
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Set, Tuple
+
+try:
+    from . import git_index
+    from .config_loader import load_config
+    from .external_sort import ExternalSorter, repeated_runs
+    from .hash_cache import HashCache
+    from .hash_manifest import HashManifest
+    from .near_duplicate import NearDuplicateDetector
+    from .scanner import DEFAULT_EXCLUDE_PATTERNS, SCANNERS, exclude_matcher, find_all_files, iter_all_files
+    from .state_store import default_state_dir
+    from .stats import add_stats_arguments, stats_from_args, timed_phase
+    from .violations import ERROR, TextWriter, Violation, add_format_argument, create_writer, write_violations
+except ImportError:
+    import git_index
+    from config_loader import load_config
+    from external_sort import ExternalSorter, repeated_runs
+    from hash_cache import HashCache
+    from hash_manifest import HashManifest
+    from near_duplicate import NearDuplicateDetector
+    from scanner import DEFAULT_EXCLUDE_PATTERNS, SCANNERS, exclude_matcher, find_all_files, iter_all_files
+    from state_store import default_state_dir
+    from stats import add_stats_arguments, stats_from_args, timed_phase
+    from violations import ERROR, TextWriter, Violation, add_format_argument, create_writer, write_violations
+
+# The stat fields the hash cache and hardlink detection rely on, kept in
+# external sort records instead of full stat results
+FileIdentity = namedtuple('FileIdentity', ['st_size', 'st_dev', 'st_ino', 'st_mtime_ns'])
 
 
 class DuplicateFileChecker:
     """Check for duplicate files with identical content."""
 
-    def __init__(self, exclude_patterns=None, config_file=None, allow_duplicates=False):
+    # Bytes read from each end of a file for the partial hash stage
+    PARTIAL_HASH_SIZE = 4096
+
+    # Read buffer for full hashes; large reads keep fast disks busy
+    HASH_BLOCK_SIZE = 1024 * 1024
+
+    # Where content digests come from: reading files, or git index blob IDs
+    SOURCES = ('content', 'git-index')
+
+    # How paths linked to the same inode are treated: as ordinary
+    # duplicates, reported separately as hardlinks, or not reported
+    HARDLINK_MODES = ('duplicate', 'report', 'ignore')
+
+    def __init__(self, exclude_patterns=None, config_file=None, allow_duplicates=False, cache_file=None, jobs=None,
+                 source='content', near_duplicates=False, similarity_threshold=0.8, hardlinks='duplicate',
+                 memory_budget=None, config=None, stats=None, near_duplicate_time_budget=None):
         self.exclude_patterns = exclude_patterns or []
         self.allow_duplicates = allow_duplicates
+        self.jobs = jobs or os.cpu_count() or 1
+        self.source = source
+        self.near_duplicates = near_duplicates
+        self.similarity_threshold = similarity_threshold
+        # Seconds the near-duplicate search may take, or None for no limit
+        self.near_duplicate_time_budget = near_duplicate_time_budget
+        self.hardlinks = hardlinks
+        # Bytes of records held in memory by the bounded-memory mode
+        self.memory_budget = memory_budget
         # Add default exclusions
-        self.exclude_patterns.extend([r'\.git/', r'__pycache__', r'\.pytest_cache', r'node_modules'])
-        self.config = self.load_config(config_file) if config_file else None
+        self.exclude_patterns.extend(DEFAULT_EXCLUDE_PATTERNS)
+        # A config already loaded by the caller is used as is
+        if config is None and config_file:
+            config = self.load_config(config_file)
+        self.config = config
         if self.config and 'exclude-patterns' in self.config:
             self.exclude_patterns.extend(self.config['exclude-patterns'])
         # Override allow_duplicates from config if specified
         if self.config and 'duplicate-files' in self.config:
             self.allow_duplicates = self.config['duplicate-files'].get('allow-duplicates', self.allow_duplicates)
+            cache_file = self.config['duplicate-files'].get('cache-file', cache_file)
+            self.source = self.config['duplicate-files'].get('source', self.source)
+            self.near_duplicates = self.config['duplicate-files'].get('near-duplicates', self.near_duplicates)
+            self.similarity_threshold = self.config['duplicate-files'].get('similarity-threshold', self.similarity_threshold)
+            self.near_duplicate_time_budget = self.config['duplicate-files'].get('near-duplicate-time-budget',
+                                                                                 self.near_duplicate_time_budget)
+            self.hardlinks = self.config['duplicate-files'].get('hardlinks', self.hardlinks)
+            if 'memory-budget-mb' in self.config['duplicate-files']:
+                self.memory_budget = self.config['duplicate-files']['memory-budget-mb'] * 1024 * 1024
+        self.hash_cache = HashCache(cache_file) if cache_file else None
+        # Collects timings, bytes read and rule counts when set
+        self.stats = stats
 
     def get_file_hash(self, filepath: str) -> str:
         """Get MD5 hash of file content."""
         hash_md5 = hashlib.md5()
         try:
             with open(filepath, "rb") as f:
-                for chunk in iter(lambda: f.read(4096), b""):
+                for chunk in iter(lambda: f.read(self.HASH_BLOCK_SIZE), b""):
                     hash_md5.update(chunk)
             return hash_md5.hexdigest()
         except Exception:
             return ""
 
-    def check_files(self, filepaths: List[str]) -> int:
-        """Check for duplicate files and return exit code."""
+    def get_partial_hash(self, filepath: str, size: int) -> str:
+        """Get MD5 hash of the first and last block of file content.
+
+        Files of up to two blocks are read completely, so for them the
+        partial hash identifies the whole content.
+        """
+        hash_md5 = hashlib.md5()
+        try:
+            with open(filepath, "rb") as f:
+                hash_md5.update(f.read(self.PARTIAL_HASH_SIZE))
+                if size > self.PARTIAL_HASH_SIZE:
+                    f.seek(max(size - self.PARTIAL_HASH_SIZE, self.PARTIAL_HASH_SIZE))
+                    hash_md5.update(f.read(self.PARTIAL_HASH_SIZE))
+            return hash_md5.hexdigest()
+        except Exception:
+            return ""
+
+    def find_duplicates(self, filepaths: List[str], file_stats: Optional[List[os.stat_result]] = None) -> List[List[str]]:
+        """Find groups of files with identical content.
+
+        Files are bucketed by size first, files sharing a size are compared
+        by their partial hash, and only files whose partial hashes collide
+        are fully hashed. Groups are sorted and returned in order of their
+        first appearance in filepaths.
+
+        With the git-index source, files are grouped by the blob IDs stored
+        in the git index, and only files with unstaged changes are read.
+
+        file_stats may hold stat results already known for the files, e.g.
+        from the scanner's directory entries, to avoid stating them again.
+        """
+        return self._find_groups(filepaths, file_stats)[0]
+
+    def _find_groups(self, filepaths: List[str], file_stats: Optional[List[os.stat_result]] = None):
+        """Return (duplicate groups, hardlink groups) for the given files.
+
+        Hardlink groups are only collected when hardlinks are reported or
+        ignored; otherwise linked paths count as ordinary duplicates.
+        """
+        if self.source == 'git-index':
+            index = git_index.index_entries('.')
+            if index is not None:
+                return self._find_duplicates_in_index(filepaths, index), []
+
+        sized_files = []
+        for index, filepath in enumerate(filepaths):
+            try:
+                file_stat = file_stats[index] if file_stats is not None else os.stat(filepath)
+            except OSError:
+                continue
+            if not stat.S_ISREG(file_stat.st_mode) or self.is_excluded(filepath):
+                continue
+            sized_files.append((file_stat.st_size, index, filepath, file_stat))
+
+        hardlink_groups = []
+        if self.hardlinks != 'duplicate':
+            sized_files, hardlink_groups = self._collapse_hardlinks(sized_files)
+
+        # Stage 1: a file with a unique size cannot have a duplicate
+        candidates = [entry for group in self._collisions(sized_files, [entry[0] for entry in sized_files]) for entry in group]
+
+        # Stage 2: compare the first and last block of same-sized files
+        partial_hashes = self._hash_entries(candidates, 'partial')
+        groups = []
+        needs_full_hash = []
+        for group in self._collisions(candidates, self._keys(candidates, partial_hashes)):
+            if group[0][0] <= 2 * self.PARTIAL_HASH_SIZE:
+                # The partial hash already covered the whole file
+                groups.append(group)
+            else:
+                needs_full_hash.extend(group)
+
+        # Stage 3: fully hash files whose partial hashes collide
+        full_hashes = self._hash_entries(needs_full_hash, 'full')
+        groups.extend(self._collisions(needs_full_hash, self._keys(needs_full_hash, full_hashes)))
+
+        groups.sort(key=lambda group: group[0][1])
+        return [sorted(entry[2] for entry in group) for group in groups], hardlink_groups
+
+    def _collapse_hardlinks(self, entries):
+        """Keep one entry per inode and return (entries, sorted hardlink groups)."""
+        representatives = []
+        links = {}
+        for entry in entries:
+            inode = self._inode(entry)
+            if inode is None or inode not in links:
+                representatives.append(entry)
+                if inode is not None:
+                    links[inode] = [entry[2]]
+            else:
+                links[inode].append(entry[2])
+        return representatives, [sorted(paths) for paths in links.values() if len(paths) > 1]
+
+    def _inode(self, entry):
+        """Return (device, inode) of an entry, or None if the platform does not report one."""
+        file_stat = entry[3]
+        if file_stat is None or not file_stat.st_ino:
+            return None
+        return (file_stat.st_dev, file_stat.st_ino)
+
+    def _find_duplicates_in_index(self, filepaths: List[str], index) -> List[List[str]]:
+        """Group files by git blob ID, hashing only files that differ from the index."""
+        modified = git_index.modified_files('.') or set()
+        algorithm = 'sha1'
+        for _, object_id in index.values():
+            algorithm = git_index.object_algorithm(object_id)
+            break
+
+        entries = []
+        keys = []
+        changed_files = []
+        for position, filepath in enumerate(filepaths):
+            if self.is_excluded(filepath):
+                continue
+            path = git_index.normalize_path(filepath)
+            index_entry = index.get(path)
+            if index_entry and index_entry[0] in git_index.REGULAR_FILE_MODES and path not in modified:
+                entries.append((None, position, filepath, None))
+                keys.append(index_entry[1])
+                continue
+
+            # Untracked, modified or symlinked: hash the working tree file
+            try:
+                file_stat = os.stat(filepath)
+            except OSError:
+                continue
+            if stat.S_ISREG(file_stat.st_mode):
+                changed_files.append((file_stat.st_size, position, filepath, file_stat))
+
+        blob_ids = self._hash_entries(changed_files, 'blob-' + algorithm)
+        entries.extend(changed_files)
+        keys.extend(blob_id or None for blob_id in blob_ids)
+
+        groups = self._collisions(entries, keys)
+        groups.sort(key=lambda group: group[0][1])
+        return [sorted(entry[2] for entry in group) for group in groups]
+
+    def _hash_entries(self, entries, kind: str) -> List[str]:
+        """Get the partial or full hash of each entry, in order.
+
+        Cached digests are used where possible and the remaining files are
+        hashed on a thread pool; hashlib releases the GIL while digesting
+        large buffers, so reads and hashing overlap. Paths hardlinked to the
+        same inode are read only once.
+        """
+        digests = [None] * len(entries)
+        misses = []
+        linked = {}
+        first_link = {}
+        for i, entry in enumerate(entries):
+            if self.hash_cache is not None:
+                digests[i] = self.hash_cache.get(entry[3], kind)
+            if digests[i] is not None:
+                continue
+            inode = self._inode(entry)
+            if inode in first_link:
+                linked[i] = first_link[inode]
+                continue
+            if inode is not None:
+                first_link[inode] = i
+            misses.append(i)
+
+        missed_entries = [entries[i] for i in misses]
+        paths = [entry[2] for entry in missed_entries]
+        sizes = [entry[0] for entry in missed_entries]
+        if kind == 'partial':
+            hash_func, arguments = self.get_partial_hash, (paths, sizes)
+        elif kind == 'full':
+            hash_func, arguments = self.get_file_hash, (paths,)
+        else:
+            # Git blob IDs, e.g. 'blob-sha1'
+            hash_func, arguments = partial(git_index.blob_hash, algorithm=kind[len('blob-'):]), (paths, sizes)
+
+        with timed_phase(self.stats, 'hashing'):
+            if self.jobs > 1 and len(missed_entries) > 1:
+                # Imported here: concurrent.futures pulls in logging, which slows every start
+                from concurrent.futures import ThreadPoolExecutor
+                with ThreadPoolExecutor(max_workers=min(self.jobs, len(missed_entries))) as executor:
+                    results = list(executor.map(hash_func, *arguments))
+            else:
+                results = list(map(hash_func, *arguments))
+        if self.stats is not None:
+            self.stats.count('files_hashed', len(missed_entries))
+            # A partial hash reads at most the first and last block
+            limit = 2 * self.PARTIAL_HASH_SIZE if kind == 'partial' else None
+            self.stats.count('bytes_read', sum(min(size, limit) if limit else size for size in sizes))
+
+        for i, digest in zip(misses, results):
+            digests[i] = digest
+            if digest and self.hash_cache is not None:
+                self.hash_cache.put(entries[i][3], kind, digest)
+        for i, first in linked.items():
+            digests[i] = digests[first]
+        return digests
+
+    def _keys(self, entries, digests) -> List[Any]:
+        """Combine entry sizes with their digests; unreadable files get no key."""
+        return [(entry[0], digest) if digest else None for entry, digest in zip(entries, digests)]
+
+    def save_cache(self, prune: bool = True):
+        """Persist the hash cache; prune only after scanning the whole repository."""
+        if self.hash_cache is not None:
+            with timed_phase(self.stats, 'cache'):
+                self.hash_cache.save(prune=prune)
+
+    def _collisions(self, entries, keys) -> List[list]:
+        """Bucket entries by key and return the buckets with more than one entry."""
+        buckets = {}
+        for entry, key in zip(entries, keys):
+            if key is None:
+                continue
+            buckets.setdefault(key, []).append(entry)
+        return [bucket for bucket in buckets.values() if len(bucket) > 1]
+
+    def update_manifest(self, manifest: HashManifest, filepaths: List[str]) -> List[tuple]:
+        """Record the current stat of files in the manifest.
+
+        Deleted, excluded and non-regular files are removed from it. Returns
+        (size, position, key, stat) entries for the files that remain.
+        """
+        entries = []
+        for position, filepath in enumerate(filepaths):
+            key = manifest.key(filepath)
+            try:
+                file_stat = os.stat(filepath)
+            except OSError:
+                manifest.remove(key)
+                continue
+            if not stat.S_ISREG(file_stat.st_mode) or self.is_excluded(key):
+                manifest.remove(key)
+                continue
+            manifest.update(key, file_stat)
+            entries.append((file_stat.st_size, position, key, file_stat))
+        return entries
+
+    def find_duplicates_incremental(self, changed_files: List[str], manifest: HashManifest) -> List[List[str]]:
+        """Find duplicate groups that involve changed files.
+
+        Changed files are recorded in the manifest and compared only with
+        manifest entries of the same size. Digests are computed on demand
+        and kept in the manifest, so unchanged files are hashed at most once.
+        Groups are sorted and ordered by their first changed file.
+        """
+        changed = self.update_manifest(manifest, changed_files)
+        changed_positions = {}
+        for _, position, key, _ in changed:
+            changed_positions.setdefault(key, position)
+
+        ranked_groups = []
+        checked_sizes = set()
+        for size, _, _, _ in changed:
+            if size in checked_sizes:
+                continue
+            checked_sizes.add(size)
+
+            candidates = [entry for entry in self.update_manifest(manifest, manifest.with_size(size)) if entry[0] == size]
+            if len(candidates) < 2:
+                continue
+
+            missing = [entry for entry in candidates if manifest.digest(entry[2]) is None]
+            for entry, digest in zip(missing, self._hash_entries(missing, 'full')):
+                if digest:
+                    manifest.set_digest(entry[2], digest)
+
+            keys = [manifest.digest(entry[2]) for entry in candidates]
+            for group in self._collisions(candidates, keys):
+                positions = [changed_positions[entry[2]] for entry in group if entry[2] in changed_positions]
+                if positions:
+                    ranked_groups.append((min(positions), sorted(entry[2] for entry in group)))
+
+        ranked_groups.sort(key=lambda ranked: ranked[0])
+        return [group for _, group in ranked_groups]
+
+    def iter_duplicates_external(self, filepaths: Iterable[str], memory_budget: int) -> Iterator[Tuple[str, str]]:
+        """Find duplicates within a memory budget, yielding (filepath, original).
+
+        Runs the same size, partial hash and full hash stages as
+        find_duplicates, but passes (size, hash, path) records through
+        external sorts that spill to temporary files, so memory use does
+        not grow with the number of files. The original of a group is
+        yielded as its own (filepath, original) pair first, and groups come
+        out in the same order as from find_duplicates.
+        """
+        # Two sorters are alive at any time: one being read, one being filled
+        budget = max(memory_budget // 2, 1)
+
+        by_size = ExternalSorter(budget)
+        for index, filepath in enumerate(filepaths):
+            try:
+                file_stat = os.stat(filepath)
+            except OSError:
+                continue
+            if not stat.S_ISREG(file_stat.st_mode) or self.is_excluded(filepath):
+                continue
+            by_size.add((file_stat.st_size, index, filepath, file_stat.st_dev, file_stat.st_ino, file_stat.st_mtime_ns))
+
+        by_partial_hash = ExternalSorter(budget)
+        same_size = (record for _, record in repeated_runs(by_size, 1))
+        for records, digests in self._hash_records(same_size, 'partial'):
+            for (size, index, filepath, *identity), digest in zip(records, digests):
+                if digest:
+                    by_partial_hash.add((size, digest, index, filepath, *identity))
+
+        by_digest = ExternalSorter(budget)
+        same_partial_hash = (record for _, record in repeated_runs(by_partial_hash, 2))
+
+        def large_files():
+            # Streamed into full hashing, so only one batch is in memory
+            for size, digest, index, filepath, *identity in same_partial_hash:
+                if size <= 2 * self.PARTIAL_HASH_SIZE:
+                    # The partial hash already covered the whole file
+                    by_digest.add((size, digest, index, filepath))
+                else:
+                    yield (size, index, filepath, *identity)
+
+        for records, digests in self._hash_records(large_files(), 'full'):
+            for (size, index, filepath, *_), digest in zip(records, digests):
+                if digest:
+                    by_digest.add((size, digest, index, filepath))
+
+        # Records of a digest are sorted by index, so the first one holds
+        # the position of the group's first appearance
+        by_group = ExternalSorter(budget)
+        for first, record in repeated_runs(by_digest, 2):
+            by_group.add((first[2], record[3]))
+
+        group_index = None
+        original = None
+        for index, filepath in by_group:
+            if index != group_index:
+                group_index = index
+                original = filepath
+            yield filepath, original
+
+    def _hash_records(self, records: Iterator[tuple], kind: str, batch_size: int = 1024):
+        """Hash (size, index, path, dev, ino, mtime_ns) records in batches.
+
+        Yields (records, digests) per batch, so that at most one batch is
+        held in memory while the thread pool hashes it.
+        """
+        while True:
+            batch = list(islice(records, batch_size))
+            if not batch:
+                return
+            entries = [(size, index, filepath, FileIdentity(size, dev, ino, mtime_ns))
+                       for size, index, filepath, dev, ino, mtime_ns in batch]
+            yield batch, self._hash_entries(entries, kind)
+
+    def check_files_external(self, filepaths: Iterable[str], memory_budget: int, writer=None) -> int:
+        """Check for duplicate files within a memory budget, writing each as it is found, and return exit code."""
         if self.allow_duplicates:
             return 0
 
-        hash_to_files = {}
-        all_errors = []
+        writer = writer if writer is not None else TextWriter()
+        violations = (self._duplicate_violation(filepath, original)
+                      for filepath, original in self.iter_duplicates_external(filepaths, memory_budget))
+        return write_violations(violations, writer, self.stats)
 
-        # Build hash map
-        for filepath in filepaths:
-            if not os.path.isfile(filepath) or self.is_excluded(filepath):
-                continue
+    def find_near_duplicates(self, filepaths: List[str]) -> List[tuple]:
+        """Find pairs of similar but not identical text files."""
+        candidates = [filepath for filepath in filepaths if os.path.isfile(filepath) and not self.is_excluded(filepath)]
+        detector = NearDuplicateDetector(threshold=self.similarity_threshold, time_budget=self.near_duplicate_time_budget)
+        return detector.find_pairs(candidates)
 
-            file_hash = self.get_file_hash(filepath)
-            if file_hash:
-                if file_hash not in hash_to_files:
-                    hash_to_files[file_hash] = []
-                hash_to_files[file_hash].append(filepath)
-
-        # Find duplicates
-        for file_hash, files in hash_to_files.items():
-            if len(files) > 1:
-                files.sort()  # Sort for consistent output
-                for i, filepath in enumerate(files):
-                    if i == 0:
-                        all_errors.append(f"{filepath}: Duplicate file found (original)")
-                    else:
-                        all_errors.append(f"{filepath}: Duplicate of {files[0]}")
-
-        if all_errors:
-            for error in all_errors:
-                print(error, file=sys.stderr)
-            return 1
+    def find_errors(self, filepaths: List[str], file_stats: Optional[List[os.stat_result]] = None) -> List[str]:
+        """Return the duplicate, hardlink and near-duplicate errors of the given files."""
+        return [str(violation) for violation in self.find_violations(filepaths, file_stats)]
 
-        return 0
+    def find_violations(self, filepaths: List[str], file_stats: Optional[List[os.stat_result]] = None) -> List[Violation]:
+        """Return the duplicate, hardlink and near-duplicate violations of the given files."""
+        if self.allow_duplicates:
+            return []
+
+        groups, hardlink_groups = self._find_groups(filepaths, file_stats)
+        violations = self.duplicate_violations(groups)
+        if self.hardlinks == 'report':
+            violations.extend(self.hardlink_violations(hardlink_groups))
+        if self.near_duplicates:
+            with timed_phase(self.stats, 'near-duplicates'):
+                violations.extend(self.near_duplicate_violations(self.find_near_duplicates(filepaths)))
+        return violations
+
+    def check_files(self, filepaths: List[str], file_stats: Optional[List[os.stat_result]] = None, writer=None) -> int:
+        """Check for duplicate files, write their violations and return exit code.
+
+        Without a writer, errors are printed as text on stderr.
+        """
+        # Stat, exclusion and grouping; hashing is timed as a phase of its own
+        with timed_phase(self.stats, 'grouping'):
+            violations = self.find_violations(filepaths, file_stats)
+        return write_violations(violations, writer if writer is not None else TextWriter(), self.stats)
+
+    def check_files_incremental(self, changed_files: List[str], manifest: HashManifest, writer=None) -> int:
+        """Check changed files against the manifest and return exit code."""
+        if self.allow_duplicates:
+            return 0
+
+        return self.report_duplicates(self.find_duplicates_incremental(changed_files, manifest), writer)
+
+    def duplicate_errors(self, groups: List[List[str]]) -> List[str]:
+        """Return an error for every file of each duplicate group."""
+        return [str(violation) for violation in self.duplicate_violations(groups)]
+
+    def duplicate_violations(self, groups: List[List[str]]) -> List[Violation]:
+        """Return a violation for every file of each duplicate group."""
+        return [self._duplicate_violation(filepath, files[0]) for files in groups for filepath in files]
+
+    def _duplicate_violation(self, filepath: str, original: str) -> Violation:
+        """Return the violation of a file with the same content as original, or of original itself."""
+        if filepath == original:
+            message = "Duplicate file found (original)"
+        else:
+            message = f"Duplicate of {original}"
+        return Violation(filepath, 'duplicate-files', 'duplicate', ERROR, message, None)
+
+    def report_duplicates(self, groups: List[List[str]], writer=None) -> int:
+        """Write duplicate groups and return exit code."""
+        return write_violations(self.duplicate_violations(groups), writer if writer is not None else TextWriter(),
+                                self.stats)
+
+    def hardlink_violations(self, groups: List[List[str]]) -> List[Violation]:
+        """Return a violation for every path linked to the same file as an earlier one."""
+        return [Violation(filepath, 'duplicate-files', 'hardlink', ERROR, f"Hardlink of {files[0]}", None)
+                for files in groups for filepath in files[1:]]
+
+    def near_duplicate_violations(self, pairs: List[tuple]) -> List[Violation]:
+        """Return a violation for the second file of each near-duplicate pair."""
+        return [Violation(second, 'duplicate-files', 'near-duplicate', ERROR,
+                          f"Near-duplicate of {first} ({similarity:.0%} similar)", None)
+                for first, second, similarity in pairs]
 
     def load_config(self, config_file: str) -> Dict[str, Any]:
         """Load configuration from YAML file."""
-        try:
-            with open(config_file, 'r') as f:
-                return yaml.safe_load(f)
-        except Exception:
-            return {}
+        return load_config(config_file)
 
     def is_excluded(self, filepath: str) -> bool:
         """Check if file should be excluded based on patterns."""
-        for pattern in self.exclude_patterns:
-            if re.search(pattern, filepath):
-                return True
-        return False
+        return exclude_matcher(self.exclude_patterns).matches(filepath)
+
+
+def check_incremental(checker: DuplicateFileChecker, filenames: List[str], manifest_file: str, rebuild: bool = False,
+                      scanner: str = 'walk', untracked: bool = False, jobs: Optional[int] = None, stats=None,
+                      writer=None) -> int:
+    """Check only changed files against the stored manifest.
 
+    Without filenames, the changed files are the staged, modified and
+    untracked files reported by git, plus anything that changed between
+    the commit the manifest was synchronised with and HEAD. The manifest
+    is rebuilt from a full scan when requested, missing, or out of reach
+    of git history.
+    """
+    manifest = HashManifest(manifest_file)
+    head = git_index.head_commit('.')
+    changed = list(filenames)
 
-def find_all_files(root_path='.', exclude_patterns=None):
-    """Find all files in the repository."""
-    exclude_patterns = exclude_patterns or []
-    files = []
+    if not rebuild and manifest.loaded and manifest.head != head:
+        since = git_index.changed_between(manifest.head, head) if manifest.head and head else None
+        if since is None:
+            rebuild = True
+        else:
+            changed.extend(since)
 
-    for root, dirs, filenames in os.walk(root_path):
-        # Skip excluded directories
-        dirs[:] = [d for d in dirs if not any(re.search(pattern, os.path.join(root, d)) for pattern in exclude_patterns)]
+    if not filenames and not rebuild:
+        working_changes = git_index.working_tree_changes('.')
+        if working_changes is None:
+            rebuild = True
+        else:
+            changed.extend(working_changes)
 
-        for filename in filenames:
-            file_path = os.path.join(root, filename)
-            if not any(re.search(pattern, file_path) for pattern in exclude_patterns):
-                files.append(file_path)
+    if rebuild or not manifest.loaded:
+        manifest.clear()
+        with timed_phase(stats, 'walk'):
+            changed = find_all_files('.', checker.exclude_patterns, scanner, untracked, jobs, stats)
 
-    return files
+    exit_code = checker.check_files_incremental(changed, manifest, writer)
+    manifest.head = head
+    manifest.save()
+    return exit_code
 
 
 def main():
@@ -113,21 +592,97 @@ def main():
     parser.add_argument('--exclude', action='append', help='Exclude files matching regex pattern')
     parser.add_argument('--config', help='Path to YAML configuration file')
     parser.add_argument('--allow-duplicates', action='store_true', help='Allow duplicate files')
+    parser.add_argument('--cache-file', help='Path to the content hash cache (default: .git/filename-linter/hash-cache.json)')
+    parser.add_argument('--no-cache', action='store_true', help='Do not read or write the content hash cache')
+    parser.add_argument('--jobs', type=int,
+                        help='Number of files to hash, and directories to scan, in parallel (default: CPU count for hashing, 1 for scanning)')
+    parser.add_argument('--source', choices=DuplicateFileChecker.SOURCES, default='content',
+                        help='Compare file contents, or blob IDs from the git index (default: content)')
+    parser.add_argument('--near-duplicates', action='store_true', help='Also report similar but not identical text files')
+    parser.add_argument('--similarity-threshold', type=float, default=0.8,
+                        help='Minimum similarity (0-1) of near-duplicate files (default: 0.8)')
+    parser.add_argument('--near-duplicate-time-budget', type=float, metavar='SECONDS',
+                        help='Stop the near-duplicate search after this many seconds, with a warning (default: no limit)')
+    parser.add_argument('--hardlinks', choices=DuplicateFileChecker.HARDLINK_MODES, default='duplicate',
+                        help='Treat hardlinked paths as duplicates, report them separately, or ignore them (default: duplicate)')
+    parser.add_argument('--memory-budget-mb', type=int,
+                        help='Find exact duplicates with external sorting, using about this much memory for records')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Only check changed files against the stored hash manifest of the repository')
+    parser.add_argument('--manifest-file', help='Path to the hash manifest (default: .git/filename-linter/manifest.json)')
+    parser.add_argument('--rebuild-manifest', action='store_true', help='Rebuild the hash manifest from a full scan')
+    parser.add_argument('--scanner', choices=SCANNERS, default='walk',
+                        help='Walk the working tree, or list files known to git (default: walk)')
+    parser.add_argument('--untracked', action='store_true', help='With --scanner git, also check untracked files that are not ignored')
+    add_format_argument(parser)
+    add_stats_arguments(parser)
 
     args = parser.parse_args()
+    stats = stats_from_args(args)
+    writer = create_writer(args.format, 'duplicate-file-linter')
 
-    checker = DuplicateFileChecker(exclude_patterns=args.exclude or [], config_file=args.config, allow_duplicates=args.allow_duplicates)
+    state_dir = default_state_dir('.')
+    cache_file = args.cache_file
+    if cache_file is None and not args.no_cache and state_dir:
+        cache_file = os.path.join(state_dir, 'hash-cache.json')
+
+    with timed_phase(stats, 'setup'):
+        checker = DuplicateFileChecker(exclude_patterns=args.exclude or [], config_file=args.config,
+                                       allow_duplicates=args.allow_duplicates, cache_file=cache_file, jobs=args.jobs,
+                                       source=args.source, near_duplicates=args.near_duplicates,
+                                       similarity_threshold=args.similarity_threshold,
+                                       near_duplicate_time_budget=args.near_duplicate_time_budget, hardlinks=args.hardlinks,
+                                       memory_budget=args.memory_budget_mb * 1024 * 1024 if args.memory_budget_mb else None,
+                                       stats=stats)
+    if args.no_cache:
+        checker.hash_cache = None
+
+    exit_code = run_checks(checker, args, state_dir, stats, writer)
+    writer.close()
+    if stats is not None:
+        if checker.hash_cache is not None:
+            cache = checker.hash_cache
+            stats.add_cache('hash_cache', cache.hits, cache.misses, len(cache.used))
+        stats.report(args.stats_format, args.format)
+    return exit_code
+
+
+def run_checks(checker: DuplicateFileChecker, args: argparse.Namespace, state_dir: Optional[str], stats=None,
+               writer=None) -> int:
+    """Check the files selected by the command line arguments, write their violations and return exit code."""
+    manifest_file = args.manifest_file
+    if manifest_file is None and state_dir:
+        manifest_file = os.path.join(state_dir, 'manifest.json')
+    if (args.incremental or args.rebuild_manifest) and manifest_file:
+        exit_code = check_incremental(checker, args.filenames, manifest_file, rebuild=args.rebuild_manifest,
+                                      scanner=args.scanner, untracked=args.untracked, jobs=args.jobs, stats=stats,
+                                      writer=writer)
+        checker.save_cache(prune=False)
+        return exit_code
+
+    if checker.memory_budget:
+        files = args.filenames
+        if not files:
+            files = iter_all_files('.', checker.exclude_patterns, args.scanner, args.untracked, args.jobs, stats)
+            if stats is not None:
+                files = stats.timed_iter('walk', files)
+        exit_code = checker.check_files_external(files, checker.memory_budget, writer)
+        checker.save_cache(prune=not args.filenames)
+        return exit_code
 
     # If no files specified, scan the current repository
     if not args.filenames:
-        files = find_all_files('.', checker.exclude_patterns)
+        with timed_phase(stats, 'walk'):
+            files = find_all_files('.', checker.exclude_patterns, args.scanner, args.untracked, args.jobs, stats)
     else:
         files = args.filenames
 
     if not files:
         return 0
 
-    return checker.check_files(files)
+    exit_code = checker.check_files(files, writer=writer)
+    checker.save_cache(prune=not args.filenames)
+    return exit_code
 
 
 if __name__ == '__main__':
@@ -3,45 +3,123 @@
 
 import argparse
 import os
-import re
 import sys
-import yaml
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator, Optional
+
+try:
+    from .config_loader import load_config
+    from . import git_index
+    from .scanner import DEFAULT_EXCLUDE_PATTERNS, SCANNERS, exclude_matcher, find_all_files
+    from .stats import add_stats_arguments, stats_from_args, timed, timed_phase
+    from .violations import ERROR, TextWriter, Violation, add_format_argument, create_writer, write_violations
+except ImportError:
+    from config_loader import load_config
+    import git_index
+    from scanner import DEFAULT_EXCLUDE_PATTERNS, SCANNERS, exclude_matcher, find_all_files
+    from stats import add_stats_arguments, stats_from_args, timed, timed_phase
+    from violations import ERROR, TextWriter, Violation, add_format_argument, create_writer, write_violations
+
+EMPTY_FILE_MESSAGE = "File is empty (use --allow-empty to allow)"
 
 
 class EmptyFileChecker:
     """Check for empty files that shouldn't be committed."""
 
-    def __init__(self, exclude_patterns=None, config_file=None, allow_empty=False):
+    # Where file sizes come from: the working tree, or the git index
+    SOURCES = ('filesystem', 'git-index')
+
+    def __init__(self, exclude_patterns=None, config_file=None, allow_empty=False, source='filesystem', config=None,
+                 stats=None):
         self.exclude_patterns = exclude_patterns or []
         self.allow_empty = allow_empty
+        self.source = source
+        # Collects timings and rule counts when set
+        self.stats = stats
         # Add default exclusions
-        self.exclude_patterns.extend([r'\.git/', r'__pycache__', r'\.pytest_cache', r'node_modules'])
-        self.config = self.load_config(config_file) if config_file else None
+        self.exclude_patterns.extend(DEFAULT_EXCLUDE_PATTERNS)
+        # A config already loaded by the caller is used as is
+        if config is None and config_file:
+            config = self.load_config(config_file)
+        self.config = config
         if self.config and 'exclude-patterns' in self.config:
             self.exclude_patterns.extend(self.config['exclude-patterns'])
         # Override allow_empty from config if specified
         if self.config and 'empty-files' in self.config:
             self.allow_empty = self.config['empty-files'].get('allow-empty', self.allow_empty)
+            self.source = self.config['empty-files'].get('source', self.source)
 
     def check_file(self, filepath: str) -> List[str]:
         """Check if file is empty."""
-        errors = []
+        return [str(violation) for violation in self.file_violations(filepath)]
 
+    def file_violations(self, filepath: str) -> List[Violation]:
+        """Return the violation of a file if it is empty and may not be."""
         if not os.path.isfile(filepath) or self.is_excluded(filepath):
-            return errors
+            return []
 
         # Check if file is empty
-        if os.path.getsize(filepath) == 0:
-            # Some files are allowed to be empty
-            filename = os.path.basename(filepath)
-            if self.is_allowed_empty(filename):
-                return errors
-
-            if not self.allow_empty:
-                errors.append(f"{filepath}: File is empty (use --allow-empty to allow)")
+        if os.path.getsize(filepath) != 0:
+            return []
+        return self.empty_violations(filepath)
+
+    def check_empty_path(self, filepath: str) -> List[str]:
+        """Check a path already known to be an empty file."""
+        return [str(violation) for violation in self.empty_violations(filepath)]
+
+    def empty_violations(self, filepath: str) -> List[Violation]:
+        """Return the violation of a path already known to be an empty file, if it may not be empty."""
+        # Some files are allowed to be empty
+        if self.allow_empty or self.is_excluded(filepath) or self.is_allowed_empty(os.path.basename(filepath)):
+            return []
+        return [Violation(filepath, 'empty-files', 'empty-file', ERROR, EMPTY_FILE_MESSAGE, None)]
+
+    def find_empty_in_index(self) -> Optional[List[str]]:
+        """Return staged regular files whose blob is empty, or None outside a git repository.
+
+        A single git ls-files call replaces the walk and the per-file stat
+        calls; the index reflects what is about to be committed.
+        """
+        entries = git_index.index_entries('.')
+        if entries is None:
+            return None
+        return self._empty_index_paths(entries)
+
+    def _empty_index_paths(self, entries) -> List[str]:
+        """Return the paths of regular files whose index blob is the empty blob."""
+        return [os.path.join('.', path) for path, (mode, object_id) in entries.items()
+                if mode in git_index.REGULAR_FILE_MODES and object_id in git_index.EMPTY_BLOB_IDS]
+
+    def check_index(self, filepaths: Optional[List[str]] = None, writer=None) -> Optional[int]:
+        """Check empty files using the git index and return exit code.
+
+        Without filepaths, every staged file is checked. Given filepaths
+        that are not in the index are checked on the filesystem. Returns
+        None outside a git repository. Without a writer, errors are printed
+        as text on stderr.
+        """
+        if self.allow_empty:
+            return 0
+
+        entries = git_index.index_entries('.')
+        if entries is None:
+            return None
+
+        writer = writer if writer is not None else TextWriter()
+        return write_violations(self._index_violations(entries, filepaths), writer, self.stats)
+
+    def _index_violations(self, entries, filepaths: Optional[List[str]]) -> Iterator[Violation]:
+        """Yield the violations of empty files staged in the index, or of the given files."""
+        if filepaths is None:
+            for filepath in self._empty_index_paths(entries):
+                yield from self.empty_violations(filepath)
+            return
 
-        return errors
+        for filepath in filepaths:
+            index_entry = entries.get(git_index.normalize_path(filepath))
+            if index_entry is None or index_entry[0] not in git_index.REGULAR_FILE_MODES:
+                yield from self.file_violations(filepath)
+            elif index_entry[1] in git_index.EMPTY_BLOB_IDS:
+                yield from self.empty_violations(filepath)
 
     def is_allowed_empty(self, filename: str) -> bool:
         """Check if file is allowed to be empty."""
@@ -53,50 +131,25 @@ class EmptyFileChecker:
 
     def load_config(self, config_file: str) -> Dict[str, Any]:
         """Load configuration from YAML file."""
-        try:
-            with open(config_file, 'r') as f:
-                return yaml.safe_load(f)
-        except Exception:
-            return {}
+        return load_config(config_file)
 
     def is_excluded(self, filepath: str) -> bool:
         """Check if file should be excluded based on patterns."""
-        for pattern in self.exclude_patterns:
-            if re.search(pattern, filepath):
-                return True
-        return False
-
-    def check_files(self, filepaths: List[str]) -> int:
-        """Check multiple files and return exit code."""
-        all_errors = []
+        return exclude_matcher(self.exclude_patterns).matches(filepath)
 
-        for filepath in filepaths:
-            errors = self.check_file(filepath)
-            all_errors.extend(errors)
+    def check_files(self, filepaths: List[str], writer=None) -> int:
+        """Check multiple files, writing each violation as it is found, and return exit code.
 
-        if all_errors:
-            for error in all_errors:
-                print(error, file=sys.stderr)
-            return 1
+        Without a writer, errors are printed as text on stderr.
+        """
+        writer = writer if writer is not None else TextWriter()
+        return write_violations(self.iter_violations(filepaths), writer, self.stats)
 
-        return 0
-
-
-def find_all_files(root_path='.', exclude_patterns=None):
-    """Find all files in the repository."""
-    exclude_patterns = exclude_patterns or []
-    files = []
-
-    for root, dirs, filenames in os.walk(root_path):
-        # Skip excluded directories
-        dirs[:] = [d for d in dirs if not any(re.search(pattern, os.path.join(root, d)) for pattern in exclude_patterns)]
-
-        for filename in filenames:
-            file_path = os.path.join(root, filename)
-            if not any(re.search(pattern, file_path) for pattern in exclude_patterns):
-                files.append(file_path)
-
-    return files
+    def iter_violations(self, filepaths: List[str]) -> Iterator[Violation]:
+        """Yield the violations of empty files as they are found."""
+        file_violations = timed(self.stats, 'rules', self.file_violations)
+        for filepath in filepaths:
+            yield from file_violations(filepath)
 
 
 def main():
@@ -106,21 +159,48 @@ def main():
     parser.add_argument('--exclude', action='append', help='Exclude files matching regex pattern')
     parser.add_argument('--config', help='Path to YAML configuration file')
     parser.add_argument('--allow-empty', action='store_true', help='Allow empty files')
+    parser.add_argument('--source', choices=EmptyFileChecker.SOURCES, default='filesystem',
+                        help='Check files in the working tree, or blobs staged in the git index (default: filesystem)')
+    parser.add_argument('--jobs', type=int, help='Number of directories to scan in parallel (default: 1)')
+    parser.add_argument('--scanner', choices=SCANNERS, default='walk',
+                        help='Walk the working tree, or list files known to git (default: walk)')
+    parser.add_argument('--untracked', action='store_true', help='With --scanner git, also check untracked files that are not ignored')
+    add_format_argument(parser)
+    add_stats_arguments(parser)
 
     args = parser.parse_args()
-
-    checker = EmptyFileChecker(exclude_patterns=args.exclude or [], config_file=args.config, allow_empty=args.allow_empty)
+    stats = stats_from_args(args)
+    writer = create_writer(args.format, 'empty-file-linter')
+
+    with timed_phase(stats, 'setup'):
+        checker = EmptyFileChecker(exclude_patterns=args.exclude or [], config_file=args.config, allow_empty=args.allow_empty,
+                                   source=args.source, stats=stats)
+    exit_code = run_checks(checker, args, stats, writer)
+    writer.close()
+    if stats is not None:
+        stats.report(args.stats_format, args.format)
+    return exit_code
+
+
+def run_checks(checker: EmptyFileChecker, args: argparse.Namespace, stats=None, writer=None) -> int:
+    """Check the files selected by the command line arguments, write their violations and return exit code."""
+    if checker.source == 'git-index':
+        with timed_phase(stats, 'index'):
+            exit_code = checker.check_index(args.filenames or None, writer)
+        if exit_code is not None:
+            return exit_code
 
     # If no files specified, scan the current repository
     if not args.filenames:
-        files = find_all_files('.', checker.exclude_patterns)
+        with timed_phase(stats, 'walk'):
+            files = find_all_files('.', checker.exclude_patterns, args.scanner, args.untracked, args.jobs, stats)
     else:
         files = args.filenames
 
     if not files:
         return 0
 
-    return checker.check_files(files)
+    return checker.check_files(files, writer)
 
 
 if __name__ == '__main__':
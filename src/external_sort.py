@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""External merge sort for record streams that may not fit in memory."""
+
+import heapq
+import os
+import shutil
+from typing import Iterator, Tuple
+
+
+class ExternalSorter:
+    """Sort tuples of strings and integers within a memory budget.
+
+    Records are buffered until their estimated size reaches the budget,
+    then sorted and spilled to a temporary run file. Iterating merges the
+    runs lazily, so only one record per run is held in memory.
+    """
+
+    # Size in bytes of a buffered record, measured with tracemalloc on
+    # CPython 3.11: the tuple header and its slot in the buffer list, then
+    # per field a pointer and an int or str object, plus the characters of
+    # each string. A (size, index, path, dev, ino, mtime_ns) record with a
+    # 33-character path takes about 314 bytes and is estimated at 321.
+    RECORD_OVERHEAD = 48
+    FIELD_OVERHEAD = 40
+
+    # Runs merged at once; more open files could exhaust file descriptors
+    MAX_RUNS = 64
+
+    def __init__(self, memory_budget: int):
+        self.memory_budget = memory_budget
+        self.buffer = []
+        self.buffer_size = 0
+        self.runs = []
+        self.run_count = 0
+        self.temp_dir = None
+
+    def add(self, record: tuple):
+        """Add a record, spilling the buffer to disk when it is over budget."""
+        self.buffer.append(record)
+        self.buffer_size += self.record_size(record)
+        if self.buffer_size >= self.memory_budget:
+            self._spill()
+
+    def record_size(self, record: tuple) -> int:
+        """Return the estimated memory use of a buffered record, in bytes."""
+        return (self.RECORD_OVERHEAD + self.FIELD_OVERHEAD * len(record)
+                + sum(len(field) for field in record if isinstance(field, str)))
+
+    def _spill(self):
+        """Write the sorted buffer to a new run file."""
+        if len(self.runs) >= self.MAX_RUNS:
+            self._compact()
+        self.buffer.sort()
+        self.runs.append(self._write_run(self.buffer))
+        self.buffer = []
+        self.buffer_size = 0
+
+    def _write_run(self, records) -> str:
+        """Write sorted records to a new run file and return its path."""
+        # Imported here: only bounded-memory runs spill, so most runs never need them
+        import json
+        import tempfile
+        if self.temp_dir is None:
+            self.temp_dir = tempfile.mkdtemp(prefix='filename-linter-sort-')
+        run_file = os.path.join(self.temp_dir, f'run-{self.run_count}.jsonl')
+        self.run_count += 1
+        with open(run_file, 'w') as f:
+            for record in records:
+                f.write(json.dumps(record))
+                f.write('\n')
+        return run_file
+
+    def _compact(self):
+        """Merge all current runs into a single run."""
+        merged = self._write_run(heapq.merge(*[self._read_run(run_file) for run_file in self.runs]))
+        for run_file in self.runs:
+            os.unlink(run_file)
+        self.runs = [merged]
+
+    def _read_run(self, run_file: str) -> Iterator[tuple]:
+        """Yield the records of a run file."""
+        import json
+        with open(run_file, 'r') as f:
+            for line in f:
+                yield tuple(json.loads(line))
+
+    def __iter__(self) -> Iterator[tuple]:
+        """Yield all records in sorted order and remove the run files."""
+        try:
+            if not self.runs:
+                self.buffer.sort()
+                records, self.buffer = self.buffer, []
+                yield from records
+                return
+            if self.buffer:
+                self._spill()
+            yield from heapq.merge(*[self._read_run(run_file) for run_file in self.runs])
+        finally:
+            self.close()
+
+    def close(self):
+        """Remove temporary run files."""
+        if self.temp_dir is not None:
+            shutil.rmtree(self.temp_dir, ignore_errors=True)
+            self.temp_dir = None
+        self.runs = []
+
+
+def repeated_runs(records: Iterator[tuple], key_length: int) -> Iterator[Tuple[tuple, tuple]]:
+    """Yield (first record of run, record) for each record in a run of two or more.
+
+    A run is a sequence of consecutive sorted records that share their
+    first key_length fields. Only the first record of the current run is
+    held in memory.
+    """
+    first = None
+    first_yielded = False
+    for record in records:
+        if first is not None and record[:key_length] == first[:key_length]:
+            if not first_yielded:
+                yield first, first
+                first_yielded = True
+            yield first, record
+        else:
+            first = record
+            first_yielded = False
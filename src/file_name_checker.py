@@ -4,11 +4,27 @@
 
 import argparse
 import os
-import re
 import sys
-import yaml
-from pathlib import Path
-from typing import List, Set, Dict, Any
+from typing import List, Set, Dict, Any, Iterator, Optional, Tuple
+
+try:
+    from .config_loader import load_config
+    from .rule_plan import (CAMEL_CASE, CONFIG_FILES, GENERIC_FILE_NAMES, NAME_CHARACTERS, PASCAL_CASE, PYTHON_FILES,
+                            SCREAMING_SNAKE_CASE, SNAKE_CASE, UNICODE_NAME_CHARACTERS, check_name, compile_file_plans,
+                            is_alphanumeric, is_kebab_case, split_name, suggest_name)
+    from .scanner import exclude_matcher
+    from .stats import add_stats_arguments, stats_from_args, timed, timed_phase
+    from .verdict_cache import VerdictCache
+    from .violations import ERROR, TextWriter, Violation, add_format_argument, create_writer, write_violations
+except ImportError:
+    from config_loader import load_config
+    from rule_plan import (CAMEL_CASE, CONFIG_FILES, GENERIC_FILE_NAMES, NAME_CHARACTERS, PASCAL_CASE, PYTHON_FILES,
+                           SCREAMING_SNAKE_CASE, SNAKE_CASE, UNICODE_NAME_CHARACTERS, check_name, compile_file_plans,
+                           is_alphanumeric, is_kebab_case, split_name, suggest_name)
+    from scanner import exclude_matcher
+    from stats import add_stats_arguments, stats_from_args, timed, timed_phase
+    from verdict_cache import VerdictCache
+    from violations import ERROR, TextWriter, Violation, add_format_argument, create_writer, write_violations
 
 
 class FileNameChecker:
@@ -25,76 +41,72 @@ class FileNameChecker:
     }
 
     # Files that can have underscores (Python convention)
-    PYTHON_FILES = {'.py', '.pyx', '.pyi'}
+    PYTHON_FILES = PYTHON_FILES
 
     # Files that commonly use underscores
-    CONFIG_FILES = {'.yml', '.yaml', '.json', '.toml', '.ini', '.cfg', '.conf'}
+    CONFIG_FILES = CONFIG_FILES
 
-    def __init__(self, exclude_patterns=None, config_file=None, allow_unicode=False):
+    # Below this many files, starting worker processes costs more than it saves
+    PARALLEL_THRESHOLD = 5000
+
+    # Chunks handed out per worker process, so that slow chunks even out
+    CHUNKS_PER_JOB = 4
+
+    def __init__(self, exclude_patterns=None, config_file=None, allow_unicode=False, verdict_cache=None, jobs=None,
+                 config=None, stats=None):
         self.errors = []
         self.exclude_patterns = exclude_patterns or []
         self.allow_unicode = allow_unicode
-        self.config = self.load_config(config_file) if config_file else None
+        self.config_file = config_file
+        self.jobs = jobs or 1
+        # A config already loaded by the caller is used as is
+        if config is None and config_file:
+            config = self.load_config(config_file)
+        self.config = config
         if self.config and 'exclude-patterns' in self.config:
             self.exclude_patterns.extend(self.config['exclude-patterns'])
         # Override allow_unicode from config if specified
         if self.config and 'files' in self.config:
             self.allow_unicode = self.config['files'].get('allow-unicode', self.allow_unicode)
+        self.plans = compile_file_plans(self.config, self.allow_unicode)
+        self.verdict_cache = verdict_cache if verdict_cache is not None else VerdictCache()
+        # file name -> suggested name, for names that break a rule
+        self.suggestions = {}
+        # Collects timings and rule counts when set
+        self.stats = stats
 
     def check_kebab_case(self, filename: str) -> bool:
         """Check if filename follows kebab-case convention."""
-        # Remove extension for checking
-        name_without_ext = Path(filename).stem
-
-        # Reject if contains underscores
-        if '_' in name_without_ext:
-            return False
-
-        # Allow single words without hyphens
-        if '-' not in name_without_ext:
-            return name_without_ext.islower() and self.is_alphanumeric_unicode(name_without_ext.replace('.', ''))
-
-        # Check kebab-case pattern
-        if self.allow_unicode:
-            return bool(re.match(r'^[a-z0-9çğıöşüâêîôû]+(-[a-z0-9çğıöşüâêîôû]+)*$', name_without_ext, re.UNICODE))
-        else:
-            return bool(re.match(r'^[a-z0-9]+(-[a-z0-9]+)*$', name_without_ext))
+        return is_kebab_case(split_name(filename)[0], self.allow_unicode)
 
     def check_snake_case(self, filename: str) -> bool:
         """Check if filename follows snake_case convention."""
-        name_without_ext = Path(filename).stem
-        return bool(re.match(r'^[a-z0-9]+(_[a-z0-9]+)*$', name_without_ext))
+        return bool(SNAKE_CASE(split_name(filename)[0]))
 
     def check_pascal_case(self, filename: str) -> bool:
         """Check if filename follows PascalCase convention."""
-        name_without_ext = Path(filename).stem
-        return bool(re.match(r'^[A-Z][a-zA-Z0-9]*$', name_without_ext))
+        return bool(PASCAL_CASE(split_name(filename)[0]))
 
     def check_camel_case(self, filename: str) -> bool:
         """Check if filename follows camelCase convention."""
-        name_without_ext = Path(filename).stem
-        return bool(re.match(r'^[a-z][a-zA-Z0-9]*$', name_without_ext))
+        return bool(CAMEL_CASE(split_name(filename)[0]))
 
     def check_screaming_snake_case(self, filename: str) -> bool:
         """Check if filename follows SCREAMING_SNAKE_CASE convention."""
-        name_without_ext = Path(filename).stem
-        return bool(re.match(r'^[A-Z0-9]+(_[A-Z0-9]+)*$', name_without_ext))
+        return bool(SCREAMING_SNAKE_CASE(split_name(filename)[0]))
 
     def is_alphanumeric_unicode(self, text: str) -> bool:
         """Check if text contains only alphanumeric characters including Unicode characters."""
-        if self.allow_unicode:
-            return bool(re.match(r'^[a-zA-Z0-9çğıöşüÇĞIİÖŞÜâêîôûÂÊÎÔÛ]+$', text, re.UNICODE))
-        else:
-            return bool(re.match(r'^[a-zA-Z0-9]+$', text))
+        return is_alphanumeric(text, self.allow_unicode)
 
     def has_special_characters(self, filename: str) -> bool:
         """Check if filename contains disallowed special characters."""
         if self.allow_unicode:
             # Allow alphanumeric (including Unicode), hyphens, underscores, and dots
-            return not bool(re.match(r'^[a-zA-Z0-9çğıöşüÇĞIİÖŞÜâêîôûÂÊÎÔÛ._-]+$', filename, re.UNICODE))
+            return not UNICODE_NAME_CHARACTERS(filename)
         else:
             # Allow only English alphanumeric, hyphens, underscores, and dots
-            return not bool(re.match(r'^[a-zA-Z0-9._-]+$', filename))
+            return not NAME_CHARACTERS(filename)
 
     def has_spaces(self, filename: str) -> bool:
         """Check if filename contains spaces."""
@@ -102,192 +114,163 @@ class FileNameChecker:
 
     def is_descriptive(self, filename: str) -> bool:
         """Check if filename is descriptive (not generic)."""
-        name_without_ext = Path(filename).stem.lower()
-        generic_names = {
-            'doc', 'document', 'file', 'temp', 'tmp', 'test', 'example',
-            'sample', 'data', 'info', 'item', 'thing', 'stuff', 'misc',
-            'doc1', 'doc2', 'file1', 'file2', 'test1', 'test2'
-        }
-        return name_without_ext not in generic_names
+        return split_name(filename)[0].lower() not in GENERIC_FILE_NAMES
 
     def check_file(self, filepath: str) -> List[str]:
         """Check a single file against naming conventions."""
         filename = os.path.basename(filepath)
-        path_obj = Path(filepath)
-        errors = []
+        return [f"{filepath}: {message}" for _, message in self.check_name(filename)]
 
+    def file_violations(self, filepath: str, suggest: bool = True) -> List[Violation]:
+        """Return the naming violations of a single file, with a suggested name if suggest is set."""
+        filename = os.path.basename(filepath)
+        verdict = self.check_name(filename)
+        if not verdict:
+            return []
+        suggestion = self.suggest_name(filename) if suggest else None
+        return [Violation(filepath, 'files', rule_id, ERROR, message, suggestion) for rule_id, message in verdict]
+
+    def suggest_name(self, filename: str) -> Optional[str]:
+        """Return a name for a file that follows the conventions, or None if renaming cannot fix it."""
+        if filename not in self.suggestions:
+            self.suggestions[filename] = suggest_name(self._plan(split_name(filename)[1]), filename)
+        return self.suggestions[filename]
+
+    def check_name(self, filename: str) -> Tuple[Tuple[str, str], ...]:
+        """Return (rule ID, message) for each naming rule a file name violates."""
         # Skip hidden files and directories
         if filename.startswith('.') and filename not in self.ALLOWED_UPPERCASE:
-            return errors
+            return ()
 
         # Skip allowed uppercase files
         if filename in self.ALLOWED_UPPERCASE:
-            return errors
-
-        if self.config:
-            return self.check_file_with_config(filepath, filename, path_obj)
-
-        # Default checks
-        return self.check_file_default(filepath, filename, path_obj)
-
-    def check_file_with_config(self, filepath: str, filename: str, path_obj: Path) -> List[str]:
-        """Check file using configuration rules."""
-        errors = []
-        name_without_ext = path_obj.stem
-        file_ext = path_obj.suffix.lower()
-
-        # Get file configuration section
-        file_config = self.config.get('files', {})
+            return ()
+
+        fingerprint = self.plans.general.fingerprint
+        verdict = self.verdict_cache.get(filename, fingerprint)
+        if verdict is None:
+            verdict = tuple(self._check_name(filename))
+            self.verdict_cache.put(filename, fingerprint, verdict)
+        return verdict
+
+    def _check_name(self, filename: str) -> List[Tuple[str, str]]:
+        """Check a file name against the rule plan of its category."""
+        stem, suffix = split_name(filename)
+        return check_name(self._plan(suffix), filename, stem)
+
+    def _plan(self, suffix: str):
+        """Return the rule plan of files with an extension."""
+        file_ext = suffix.lower()
+        if file_ext in self.PYTHON_FILES:
+            return self.plans.python
+        if file_ext in self.CONFIG_FILES:
+            return self.plans.config
+        return self.plans.general
 
-        # Check spaces
-        if not file_config.get('allow-spaces', False) and ' ' in filename:
-            errors.append(f"{filepath}: Filename contains spaces")
+    def load_config(self, config_file: str) -> Dict[str, Any]:
+        """Load configuration from YAML file."""
+        return load_config(config_file)
 
-        # Check capital letters
-        if not file_config.get('use-capital', False) and any(c.isupper() for c in filename):
-            errors.append(f"{filepath}: Filename should be lowercase")
+    def is_excluded(self, filepath: str) -> bool:
+        """Check if file should be excluded based on patterns."""
+        return exclude_matcher(self.exclude_patterns).matches(filepath)
 
-        # Check length
-        min_len = file_config.get('min-length', 1)
-        max_len = file_config.get('max-length', 100)
-        if len(name_without_ext) < min_len or len(name_without_ext) > max_len:
-            errors.append(f"{filepath}: Filename length should be between {min_len} and {max_len}")
+    def check_files(self, filepaths: List[str], writer=None) -> int:
+        """Check multiple files, writing each violation as it is found, and return exit code.
 
-        # Check reject patterns
-        for pattern in file_config.get('reject-patterns', []):
-            if re.match(pattern, name_without_ext):
-                errors.append(f"{filepath}: Filename matches rejected pattern: {pattern}")
+        Without a writer, errors are printed as text on stderr.
+        """
+        writer = writer if writer is not None else TextWriter()
+        return write_violations(self.iter_violations(filepaths, writer.suggests), writer, self.stats)
 
-        # File type specific checks
-        if file_ext in self.PYTHON_FILES:
-            py_config = file_config.get('python-files', {})
-            if py_config.get('use-underscore', True) and not self.check_snake_case(filename):
-                errors.append(f"{filepath}: Python files should use snake_case")
-        elif file_ext in self.CONFIG_FILES:
-            cfg_config = file_config.get('config-files', {})
-            use_underscore = cfg_config.get('use-underscore', True)
-            use_hyphen = cfg_config.get('use-hyphen', True)
-
-            has_underscore = '_' in name_without_ext
-            has_hyphen = '-' in name_without_ext
-
-            if not use_underscore and has_underscore:
-                errors.append(f"{filepath}: Underscores not allowed in config filename")
-            if not use_hyphen and has_hyphen:
-                errors.append(f"{filepath}: Hyphens not allowed in config filename")
-
-            if use_hyphen and not use_underscore and not self.check_kebab_case(filename):
-                errors.append(f"{filepath}: Config files should use kebab-case (use hyphens(-) in the filename)")
-            elif use_underscore and not use_hyphen and not self.check_snake_case(filename):
-                errors.append(f"{filepath}: Config files should use snake_case (use underscores(_) in the filename)")
-        else:
-            # General files
-            use_hyphen = file_config.get('use-hyphen', True)
-            use_underscore = file_config.get('use-underscore', False)
-            use_pascal = file_config.get('use-pascal-case', False)
-            use_camel = file_config.get('use-camel-case', False)
-            use_screaming = file_config.get('use-screaming-snake-case', False)
-
-            has_underscore = '_' in name_without_ext
-            has_hyphen = '-' in name_without_ext
-
-            if not use_underscore and not use_screaming and has_underscore:
-                errors.append(f"{filepath}: Underscores not allowed in filename")
-            if not use_hyphen and has_hyphen:
-                errors.append(f"{filepath}: Hyphens not allowed in filename")
-
-            # Check case styles - allow any enabled style
-            valid_case = False
-            if use_hyphen and self.check_kebab_case(filename):
-                valid_case = True
-            elif use_underscore and self.check_snake_case(filename):
-                valid_case = True
-            elif use_pascal and self.check_pascal_case(filename):
-                valid_case = True
-            elif use_camel and self.check_camel_case(filename):
-                valid_case = True
-            elif use_screaming and self.check_screaming_snake_case(filename):
-                valid_case = True
-
-            if not valid_case:
-                case_options = []
-                if use_hyphen: case_options.append('kebab-case')
-                if use_underscore: case_options.append('snake_case')
-                if use_pascal: case_options.append('PascalCase')
-                if use_camel: case_options.append('camelCase')
-                if use_screaming: case_options.append('SCREAMING_SNAKE_CASE')
-
-                if case_options:
-                    errors.append(f"{filepath}: Files should use {' or '.join(case_options)}")
-                else:
-                    errors.append(f"{filepath}: Files should use kebab-case (default)")
-
-        return errors
-
-    def check_file_default(self, filepath: str, filename: str, path_obj: Path) -> List[str]:
-        """Default file checking logic."""
-        errors = []
-        file_ext = path_obj.suffix.lower()
-
-        # Check for spaces
-        if self.has_spaces(filename):
-            errors.append(f"{filepath}: Filename contains spaces")
-
-        # Check for special characters
-        if self.has_special_characters(filename):
-            errors.append(f"{filepath}: Filename contains disallowed special characters")
-
-        # Check if descriptive
-        if not self.is_descriptive(filename):
-            errors.append(f"{filepath}: Filename is not descriptive enough")
-
-        # Check naming convention based on file type
-        if file_ext in self.PYTHON_FILES:
-            if not self.check_snake_case(filename):
-                errors.append(f"{filepath}: Python files should use snake_case (use underscores(_) between words, e.g., user_service.py)")
-        elif file_ext in self.CONFIG_FILES:
-            if not (self.check_snake_case(filename) or self.check_kebab_case(filename)):
-                errors.append(f"{filepath}: Config files should use snake_case or kebab-case")
-        else:
-            if not self.check_kebab_case(filename):
-                errors.append(f"{filepath}: Files should use kebab-case (use hyphens(-) between words, e.g., user-guide.md)")
+    def iter_violations(self, filepaths: List[str], suggest: bool = True) -> Iterator[Violation]:
+        """Yield the naming violations of existing, not excluded files, in order, as they are found.
 
-        # Check if uppercase (except allowed files)
-        if any(c.isupper() for c in filename) and filename not in self.ALLOWED_UPPERCASE:
-            errors.append(f"{filepath}: Filename should be lowercase")
+        Large batches are checked in worker processes when jobs is above one.
+        """
+        if self.jobs > 1 and len(filepaths) >= self.PARALLEL_THRESHOLD:
+            return self._iter_violations_parallel(filepaths, suggest)
+        return self._iter_violations(filepaths, suggest)
 
-        return errors
+    def find_errors(self, filepaths: List[str]) -> List[str]:
+        """Return the naming errors of existing, not excluded files."""
+        return [str(violation) for violation in self._iter_violations(filepaths, suggest=False)]
 
-    def load_config(self, config_file: str) -> Dict[str, Any]:
-        """Load configuration from YAML file."""
-        try:
-            with open(config_file, 'r') as f:
-                return yaml.safe_load(f)
-        except Exception:
-            return {}
+    def find_errors_parallel(self, filepaths: List[str]) -> List[str]:
+        """Like find_errors, with chunks of files checked in worker processes.
 
-    def is_excluded(self, filepath: str) -> bool:
-        """Check if file should be excluded based on patterns."""
-        for pattern in self.exclude_patterns:
-            if re.search(pattern, filepath):
-                return True
-        return False
+        Errors are returned in the order of filepaths.
+        """
+        return [str(violation) for violation in self._iter_violations_parallel(filepaths, suggest=False)]
 
-    def check_files(self, filepaths: List[str]) -> int:
-        """Check multiple files and return exit code."""
-        all_errors = []
+    def _iter_violations(self, filepaths: List[str], suggest: bool) -> Iterator[Violation]:
+        """Yield the violations of existing, not excluded files, checked in this process."""
+        is_file = timed(self.stats, 'stat', os.path.isfile)
+        is_excluded = timed(self.stats, 'exclude', self.is_excluded)
+        file_violations = timed(self.stats, 'rules', self.file_violations)
 
         for filepath in filepaths:
-            if os.path.isfile(filepath) and not self.is_excluded(filepath):
-                errors = self.check_file(filepath)
-                all_errors.extend(errors)
-
-        if all_errors:
-            for error in all_errors:
-                print(error, file=sys.stderr)
-            return 1
-
-        return 0
+            if is_file(filepath) and not is_excluded(filepath):
+                yield from file_violations(filepath, suggest)
+
+    def _iter_violations_parallel(self, filepaths: List[str], suggest: bool) -> Iterator[Violation]:
+        """Yield the violations of existing, not excluded files, checked in chunks by worker processes.
+
+        Each chunk's violations are yielded as soon as it and the chunks
+        before it are done. Workers send back their verdicts and cache
+        lookups, which are added to this checker's verdict cache. With
+        stats, the work of the workers is timed as a single rules phase,
+        and the files they checked are counted as files_checked_in_workers.
+        """
+        chunk_size = -(-len(filepaths) // (self.jobs * self.CHUNKS_PER_JOB))
+        chunks = [filepaths[i:i + chunk_size] for i in range(0, len(filepaths), chunk_size)]
+
+        # Imported here: concurrent.futures.process pulls in multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+
+        with timed_phase(self.stats, 'rules'), ProcessPoolExecutor(
+                max_workers=self.jobs, initializer=_init_worker,
+                initargs=(self.exclude_patterns, self.config, self.allow_unicode, suggest)) as executor:
+            fingerprint = self.plans.general.fingerprint
+            for chunk, (violations, hits, misses, verdicts) in zip(chunks, executor.map(_check_chunk, chunks)):
+                self.verdict_cache.hits += hits
+                self.verdict_cache.misses += misses
+                for name, verdict in verdicts.items():
+                    self.verdict_cache.put(name, fingerprint, verdict)
+                if self.stats is not None:
+                    self.stats.count('files_checked_in_workers', len(chunk))
+                yield from violations
+
+
+# Checker of a worker process, set up by _init_worker
+_worker_checker = None
+
+# Whether the worker process suggests names
+_worker_suggests = False
+
+
+def _init_worker(exclude_patterns: List[str], config: Optional[Dict[str, Any]], allow_unicode: bool,
+                 suggest: bool = False):
+    """Build the checker of a worker process from the parent's loaded config."""
+    global _worker_checker, _worker_suggests
+    _worker_checker = FileNameChecker(allow_unicode=allow_unicode, config=config)
+    _worker_checker.exclude_patterns = list(exclude_patterns)
+    _worker_suggests = suggest
+
+
+def _check_chunk(filepaths: List[str]) -> Tuple[List[Violation], int, int, Dict[str, Tuple[Tuple[str, str], ...]]]:
+    """Check a chunk of files in a worker; returns (violations, cache hits, cache misses, verdicts by file name)."""
+    cache = _worker_checker.verdict_cache
+    hits, misses = cache.hits, cache.misses
+    violations = list(_worker_checker._iter_violations(filepaths, _worker_suggests))
+    fingerprint = _worker_checker.plans.general.fingerprint
+    verdicts = {}
+    for filepath in filepaths:
+        name = os.path.basename(filepath)
+        verdict = cache.entries.get((name, fingerprint))
+        if verdict is not None:
+            verdicts[name] = verdict
+    return violations, cache.hits - hits, cache.misses - misses, verdicts
 
 
 def main():
@@ -298,15 +281,30 @@ def main():
     parser.add_argument('--exclude', action='append', help='Exclude files matching regex pattern')
     parser.add_argument('--config', help='Path to YAML configuration file')
     parser.add_argument('--allow-unicode', action='store_true', help='Allow non-English characters (Turkish, etc.)')
+    parser.add_argument('--jobs', type=int,
+                        help=f'Number of processes for large batches of at least {FileNameChecker.PARALLEL_THRESHOLD} files (default: 1)')
+    add_format_argument(parser)
+    add_stats_arguments(parser)
 
     args = parser.parse_args()
+    stats = stats_from_args(args)
+    writer = create_writer(args.format, 'filename-linter')
 
     if not args.filenames:
         print("No files to check", file=sys.stderr)
+        writer.close()
         return 0
 
-    checker = FileNameChecker(exclude_patterns=args.exclude or [], config_file=args.config, allow_unicode=args.allow_unicode)
-    return checker.check_files(args.filenames)
+    with timed_phase(stats, 'setup'):
+        checker = FileNameChecker(exclude_patterns=args.exclude or [], config_file=args.config, allow_unicode=args.allow_unicode,
+                                  jobs=args.jobs, stats=stats)
+    exit_code = checker.check_files(args.filenames, writer)
+    writer.close()
+    if stats is not None:
+        cache = checker.verdict_cache
+        stats.add_cache('verdict_cache', cache.hits, cache.misses, len(cache.entries))
+        stats.report(args.stats_format, args.format)
+    return exit_code
 
 
 if __name__ == '__main__':
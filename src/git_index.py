@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""Read file metadata from the git index instead of the working tree."""
+
+import os
+from typing import Dict, List, Optional, Set, Tuple
+
+# Index modes of regular files; symlinks (120000) and submodules (160000)
+# are not stored as plain file content.
+REGULAR_FILE_MODES = {'100644', '100755'}
+
+# Object IDs of the empty blob in sha1 and sha256 repositories
+EMPTY_BLOB_IDS = {
+    'e69de29bb2d1d6434b8b29ae775ad8c2e48c5391',
+    '473a0f4c3be8a93681a267e3b1e9a7dcda1185436fe141f7749120a303721813',
+}
+
+
+def run_git(args: List[str], cwd: str = '.') -> Optional[bytes]:
+    """Run a git command and return its output, or None if it failed."""
+    import subprocess
+    try:
+        result = subprocess.run(['git'] + args, cwd=cwd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    except OSError:
+        return None
+    if result.returncode != 0:
+        return None
+    return result.stdout
+
+
+def normalize_path(filepath: str) -> str:
+    """Normalize a path for lookups in index maps (relative to the current directory)."""
+    return os.path.normpath(os.path.relpath(filepath))
+
+
+def index_entries(root_path: str = '.') -> Optional[Dict[str, Tuple[str, str]]]:
+    """Map each path in the index to its (mode, object ID).
+
+    Paths are relative to root_path, like those printed by git ls-files.
+    Unmerged paths are left out. Returns None outside a git repository.
+    """
+    output = run_git(['ls-files', '-s', '-z'], cwd=root_path)
+    if output is None:
+        return None
+
+    entries = {}
+    unmerged = set()
+    for record in output.split(b'\0'):
+        if not record:
+            continue
+        info, _, path = record.partition(b'\t')
+        mode, object_id, stage = info.decode('ascii').split(' ')
+        path = os.fsdecode(path)
+        if stage != '0':
+            unmerged.add(path)
+            continue
+        entries[path] = (mode, object_id)
+
+    for path in unmerged:
+        entries.pop(path, None)
+    return entries
+
+
+def modified_files(root_path: str = '.') -> Optional[Set[str]]:
+    """Return tracked paths whose working tree content differs from the index."""
+    output = run_git(['ls-files', '-m', '-z'], cwd=root_path)
+    if output is None:
+        return None
+    return set(_split_paths(output))
+
+
+def blob_hash(filepath: str, size: int, algorithm: str = 'sha1') -> str:
+    """Get the git blob object ID of file content, or "" if it cannot be read."""
+    import hashlib
+    hash_obj = hashlib.new(algorithm)
+    hash_obj.update(f"blob {size}\0".encode('ascii'))
+    try:
+        with open(filepath, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                hash_obj.update(chunk)
+        return hash_obj.hexdigest()
+    except Exception:
+        return ""
+
+
+def object_algorithm(object_id: str) -> str:
+    """Return the hash algorithm of an object ID (sha1 or sha256 repositories)."""
+    return 'sha256' if len(object_id) == 64 else 'sha1'
+
+
+def head_commit(root_path: str = '.') -> Optional[str]:
+    """Return the commit ID of HEAD, or None outside a repository or before the first commit."""
+    output = run_git(['rev-parse', '--verify', '-q', 'HEAD'], cwd=root_path)
+    if not output:
+        return None
+    return output.decode('ascii').strip()
+
+
+def _split_paths(output: bytes) -> List[str]:
+    """Split NUL separated git output into paths."""
+    return [os.fsdecode(path) for path in output.split(b'\0') if path]
+
+
+def changed_between(old_commit: str, new_commit: str, root_path: str = '.') -> Optional[List[str]]:
+    """Return paths changed between two commits, or None if either is unknown."""
+    output = run_git(['diff', '--name-only', '--no-renames', '--relative', '-z', old_commit, new_commit], cwd=root_path)
+    if output is None:
+        return None
+    return _split_paths(output)
+
+
+def working_tree_changes(root_path: str = '.') -> Optional[List[str]]:
+    """Return staged, unstaged and untracked (not ignored) paths relative to HEAD."""
+    staged = run_git(['diff', '--cached', '--name-only', '--no-renames', '--relative', '-z'], cwd=root_path)
+    others = run_git(['ls-files', '-m', '-o', '--exclude-standard', '-z'], cwd=root_path)
+    if staged is None or others is None:
+        return None
+    paths = _split_paths(staged)
+    seen = set(paths)
+    paths.extend(path for path in _split_paths(others) if path not in seen)
+    return paths
+
+
+def listed_files(root_path: str = '.', untracked: bool = False) -> Optional[List[str]]:
+    """Return sorted paths of files in the index, optionally with untracked files.
+
+    Untracked files are those not ignored by .gitignore and the other
+    standard exclude files. Files deleted from the working tree and
+    submodules are left out. Returns None outside a git repository.
+    """
+    output = run_git(['ls-files', '-s', '-z'], cwd=root_path)
+    deleted = run_git(['ls-files', '-d', '-z'], cwd=root_path)
+    if output is None or deleted is None:
+        return None
+
+    paths = set()
+    for record in output.split(b'\0'):
+        if not record:
+            continue
+        info, _, path = record.partition(b'\t')
+        if info.startswith(b'160000 '):
+            continue
+        # Unmerged paths have one record per stage, the set keeps one
+        paths.add(os.fsdecode(path))
+    paths.difference_update(_split_paths(deleted))
+
+    if untracked:
+        others = run_git(['ls-files', '-o', '--exclude-standard', '-z'], cwd=root_path)
+        if others is None:
+            return None
+        paths.update(_split_paths(others))
+
+    return sorted(paths)
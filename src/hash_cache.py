@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""Persistent content hash cache for the duplicate file checker."""
+
+import os
+import time
+from typing import Optional
+
+try:
+    from .state_store import file_lock, read_json, write_json_atomic
+except ImportError:
+    from state_store import file_lock, read_json, write_json_atomic
+
+
+class HashCache:
+    """Map a file's stat identity (device, inode, size, mtime_ns) to its digests.
+
+    Each identity can hold several digests keyed by kind, e.g. the partial
+    and the full hash of the duplicate checker. Without a cache file the
+    cache lives in memory only.
+    """
+
+    VERSION = 1
+
+    # Files modified this recently may still change within the same mtime
+    # tick, so their digests are not stored.
+    RACY_WINDOW_NS = 2 * 10**9
+
+    def __init__(self, cache_file: Optional[str]):
+        self.cache_file = cache_file
+        self.entries = {}
+        # Entries looked up or stored during this run
+        self.used = {}
+        self.hits = 0
+        self.misses = 0
+        self.load()
+
+    @staticmethod
+    def identity(file_stat: os.stat_result) -> str:
+        """Return the cache key for a stat result."""
+        return f"{file_stat.st_dev}:{file_stat.st_ino}:{file_stat.st_size}:{file_stat.st_mtime_ns}"
+
+    def load(self):
+        """Load entries from the cache file, ignoring missing or stale files."""
+        if self.cache_file is None:
+            return
+        data = read_json(self.cache_file)
+        if isinstance(data, dict) and data.get('version') == self.VERSION:
+            self.entries = data.get('entries', {})
+
+    def get(self, file_stat: os.stat_result, kind: str) -> Optional[str]:
+        """Return the cached digest of the given kind, or None."""
+        key = self.identity(file_stat)
+        digests = self.entries.get(key)
+        if digests is not None:
+            self.used[key] = digests
+            if kind in digests:
+                self.hits += 1
+                return digests[kind]
+        self.misses += 1
+        return None
+
+    def put(self, file_stat: os.stat_result, kind: str, digest: str):
+        """Store a digest unless the file was modified too recently to trust."""
+        if int(time.time() * 10**9) - file_stat.st_mtime_ns < self.RACY_WINDOW_NS:
+            return
+        key = self.identity(file_stat)
+        digests = self.entries.setdefault(key, {})
+        digests[kind] = digest
+        self.used[key] = digests
+
+    def start_run(self):
+        """Begin another run in the same process.
+
+        Entries the previous run did not use belong to files that were
+        deleted or changed since, so only the used ones are kept.
+        """
+        if self.used:
+            self.entries = self.used
+            self.used = {}
+
+    def save(self, prune: bool = True):
+        """Write the cache atomically.
+
+        With prune, only entries used in this run are kept, which drops
+        files that were deleted or changed. Otherwise used entries are
+        merged into whatever is on disk. Write errors are ignored.
+        """
+        if self.cache_file is None:
+            return
+        try:
+            with file_lock(self.cache_file):
+                if prune:
+                    entries = self.used
+                else:
+                    data = read_json(self.cache_file)
+                    entries = {}
+                    if isinstance(data, dict) and data.get('version') == self.VERSION:
+                        entries = data.get('entries', {})
+                    entries.update(self.used)
+                write_json_atomic(self.cache_file, {'version': self.VERSION, 'entries': entries})
+        except OSError:
+            pass
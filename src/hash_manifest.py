@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""Persisted whole-repository hash manifest for incremental duplicate checks."""
+
+import os
+from typing import List, Optional
+
+try:
+    from .git_index import normalize_path
+    from .state_store import file_lock, read_json, write_json_atomic
+except ImportError:
+    from git_index import normalize_path
+    from state_store import file_lock, read_json, write_json_atomic
+
+
+class HashManifest:
+    """Record the size, mtime and (lazily) the content digest of every file.
+
+    Digests are only computed when another file has the same size, so a
+    fresh manifest costs a walk and a stat per file. The commit the
+    manifest was last synchronised with is stored alongside the entries.
+    """
+
+    VERSION = 1
+
+    def __init__(self, manifest_file: str):
+        self.manifest_file = manifest_file
+        self.head = None
+        # path -> [size, mtime_ns, digest or None]
+        self.entries = {}
+        self.loaded = False
+        self._by_size = None
+        self.load()
+
+    @staticmethod
+    def key(filepath: str) -> str:
+        """Return the manifest key for a path, in the form produced by the walker."""
+        return os.path.join('.', normalize_path(filepath))
+
+    def load(self):
+        """Load the manifest, ignoring missing or incompatible files."""
+        data = read_json(self.manifest_file)
+        if isinstance(data, dict) and data.get('version') == self.VERSION:
+            self.head = data.get('head')
+            self.entries = data.get('entries', {})
+            self.loaded = True
+
+    def clear(self):
+        """Drop all entries before a rebuild."""
+        self.entries = {}
+        self._by_size = None
+
+    def update(self, key: str, file_stat: os.stat_result):
+        """Record a file's stat, forgetting its digest if the file changed."""
+        entry = self.entries.get(key)
+        if entry and entry[0] == file_stat.st_size and entry[1] == file_stat.st_mtime_ns:
+            return
+        if entry and self._by_size is not None:
+            self._by_size[entry[0]].discard(key)
+        self.entries[key] = [file_stat.st_size, file_stat.st_mtime_ns, None]
+        if self._by_size is not None:
+            self._by_size.setdefault(file_stat.st_size, set()).add(key)
+
+    def remove(self, key: str):
+        """Forget a file that was deleted or excluded."""
+        entry = self.entries.pop(key, None)
+        if entry and self._by_size is not None:
+            self._by_size[entry[0]].discard(key)
+
+    def digest(self, key: str) -> Optional[str]:
+        """Return the stored digest of a file, if computed."""
+        return self.entries[key][2]
+
+    def set_digest(self, key: str, digest: str):
+        """Store the content digest of a file."""
+        self.entries[key][2] = digest
+
+    def with_size(self, size: int) -> List[str]:
+        """Return the keys of all files with the given size, sorted."""
+        if self._by_size is None:
+            self._by_size = {}
+            for key, entry in self.entries.items():
+                self._by_size.setdefault(entry[0], set()).add(key)
+        return sorted(self._by_size.get(size, ()))
+
+    def save(self):
+        """Write the manifest atomically; write errors are ignored."""
+        try:
+            with file_lock(self.manifest_file):
+                write_json_atomic(self.manifest_file, {'version': self.VERSION, 'head': self.head, 'entries': self.entries})
+        except OSError:
+            pass
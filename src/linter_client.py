@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""Thin naming-linter client that sends checks to a running linter daemon.
+
+Only the standard library modules needed to talk to the daemon are
+imported up front; the checkers are loaded only when no daemon answers.
+"""
+
+import json
+import os
+import socket
+import sys
+from typing import Any, Dict, List, Optional
+
+try:
+    from .state_store import default_state_dir
+except ImportError:
+    from state_store import default_state_dir
+
+
+# Seconds to wait for the daemon to accept a connection, and then to answer;
+# after that the check runs in-process as if no daemon were running
+CONNECT_TIMEOUT = 1.0
+RESPONSE_TIMEOUT = 60.0
+
+
+def default_socket_path(root_path: str = '.') -> Optional[str]:
+    """Return the daemon socket path inside the repository's .git directory.
+
+    The path stays relative to the working directory, which keeps it within
+    the length limit of Unix socket addresses.
+    """
+    state_dir = default_state_dir(root_path)
+    if state_dir is None:
+        return None
+    return os.path.join(state_dir, 'daemon.sock')
+
+
+def send_message(sock: socket.socket, message: Dict[str, Any]):
+    """Send one message as a line of JSON."""
+    sock.sendall(json.dumps(message).encode('utf-8') + b'\n')
+
+
+def receive_message(sock: socket.socket) -> Optional[Dict[str, Any]]:
+    """Receive one line of JSON, or None if the peer closed the connection first."""
+    buffer = b''
+    while not buffer.endswith(b'\n'):
+        chunk = sock.recv(65536)
+        if not chunk:
+            return None
+        buffer += chunk
+    message = json.loads(buffer.decode('utf-8'))
+    return message if isinstance(message, dict) else None
+
+
+def request(message: Dict[str, Any], socket_path: Optional[str],
+            response_timeout: float = RESPONSE_TIMEOUT) -> Optional[Dict[str, Any]]:
+    """Send a request to the daemon and return its response, or None if no daemon answers in time."""
+    if socket_path is None or not hasattr(socket, 'AF_UNIX'):
+        return None
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(CONNECT_TIMEOUT)
+            sock.connect(socket_path)
+            sock.settimeout(response_timeout)
+            send_message(sock, message)
+            return receive_message(sock)
+    except (OSError, ValueError):
+        # socket.timeout is an OSError: a wedged daemon counts as none
+        return None
+
+
+def run_check(argv: List[str], socket_path: Optional[str]) -> Optional[int]:
+    """Run naming-linter with argv in the daemon and return its exit code, or None if it cannot."""
+    response = request({'command': 'check', 'cwd': os.path.realpath('.'), 'args': argv}, socket_path)
+    if response is None or not isinstance(response.get('exit_code'), int):
+        return None
+    sys.stdout.write(response.get('stdout', ''))
+    sys.stderr.write(response.get('stderr', ''))
+    return response['exit_code']
+
+
+def main(argv: Optional[List[str]] = None):
+    """Main entry point; takes the same arguments as naming-linter."""
+    if argv is None:
+        argv = sys.argv[1:]
+
+    # Watch mode runs until interrupted, so it never goes to the daemon
+    if '--watch' not in argv:
+        exit_code = run_check(argv, default_socket_path('.'))
+        if exit_code is not None:
+            return exit_code
+
+    # No daemon is running for this repository: check in-process
+    try:
+        from .naming_linter import main as naming_linter_main
+    except ImportError:
+        from naming_linter import main as naming_linter_main
+    return naming_linter_main(argv)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
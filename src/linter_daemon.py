@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""Long-running linter process that answers naming-linter checks over a Unix socket."""
+
+import argparse
+import io
+import os
+import signal
+import socket
+import sys
+from collections import OrderedDict
+from contextlib import redirect_stderr, redirect_stdout
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    from .config_loader import load_config
+    from .hash_cache import HashCache
+    from .linter_client import default_socket_path, receive_message, request, send_message
+    from .naming_linter import build_parser, check_repository, create_checkers, report_stats
+    from .scanner import DirectoryIndex
+    from .state_store import default_state_dir
+    from .stats import stats_from_args, timed_phase
+    from .verdict_cache import VerdictCache
+    from .violations import create_writer
+except ImportError:
+    from config_loader import load_config
+    from hash_cache import HashCache
+    from linter_client import default_socket_path, receive_message, request, send_message
+    from naming_linter import build_parser, check_repository, create_checkers, report_stats
+    from scanner import DirectoryIndex
+    from state_store import default_state_dir
+    from stats import stats_from_args, timed_phase
+    from verdict_cache import VerdictCache
+    from violations import create_writer
+
+
+class LinterDaemon:
+    """Run naming-linter checks for one repository, keeping state warm between them.
+
+    The compiled checkers for each set of options, the verdict cache, the
+    directory index and the content hash cache stay in memory, so a check
+    only re-reads what changed. Checks run one at a time, with the working
+    directory as the repository root.
+    """
+
+    # Checker sets kept for different options or configs; older ones are dropped first
+    MAX_CHECKER_SETS = 8
+
+    # Seconds to wait for a client to send its request
+    RECEIVE_TIMEOUT = 5.0
+
+    def __init__(self, hash_cache_file: Optional[str] = None):
+        self.root_path = os.path.realpath('.')
+        self.verdict_cache = VerdictCache()
+        self.directory_index = DirectoryIndex()
+        self.hash_cache = HashCache(hash_cache_file) if hash_cache_file else None
+        self.checker_sets = OrderedDict()
+        self.requests = 0
+
+    def check(self, argv: List[str]) -> Tuple[int, str, str]:
+        """Run naming-linter with argv and return (exit code, stdout, stderr)."""
+        stdout = io.StringIO()
+        stderr = io.StringIO()
+        with redirect_stdout(stdout), redirect_stderr(stderr):
+            try:
+                exit_code = self._check(argv)
+            except SystemExit as e:
+                # argparse exits on --help and on invalid arguments
+                exit_code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+            except Exception as e:
+                # A bad request, such as an invalid exclude pattern, fails that check, not the daemon
+                print(f"naming-linter: {e}", file=sys.stderr)
+                exit_code = 2
+        self.requests += 1
+        return exit_code, stdout.getvalue(), stderr.getvalue()
+
+    def _check(self, argv: List[str]) -> int:
+        """Run a check, reusing the checkers of an earlier check with the same options and config."""
+        args = build_parser().parse_args(argv)
+        if args.watch:
+            print("naming-linter: --watch cannot run in the daemon", file=sys.stderr)
+            return 2
+        stats = stats_from_args(args)
+        with timed_phase(stats, 'setup'):
+            config = load_config(args.config) if args.config else None
+
+            # Statistics, the output format and the files checked do not change the checkers, so they share them
+            options = sorted((name, repr(value)) for name, value in vars(args).items()
+                             if name not in ('stats', 'stats_format', 'format', 'filenames'))
+            key = (tuple(options), repr(config))
+            checkers = self.checker_sets.get(key)
+            if checkers is None:
+                checkers = create_checkers(args, config, self.verdict_cache)
+                if checkers[3] is not None:
+                    checkers[3].hash_cache = self.hash_cache
+                self.checker_sets[key] = checkers
+                while len(self.checker_sets) > self.MAX_CHECKER_SETS:
+                    self.checker_sets.popitem(last=False)
+            else:
+                self.checker_sets.move_to_end(key)
+            for checker in checkers:
+                if checker is not None:
+                    checker.stats = stats
+
+        if checkers[3] is not None and self.hash_cache is not None:
+            self.hash_cache.start_run()
+        # Counters are cumulative; this check's lookups are the difference
+        caches = {'verdict_cache': self.verdict_cache, 'directory_index': self.directory_index}
+        if checkers[3] is not None and self.hash_cache is not None:
+            caches['hash_cache'] = self.hash_cache
+        counts = {name: (cache.hits, cache.misses) for name, cache in caches.items()}
+        writer = create_writer(args.format, 'naming-linter') if args.format != 'text' else None
+        exit_code = check_repository('.', *checkers, scanner=args.scanner, untracked=args.untracked, jobs=args.jobs,
+                                     directory_index=self.directory_index, stats=stats, writer=writer,
+                                     filenames=args.filenames or None)
+        if writer is not None:
+            writer.close()
+        if stats is not None:
+            entries = {'verdict_cache': len(self.verdict_cache.entries),
+                       'directory_index': len(self.directory_index.listings),
+                       'hash_cache': len(self.hash_cache.used) if self.hash_cache is not None else 0}
+            for name, cache in caches.items():
+                hits, misses = counts[name]
+                stats.add_cache(name, cache.hits - hits, cache.misses - misses, entries[name])
+            report_stats(stats, args.stats_format, args.format)
+        return exit_code
+
+    def handle(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        """Answer one request."""
+        command = message.get('command')
+        if command == 'status':
+            return {'pid': os.getpid(), 'root': self.root_path, 'requests': self.requests}
+        if command == 'stop':
+            return {'stopping': True}
+        if command == 'check':
+            if message.get('cwd') != self.root_path:
+                return {'error': f"{message.get('cwd')}: daemon serves {self.root_path}"}
+            args = message.get('args')
+            if not isinstance(args, list) or not all(isinstance(arg, str) for arg in args):
+                return {'error': 'args must be a list of strings'}
+            exit_code, stdout, stderr = self.check(args)
+            return {'exit_code': exit_code, 'stdout': stdout, 'stderr': stderr}
+        return {'error': f"unknown command: {command!r}"}
+
+    def serve(self, socket_path: str):
+        """Answer requests on socket_path until a stop request or SIGTERM."""
+        os.makedirs(os.path.dirname(socket_path) or '.', exist_ok=True)
+        if os.path.exists(socket_path):
+            # Left behind by a daemon that did not shut down cleanly
+            os.unlink(socket_path)
+
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            server.bind(socket_path)
+            os.chmod(socket_path, 0o600)
+            server.listen(16)
+            while True:
+                connection, _ = server.accept()
+                with connection:
+                    # A client that connects and sends nothing must not block the others
+                    connection.settimeout(self.RECEIVE_TIMEOUT)
+                    try:
+                        message = receive_message(connection)
+                    except (OSError, ValueError):
+                        continue
+                    if message is None:
+                        continue
+                    try:
+                        response = self.handle(message)
+                    except Exception as e:
+                        response = {'exit_code': 2, 'stdout': '', 'stderr': f"linter daemon: {e}\n"}
+                    try:
+                        send_message(connection, response)
+                    except OSError:
+                        pass
+                    if response.get('stopping'):
+                        break
+        finally:
+            server.close()
+            try:
+                os.unlink(socket_path)
+            except OSError:
+                pass
+            if self.hash_cache is not None and self.hash_cache.used:
+                self.hash_cache.save(prune=True)
+
+
+def _terminate(signum, frame):
+    """Turn SIGTERM into SystemExit, so the daemon cleans up on the way out."""
+    sys.exit(0)
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description='Keep linter state in memory and answer naming-linter-client checks')
+    parser.add_argument('action', choices=['serve', 'status', 'stop'],
+                        help='Run the daemon in the foreground, show whether it runs, or stop it')
+    parser.add_argument('--socket', help='Unix socket path (default: .git/filename-linter/daemon.sock)')
+    parser.add_argument('--no-cache', action='store_true', help='Do not load or save the content hash cache')
+
+    args = parser.parse_args()
+
+    socket_path = args.socket or default_socket_path('.')
+    if socket_path is None:
+        print(f"{os.getcwd()}: Not a git repository; pass --socket", file=sys.stderr)
+        return 1
+
+    response = request({'command': 'status'}, socket_path)
+    if args.action == 'status':
+        if response is None:
+            print("No linter daemon running")
+            return 1
+        print(f"Linter daemon running for {response.get('root')} (pid {response.get('pid')}, "
+              f"{response.get('requests')} checks served)")
+        return 0
+
+    if args.action == 'stop':
+        if response is None:
+            print("No linter daemon running")
+            return 1
+        request({'command': 'stop'}, socket_path)
+        print("Linter daemon stopped")
+        return 0
+
+    if response is not None:
+        print(f"{socket_path}: A linter daemon is already running (pid {response.get('pid')})", file=sys.stderr)
+        return 1
+    if not hasattr(socket, 'AF_UNIX'):
+        print("Unix domain sockets are not supported on this platform", file=sys.stderr)
+        return 1
+
+    state_dir = default_state_dir('.')
+    hash_cache_file = None
+    if state_dir and not args.no_cache:
+        hash_cache_file = os.path.join(state_dir, 'hash-cache.json')
+    signal.signal(signal.SIGTERM, _terminate)
+    try:
+        LinterDaemon(hash_cache_file).serve(socket_path)
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,449 @@
+#!/usr/bin/env python3
+"""Run all naming checks over a single walk of the repository."""
+
+import argparse
+import os
+import stat
+import sys
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+try:
+    from .config_loader import load_config
+    from .directory_checker import DirectoryChecker
+    from .duplicate_file_checker import DuplicateFileChecker
+    from .empty_file_checker import EmptyFileChecker
+    from .file_name_checker import FileNameChecker
+    from .hash_cache import HashCache
+    from .scanner import DEFAULT_EXCLUDE_PATTERNS, SCANNERS, DirectoryIndex, exclude_matcher, scan
+    from .stats import Stats, add_stats_arguments, stats_from_args, timed, timed_phase
+    from .verdict_cache import VerdictCache
+    from .violations import Violation, add_format_argument, create_writer, write_violations
+    from .watcher import create_watcher
+except ImportError:
+    from config_loader import load_config
+    from directory_checker import DirectoryChecker
+    from duplicate_file_checker import DuplicateFileChecker
+    from empty_file_checker import EmptyFileChecker
+    from file_name_checker import FileNameChecker
+    from hash_cache import HashCache
+    from scanner import DEFAULT_EXCLUDE_PATTERNS, SCANNERS, DirectoryIndex, exclude_matcher, scan
+    from stats import Stats, add_stats_arguments, stats_from_args, timed, timed_phase
+    from verdict_cache import VerdictCache
+    from violations import Violation, add_format_argument, create_writer, write_violations
+    from watcher import create_watcher
+
+# Checks in output order, named like their configuration sections
+CHECKS = ('files', 'directories', 'empty-files', 'duplicate-files')
+
+CHECK_TITLES = {
+    'files': 'File names',
+    'directories': 'Directory names',
+    'empty-files': 'Empty files',
+    'duplicate-files': 'Duplicate files',
+}
+
+
+def parse_checks(value: str) -> List[str]:
+    """Parse a comma-separated list of checks for argparse."""
+    checks = [check.strip() for check in value.split(',') if check.strip()]
+    unknown = [check for check in checks if check not in CHECKS]
+    if unknown or not checks:
+        raise argparse.ArgumentTypeError(f"invalid checks: {value!r} (choose from {', '.join(CHECKS)})")
+    return [check for check in CHECKS if check in checks]
+
+
+def report_errors(errors_by_check: Dict[str, List[str]]):
+    """Print the errors of each check under a heading, in check order."""
+    for check in CHECKS:
+        errors = errors_by_check.get(check)
+        if not errors:
+            continue
+        print(f"{CHECK_TITLES[check]} ({len(errors)} {'error' if len(errors) == 1 else 'errors'}):", file=sys.stderr)
+        for error in errors:
+            print(error, file=sys.stderr)
+
+
+def scan_exclude_patterns(checkers: Iterable[Any]) -> List[str]:
+    """Return the patterns the shared walk prunes with: the default exclusions and those of every checker.
+
+    The file name checker adds no default exclusions of its own, so taking
+    any one checker's list would walk into .git and node_modules.
+    """
+    patterns = list(DEFAULT_EXCLUDE_PATTERNS)
+    for checker in checkers:
+        patterns.extend(pattern for pattern in checker.exclude_patterns if pattern not in patterns)
+    return patterns
+
+
+class GroupedTextWriter:
+    """Collect violations and print them as text under a heading per check, like report_errors, on close."""
+
+    # Suggested names are not shown, so they need not be computed
+    suggests = False
+
+    def __init__(self):
+        self.errors_by_check = {check: [] for check in CHECKS}
+
+    def write(self, violation: Violation):
+        self.errors_by_check[violation.check].append(str(violation))
+
+    def close(self):
+        report_errors(self.errors_by_check)
+
+
+def check_repository(root_path: str, file_checker: Optional[FileNameChecker], directory_checker: Optional[DirectoryChecker],
+                     empty_checker: Optional[EmptyFileChecker], duplicate_checker: Optional[DuplicateFileChecker],
+                     scanner: str = 'walk', untracked: bool = False, jobs: Optional[int] = None,
+                     directory_index: Optional[DirectoryIndex] = None, stats: Optional[Stats] = None,
+                     writer=None, filenames: Optional[List[str]] = None) -> int:
+    """Scan the repository once, feed every enabled checker and return exit code.
+
+    Checkers passed as None are skipped. The stat result of each file is
+    fetched once, by os.scandir when walking, and shared by the empty and
+    duplicate checks. A directory index, if given, replaces the walk. With
+    stats, each phase of the pass is timed; the checkers should share them.
+
+    With filenames, file names and empty files are checked for those files
+    only, and directory names for the directories containing them. The
+    duplicate check still walks the repository, since a listed file may
+    duplicate any other file.
+
+    Violations go to writer as they are found; duplicates once the walk is
+    done. Without a writer, they are printed as text, grouped by check, at
+    the end.
+    """
+    enabled = [checker for checker in (file_checker, directory_checker, empty_checker, duplicate_checker) if checker]
+    if not enabled:
+        return 0
+
+    grouped = writer is None
+    if grouped:
+        writer = GroupedTextWriter()
+    violations = _scan_violations(root_path, scan_exclude_patterns(enabled), file_checker, directory_checker, empty_checker,
+                                  duplicate_checker, scanner, untracked, jobs, directory_index, stats, writer.suggests,
+                                  filenames)
+    exit_code = write_violations(violations, writer, stats)
+    if grouped:
+        with timed_phase(stats, 'output'):
+            writer.close()
+    return exit_code
+
+
+def _scan_violations(root_path: str, exclude_patterns: List[str], file_checker: Optional[FileNameChecker],
+                     directory_checker: Optional[DirectoryChecker], empty_checker: Optional[EmptyFileChecker],
+                     duplicate_checker: Optional[DuplicateFileChecker], scanner: str, untracked: bool,
+                     jobs: Optional[int], directory_index: Optional[DirectoryIndex], stats: Optional[Stats],
+                     suggest: bool, filenames: Optional[List[str]] = None) -> Iterator[Violation]:
+    """Yield the violations of check_repository as the walk finds them, then those of the duplicate check."""
+    duplicate_candidates = []
+    duplicate_stats = []
+
+    def repository_entries():
+        """Scan the whole repository, through the directory index if there is one."""
+        if directory_index is not None and scanner == 'walk':
+            return directory_index.scan(root_path, exclude_patterns, stats)
+        return scan(root_path, exclude_patterns, scanner, untracked, jobs, stats)
+
+    if filenames is not None:
+        entries = scan(root_path, exclude_patterns, stats=stats, filenames=filenames)
+    else:
+        entries = repository_entries()
+    if stats is not None:
+        entries = stats.timed_iter('walk', entries)
+
+    # Bound once; with stats, each call is timed
+    if file_checker is not None:
+        file_excluded = timed(stats, 'exclude', file_checker.is_excluded)
+        file_violations = timed(stats, 'rules', file_checker.file_violations)
+    if directory_checker is not None:
+        directory_violations = timed(stats, 'rules', directory_checker.directory_violations)
+    if empty_checker is not None:
+        empty_violations = timed(stats, 'rules', empty_checker.empty_violations)
+
+    for path, file_stat in entries:
+        if file_stat is None:
+            if directory_checker is not None:
+                yield from directory_violations(path, suggest)
+            continue
+
+        if file_checker is not None and not file_excluded(path):
+            yield from file_violations(path, suggest)
+        if empty_checker is not None and file_stat.st_size == 0:
+            yield from empty_violations(path)
+        if duplicate_checker is not None and filenames is None:
+            duplicate_candidates.append(path)
+            duplicate_stats.append(file_stat)
+
+    if duplicate_checker is not None:
+        if filenames is not None:
+            entries = repository_entries()
+            if stats is not None:
+                entries = stats.timed_iter('walk', entries)
+            for path, file_stat in entries:
+                if file_stat is not None:
+                    duplicate_candidates.append(path)
+                    duplicate_stats.append(file_stat)
+        # Stat, exclusion and grouping; hashing is timed as a phase of its own
+        with timed_phase(stats, 'grouping'):
+            duplicate_violations = duplicate_checker.find_violations(duplicate_candidates, duplicate_stats)
+        yield from duplicate_violations
+
+
+class IncrementalLinter:
+    """Keep the errors of a scanned tree current as paths change.
+
+    After a full scan, update() re-checks only the changed paths, and the
+    contents of changed directories. Duplicates are found again over the
+    known files, with digests kept in an in-memory hash cache so that only
+    changed files are read.
+    """
+
+    def __init__(self, root_path: str, file_checker: Optional[FileNameChecker], directory_checker: Optional[DirectoryChecker],
+                 empty_checker: Optional[EmptyFileChecker], duplicate_checker: Optional[DuplicateFileChecker]):
+        self.root_path = root_path
+        self.file_checker = file_checker
+        self.directory_checker = directory_checker
+        self.empty_checker = empty_checker
+        self.duplicate_checker = duplicate_checker
+        enabled = [checker for checker in (file_checker, directory_checker, empty_checker, duplicate_checker) if checker]
+        self.exclude_patterns = scan_exclude_patterns(enabled)
+        self.matcher = exclude_matcher(self.exclude_patterns)
+        if duplicate_checker is not None and duplicate_checker.hash_cache is None:
+            duplicate_checker.hash_cache = HashCache(None)
+        # path -> errors, for the per-path checks
+        self.path_errors = {'files': {}, 'directories': {}, 'empty-files': {}}
+        self.directories = set()
+        # path -> stat of every scanned file, in scan order
+        self.file_stats = {}
+        self.duplicate_errors = []
+
+    def full_scan(self):
+        """Check the whole tree."""
+        for path, file_stat in scan(self.root_path, self.matcher):
+            self._check_path(path, file_stat)
+        self._find_duplicates()
+
+    def update(self, changed_paths: Iterable[str]):
+        """Re-check changed, created and deleted paths."""
+        for path in sorted(changed_paths):
+            self._forget(path)
+            if not self._scanned(path):
+                continue
+            try:
+                path_stat = os.stat(path)
+            except OSError:
+                continue
+            if stat.S_ISDIR(path_stat.st_mode):
+                if path != self.root_path:
+                    self._check_path(path, None)
+                if not os.path.islink(path) and not self.matcher.prunes(path):
+                    for subpath, file_stat in scan(path, self.matcher):
+                        self._check_path(subpath, file_stat)
+            elif stat.S_ISREG(path_stat.st_mode):
+                self._check_path(path, path_stat)
+        self._find_duplicates()
+
+    def errors(self) -> Dict[str, List[str]]:
+        """Return the current errors of each check."""
+        errors_by_check = {check: [error for errors in path_errors.values() for error in errors]
+                           for check, path_errors in self.path_errors.items()}
+        errors_by_check['duplicate-files'] = list(self.duplicate_errors)
+        return errors_by_check
+
+    def _scanned(self, path: str) -> bool:
+        """Check if a full scan would reach path: no directory on the way is excluded or a symlink."""
+        parent = os.path.dirname(path)
+        while parent and parent != self.root_path and len(parent) > len(self.root_path):
+            if self.matcher.matches(parent) or os.path.islink(parent):
+                return False
+            parent = os.path.dirname(parent)
+        return path == self.root_path or not self.matcher.matches(path)
+
+    def _check_path(self, path: str, file_stat: Optional[os.stat_result]):
+        """Record the errors of a directory (file_stat None) or file."""
+        if file_stat is None:
+            self.directories.add(path)
+            if self.directory_checker is not None:
+                self._record('directories', path, self.directory_checker.check_directory(path))
+            return
+
+        if self.file_checker is not None and not self.file_checker.is_excluded(path):
+            self._record('files', path, self.file_checker.check_file(path))
+        if self.empty_checker is not None and file_stat.st_size == 0:
+            self._record('empty-files', path, self.empty_checker.check_empty_path(path))
+        self.file_stats[path] = file_stat
+
+    def _record(self, check: str, path: str, errors: List[str]):
+        """Store the errors of a path, if any."""
+        if errors:
+            self.path_errors[check][path] = errors
+
+    def _forget(self, path: str):
+        """Drop what is known about path and, for a directory, everything below it."""
+        paths = [path]
+        if path in self.directories or path == self.root_path:
+            prefix = path.rstrip(os.sep) + os.sep
+            paths.extend(known for known in self.file_stats if known.startswith(prefix))
+            paths.extend(known for known in self.directories if known.startswith(prefix))
+        for known in paths:
+            self.directories.discard(known)
+            self.file_stats.pop(known, None)
+            for path_errors in self.path_errors.values():
+                path_errors.pop(known, None)
+
+    def _find_duplicates(self):
+        """Find duplicates among the known files, hashing only files the cache does not know."""
+        if self.duplicate_checker is None:
+            return
+        self.duplicate_checker.hash_cache.start_run()
+        self.duplicate_errors = self.duplicate_checker.find_errors(list(self.file_stats), list(self.file_stats.values()))
+
+
+def report_changes(previous: Dict[str, List[str]], current: Dict[str, List[str]]):
+    """Print errors that are new (+) or resolved (-) since previous, under a heading per check."""
+    for check in CHECKS:
+        old_errors = previous.get(check, [])
+        new_errors = current.get(check, [])
+        old_set = set(old_errors)
+        new_set = set(new_errors)
+        added = [error for error in new_errors if error not in old_set]
+        resolved = [error for error in old_errors if error not in new_set]
+        if not added and not resolved:
+            continue
+        print(f"{CHECK_TITLES[check]} ({len(added)} new, {len(resolved)} resolved):", file=sys.stderr)
+        for error in added:
+            print(f"+ {error}", file=sys.stderr)
+        for error in resolved:
+            print(f"- {error}", file=sys.stderr)
+
+
+def watch_repository(root_path: str, file_checker: Optional[FileNameChecker], directory_checker: Optional[DirectoryChecker],
+                     empty_checker: Optional[EmptyFileChecker], duplicate_checker: Optional[DuplicateFileChecker],
+                     interval: float = 1.0, watcher=None, max_updates: Optional[int] = None) -> int:
+    """Check the repository, then re-check changed paths until interrupted.
+
+    All errors are printed after the first scan, and afterwards only the
+    errors that appear or disappear. Returns the exit code for the errors
+    that remain.
+    """
+    linter = IncrementalLinter(root_path, file_checker, directory_checker, empty_checker, duplicate_checker)
+    linter.full_scan()
+    errors = linter.errors()
+    report_errors(errors)
+    print("Watching for changes (press Ctrl+C to stop)", file=sys.stderr)
+
+    if watcher is None:
+        watcher = create_watcher(root_path, linter.exclude_patterns, interval)
+    updates = 0
+    try:
+        while max_updates is None or updates < max_updates:
+            changed = watcher.wait()
+            if not changed:
+                continue
+            linter.update(changed)
+            current = linter.errors()
+            report_changes(errors, current)
+            errors = current
+            updates += 1
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
+    return 1 if any(errors.values()) else 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Return the command line parser, shared with the linter daemon."""
+    parser = argparse.ArgumentParser(prog='naming-linter',
+                                     description='Check file names, directory names, empty files and duplicate files in one pass')
+    parser.add_argument('filenames', nargs='*',
+                        help='Files to check; directories containing them are checked too (default: walk the repository)')
+    parser.add_argument('--checks', type=parse_checks, default=list(CHECKS),
+                        help=f"Comma-separated checks to run (default: {','.join(CHECKS)})")
+    parser.add_argument('--exclude', action='append', help='Exclude files and directories matching regex pattern')
+    parser.add_argument('--config', help='Path to YAML configuration file')
+    parser.add_argument('--allow-unicode', action='store_true', help='Allow non-English characters (Turkish, etc.)')
+    parser.add_argument('--allow-empty', action='store_true', help='Allow empty files')
+    parser.add_argument('--allow-duplicates', action='store_true', help='Allow duplicate files')
+    parser.add_argument('--jobs', type=int,
+                        help='Number of files to hash, and directories to scan, in parallel (default: CPU count for hashing, 1 for scanning)')
+    parser.add_argument('--scanner', choices=SCANNERS, default='walk',
+                        help='Walk the working tree, or list files known to git (default: walk)')
+    parser.add_argument('--untracked', action='store_true', help='With --scanner git, also check untracked files that are not ignored')
+    add_format_argument(parser)
+    add_stats_arguments(parser)
+    parser.add_argument('--watch', action='store_true', help='Keep running and report errors as files change')
+    parser.add_argument('--watch-interval', type=float, default=1.0,
+                        help='Seconds between scans when inotify is not available (default: 1.0)')
+    return parser
+
+
+def create_checkers(args: argparse.Namespace, config: Optional[Dict[str, Any]], verdict_cache: VerdictCache,
+                    hash_cache_file: Optional[str] = None, stats: Optional[Stats] = None) -> tuple:
+    """Create the checkers selected by args, or None for the others.
+
+    The file and directory checkers share verdict_cache; their plans have
+    different fingerprints, so one cache serves both. All checkers share
+    stats.
+    """
+    exclude = args.exclude or []
+    file_checker = directory_checker = empty_checker = duplicate_checker = None
+    if 'files' in args.checks:
+        file_checker = FileNameChecker(exclude_patterns=list(exclude), config_file=args.config, allow_unicode=args.allow_unicode,
+                                       verdict_cache=verdict_cache, config=config, stats=stats)
+    if 'directories' in args.checks:
+        directory_checker = DirectoryChecker(exclude_patterns=list(exclude), config_file=args.config,
+                                             allow_unicode=args.allow_unicode, verdict_cache=verdict_cache, config=config,
+                                             stats=stats)
+    if 'empty-files' in args.checks:
+        empty_checker = EmptyFileChecker(exclude_patterns=list(exclude), config_file=args.config, allow_empty=args.allow_empty,
+                                         config=config, stats=stats)
+    if 'duplicate-files' in args.checks:
+        duplicate_checker = DuplicateFileChecker(exclude_patterns=list(exclude), config_file=args.config,
+                                                 allow_duplicates=args.allow_duplicates, cache_file=hash_cache_file,
+                                                 jobs=args.jobs, config=config, stats=stats)
+    return file_checker, directory_checker, empty_checker, duplicate_checker
+
+
+def main(argv: Optional[List[str]] = None):
+    """Main entry point."""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.watch and args.scanner != 'walk':
+        parser.error('--watch requires --scanner walk')
+    if args.watch and args.format != 'text':
+        parser.error('--watch requires --format text')
+    if args.watch and args.filenames:
+        parser.error('--watch checks the whole repository and takes no filenames')
+
+    stats = stats_from_args(args)
+
+    with timed_phase(stats, 'setup'):
+        # Loaded once and shared, instead of once per checker
+        config = load_config(args.config) if args.config else None
+        verdict_cache = VerdictCache()
+        checkers = create_checkers(args, config, verdict_cache, stats=stats)
+
+    if args.watch:
+        exit_code = watch_repository('.', *checkers, interval=args.watch_interval)
+    else:
+        writer = create_writer(args.format, 'naming-linter') if args.format != 'text' else None
+        exit_code = check_repository('.', *checkers, scanner=args.scanner, untracked=args.untracked, jobs=args.jobs,
+                                     stats=stats, writer=writer, filenames=args.filenames or None)
+        if writer is not None:
+            writer.close()
+    if stats is not None:
+        stats.add_cache('verdict_cache', verdict_cache.hits, verdict_cache.misses, len(verdict_cache.entries))
+        report_stats(stats, args.stats_format, args.format)
+    return exit_code
+
+
+def report_stats(stats: Stats, stats_format: Optional[str], output_format: str = 'text'):
+    """Print stats, as text under a heading like the errors, or as JSON."""
+    if stats_format != 'json':
+        print("Statistics:", file=sys.stderr)
+    stats.report(stats_format, output_format)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
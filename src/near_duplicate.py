@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""Near-duplicate file detection with line chunking, MinHash and LSH."""
+
+import hashlib
+import sys
+import time
+import zlib
+from typing import List, Optional, Tuple
+
+MASK64 = (1 << 64) - 1
+
+
+class NearDuplicateDetector:
+    """Find pairs of text files whose content is similar but not identical.
+
+    Each file is cut into chunks at line boundaries, so an edit only changes
+    the chunks it touches. Pairs of consecutive chunks form the feature set
+    of a file, summarised by a one-permutation MinHash signature. Signatures
+    are split into LSH bands, and only files that share a band bucket are
+    compared, which keeps the work close to linear in the number of files.
+    Similar files are merged into groups, so a cluster of n copies is
+    reported as n - 1 pairs rather than every pair.
+    """
+
+    # Signature slots; the slot of a feature is taken from its top bits
+    SIGNATURE_BITS = 7
+    SIGNATURE_SIZE = 1 << SIGNATURE_BITS
+    BANDS = 16
+    ROWS = SIGNATURE_SIZE // BANDS
+
+    # Files with fewer features are too small to compare meaningfully
+    MIN_FEATURES = 5
+
+    # Members of a bucket are compared with at most this many of its
+    # dissimilar members, so buckets of boilerplate shared by many
+    # unrelated files stay linear; no bucket is skipped
+    MAX_BUCKET_LEADERS = 4
+
+    def __init__(self, threshold: float = 0.8, max_file_size: int = 1024 * 1024,
+                 time_budget: Optional[float] = None):
+        self.threshold = threshold
+        self.max_file_size = max_file_size
+        # Seconds find_pairs may take; once spent, it returns the pairs found so far
+        self.time_budget = time_budget
+        self.budget_exceeded = False
+
+    def fingerprint(self, filepath: str) -> Optional[Tuple[str, tuple]]:
+        """Return (content MD5, MinHash signature) of a text file, or None to skip it."""
+        try:
+            with open(filepath, 'rb') as f:
+                data = f.read(self.max_file_size + 1)
+        except Exception:
+            return None
+        if len(data) > self.max_file_size or b'\0' in data[:8192]:
+            # Too large, or binary
+            return None
+
+        features = set()
+        previous = 0
+        for line in data.split(b'\n'):
+            line = line.strip()
+            if not line:
+                continue
+            current = zlib.crc32(line)
+            features.add((previous << 32) | current)
+            previous = current
+        if len(features) < self.MIN_FEATURES:
+            return None
+
+        shift = 64 - self.SIGNATURE_BITS
+        low_mask = (1 << shift) - 1
+        empty = low_mask + 1
+        signature = [empty] * self.SIGNATURE_SIZE
+        for feature in features:
+            mixed = (feature * 0x9E3779B97F4A7C15 + 0x632BE59BD9B4E019) & MASK64
+            slot = mixed >> shift
+            value = mixed & low_mask
+            if value < signature[slot]:
+                signature[slot] = value
+
+        # Densify: empty slots borrow from the next filled slot, offset by
+        # the distance so that borrowed values stay distinguishable
+        for slot in range(self.SIGNATURE_SIZE):
+            if signature[slot] == empty:
+                distance = 1
+                while signature[(slot + distance) % self.SIGNATURE_SIZE] >= empty:
+                    distance += 1
+                signature[slot] = signature[(slot + distance) % self.SIGNATURE_SIZE] + distance * empty
+
+        return hashlib.md5(data).hexdigest(), tuple(signature)
+
+    def similarity(self, signature1: tuple, signature2: tuple) -> float:
+        """Estimate the Jaccard similarity of two files from their signatures."""
+        matches = sum(1 for value1, value2 in zip(signature1, signature2) if value1 == value2)
+        return matches / self.SIGNATURE_SIZE
+
+    def find_pairs(self, filepaths: List[str]) -> List[Tuple[str, str, float]]:
+        """Return (first path, similar path, similarity) for near-duplicate files.
+
+        Files that share an LSH bucket and are similar enough are merged
+        into groups with union-find. Each group is then verified against its
+        first path: members similar to it are paired with it, and the others
+        form a group of their own. Exact duplicates are left to the exact
+        duplicate check. Pairs are sorted, with the first path of the group
+        first. When the time budget runs out, a warning is printed on stderr
+        and the pairs found so far are returned.
+        """
+        deadline = time.monotonic() + self.time_budget if self.time_budget is not None else None
+        self.budget_exceeded = False
+
+        fingerprints = {}
+        buckets = {}
+        for filepath in filepaths:
+            if self._out_of_time(deadline):
+                break
+            fingerprint = self.fingerprint(filepath)
+            if fingerprint is None:
+                continue
+            fingerprints[filepath] = fingerprint
+            signature = fingerprint[1]
+            for band in range(self.BANDS):
+                band_key = (band,) + signature[band * self.ROWS:(band + 1) * self.ROWS]
+                buckets.setdefault(band_key, []).append(filepath)
+
+        parents = {}
+
+        def find(path):
+            root = parents.get(path, path)
+            while root != parents.get(root, root):
+                root = parents.get(root, root)
+            if root != path:
+                parents[path] = root
+            return root
+
+        for members in buckets.values():
+            if len(members) < 2:
+                continue
+            if self._out_of_time(deadline):
+                break
+            leaders = []
+            for member in members:
+                signature = fingerprints[member][1]
+                for leader in leaders:
+                    root, member_root = find(leader), find(member)
+                    if root == member_root:
+                        break
+                    if self.similarity(fingerprints[leader][1], signature) >= self.threshold:
+                        parents[member_root] = root
+                        break
+                else:
+                    if len(leaders) < self.MAX_BUCKET_LEADERS:
+                        leaders.append(member)
+
+        groups = {}
+        for path in parents:
+            groups.setdefault(find(path), []).append(path)
+        for root, group in groups.items():
+            group.append(root)
+
+        pairs = []
+        for group in groups.values():
+            remaining = sorted(set(group))
+            while len(remaining) > 1:
+                first = remaining[0]
+                digest, signature = fingerprints[first]
+                dissimilar = []
+                for member in remaining[1:]:
+                    member_digest, member_signature = fingerprints[member]
+                    similarity = self.similarity(signature, member_signature)
+                    if similarity < self.threshold:
+                        dissimilar.append(member)
+                    elif member_digest != digest:
+                        pairs.append((first, member, similarity))
+                remaining = dissimilar
+                # Past the budget, each group is still verified against its first path
+                if self._out_of_time(deadline):
+                    break
+
+        if self.budget_exceeded:
+            print(f"Near-duplicate search stopped after its {self.time_budget:g} s time budget, "
+                  f"with {len(fingerprints)} files fingerprinted; results may be incomplete", file=sys.stderr)
+        return sorted(pairs)
+
+    def _out_of_time(self, deadline: Optional[float]) -> bool:
+        """Check if the time budget is spent, and remember it if so."""
+        if deadline is not None and time.monotonic() >= deadline:
+            self.budget_exceeded = True
+        return self.budget_exceeded
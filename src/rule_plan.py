@@ -0,0 +1,375 @@
+#!/usr/bin/env python3
+"""Compile naming configuration into immutable rule plans.
+
+A plan is an ordered tuple of rules for one category of names: Python
+files, config files, other files, or directories. Each rule holds a rule
+ID, a predicate with its regexes already compiled and its options already
+resolved, and the error message it produces. Checking a name is a single
+pass over the rules, with no config lookups or regex compilation.
+"""
+
+import re
+import zlib
+from collections import namedtuple
+from typing import Any, Dict, List, Optional, Tuple
+
+# A rule reports message when violated(name, stem) is true
+Rule = namedtuple('Rule', ['rule_id', 'violated', 'message'])
+
+# Rules for one category of names; fingerprint identifies the options they were compiled from
+RulePlan = namedtuple('RulePlan', ['category', 'rules', 'fingerprint'])
+
+# File plans, picked by extension
+FilePlans = namedtuple('FilePlans', ['python', 'config', 'general'])
+
+# What each rule checks, by check and rule ID, independent of the options
+# the rule was compiled with; e.g. the rule descriptions of SARIF logs
+RULE_DESCRIPTIONS = {
+    'files/spaces': "Filename contains spaces",
+    'files/special-characters': "Filename contains disallowed special characters",
+    'files/descriptive': "Filename is not descriptive enough",
+    'files/lowercase': "Filename should be lowercase",
+    'files/length': "Filename length is outside the configured range",
+    'files/reject-pattern': "Filename matches a rejected pattern",
+    'files/underscore': "Underscores not allowed in filename",
+    'files/hyphen': "Hyphens not allowed in filename",
+    'files/case-style': "Files should use one of the configured case styles",
+    'files/kebab-case': "Files should use kebab-case",
+    'files/python-snake-case': "Python files should use snake_case",
+    'files/config-case': "Config files should use snake_case or kebab-case",
+    'files/config-kebab-case': "Config files should use kebab-case",
+    'files/config-snake-case': "Config files should use snake_case",
+    'directories/spaces': "Directory name contains spaces",
+    'directories/special-characters': "Directory name contains disallowed special characters",
+    'directories/non-english': "Directory name contains non-English characters",
+    'directories/descriptive': "Directory name is not descriptive enough",
+    'directories/lowercase': "Directory name should be lowercase",
+    'directories/length': "Directory name length is outside the configured range",
+    'directories/reject-pattern': "Directory name matches a rejected pattern",
+    'directories/underscore': "Underscores not allowed in directory name",
+    'directories/hyphen': "Hyphens not allowed in directory name",
+    'directories/case-style': "Directories should use one of the configured case styles",
+    'directories/kebab-case': "Directories should use kebab-case",
+    'empty-files/empty-file': "File is empty",
+    'duplicate-files/duplicate': "File has the same content as another file",
+    'duplicate-files/hardlink': "File is a hardlink of another file",
+    'duplicate-files/near-duplicate': "File is nearly identical to another file",
+}
+
+# Files that can have underscores (Python convention)
+PYTHON_FILES = {'.py', '.pyx', '.pyi'}
+
+# Files that commonly use underscores
+CONFIG_FILES = {'.yml', '.yaml', '.json', '.toml', '.ini', '.cfg', '.conf'}
+
+GENERIC_FILE_NAMES = {
+    'doc', 'document', 'file', 'temp', 'tmp', 'test', 'example',
+    'sample', 'data', 'info', 'item', 'thing', 'stuff', 'misc',
+    'doc1', 'doc2', 'file1', 'file2', 'test1', 'test2'
+}
+
+GENERIC_DIRECTORY_NAMES = {
+    'dir', 'directory', 'folder', 'temp', 'tmp', 'test', 'example',
+    'sample', 'data', 'info', 'item', 'thing', 'stuff', 'misc',
+    'dir1', 'dir2', 'folder1', 'folder2', 'test1', 'test2'
+}
+
+KEBAB_CASE = re.compile(r'^[a-z0-9]+(-[a-z0-9]+)*$').match
+UNICODE_KEBAB_CASE = re.compile(r'^[a-z0-9çğıöşüâêîôû]+(-[a-z0-9çğıöşüâêîôû]+)*$', re.UNICODE).match
+SNAKE_CASE = re.compile(r'^[a-z0-9]+(_[a-z0-9]+)*$').match
+PASCAL_CASE = re.compile(r'^[A-Z][a-zA-Z0-9]*$').match
+CAMEL_CASE = re.compile(r'^[a-z][a-zA-Z0-9]*$').match
+SCREAMING_SNAKE_CASE = re.compile(r'^[A-Z0-9]+(_[A-Z0-9]+)*$').match
+ALPHANUMERIC = re.compile(r'^[a-zA-Z0-9]+$').match
+UNICODE_ALPHANUMERIC = re.compile(r'^[a-zA-Z0-9çğıöşüÇĞIİÖŞÜâêîôûÂÊÎÔÛ]+$', re.UNICODE).match
+NAME_CHARACTERS = re.compile(r'^[a-zA-Z0-9._-]+$').match
+UNICODE_NAME_CHARACTERS = re.compile(r'^[a-zA-Z0-9çğıöşüÇĞIİÖŞÜâêîôûÂÊÎÔÛ._-]+$', re.UNICODE).match
+
+# Case changes that start a new word: 'userName', 'HTTPServer'
+WORD_BOUNDARY = re.compile(r'(?<=[a-z0-9])(?=[A-Z])|(?<=[A-Z])(?=[A-Z][a-z])')
+# Runs of spaces, punctuation and underscores between words
+WORD_SEPARATORS = re.compile(r'[\W_]+')
+
+# Ways to join the words of a name, tried in turn when suggesting a name:
+# kebab-case, snake_case, PascalCase, camelCase and SCREAMING_SNAKE_CASE
+NAME_STYLES = (
+    lambda words: '-'.join(word.lower() for word in words),
+    lambda words: '_'.join(word.lower() for word in words),
+    lambda words: ''.join(word.capitalize() for word in words),
+    lambda words: words[0].lower() + ''.join(word.capitalize() for word in words[1:]),
+    lambda words: '_'.join(word.upper() for word in words),
+)
+
+
+def is_kebab_case(text: str, allow_unicode: bool = False) -> bool:
+    """Check if text follows kebab-case convention."""
+    # Reject if contains underscores
+    if '_' in text:
+        return False
+
+    # Allow single words without hyphens
+    if '-' not in text:
+        return text.islower() and is_alphanumeric(text.replace('.', ''), allow_unicode)
+
+    # Check kebab-case pattern
+    if allow_unicode:
+        return bool(UNICODE_KEBAB_CASE(text))
+    return bool(KEBAB_CASE(text))
+
+
+def is_alphanumeric(text: str, allow_unicode: bool = False) -> bool:
+    """Check if text contains only alphanumeric characters, optionally including Unicode characters."""
+    if allow_unicode:
+        return bool(UNICODE_ALPHANUMERIC(text))
+    return bool(ALPHANUMERIC(text))
+
+
+def split_name(name: str) -> Tuple[str, str]:
+    """Split a file name into stem and suffix, like pathlib.PurePath.stem and suffix.
+
+    A leading dot starts a hidden name, not a suffix, and a trailing dot is
+    part of the stem.
+    """
+    i = name.rfind('.')
+    if 0 < i < len(name) - 1:
+        return name[:i], name[i:]
+    return name, ''
+
+
+def has_uppercase(text: str) -> bool:
+    """Check if text contains an uppercase letter."""
+    return any(c.isupper() for c in text)
+
+
+def check_name(plan: RulePlan, name: str, stem: str) -> List[Tuple[str, str]]:
+    """Return (rule ID, message) for each rule of the plan a name violates."""
+    return [(rule.rule_id, rule.message) for rule in plan.rules if rule.violated(name, stem)]
+
+
+def split_words(text: str) -> List[str]:
+    """Split a name into words at separators and case changes, e.g. 'User API_v2' into User, API, v2."""
+    return WORD_SEPARATORS.sub(' ', WORD_BOUNDARY.sub(' ', text)).split()
+
+
+def suggest_name(plan: RulePlan, name: str, has_suffix: bool = True) -> Optional[str]:
+    """Return a rename of name that violates none of the plan's rules, or None if there is none.
+
+    The words of the stem are joined in each of NAME_STYLES in turn and the
+    first result the plan accepts is returned, with the extension in lower
+    case. Directory names are passed with has_suffix=False. Rules such as
+    descriptive names or reject patterns cannot be fixed this way; names
+    that break them get no suggestion.
+    """
+    stem, suffix = split_name(name) if has_suffix else (name, '')
+    words = split_words(stem)
+    if not words:
+        return None
+    suffix = suffix.lower()
+    for style in NAME_STYLES:
+        candidate_stem = style(words)
+        candidate = candidate_stem + suffix
+        if candidate != name and not check_name(plan, candidate, candidate_stem):
+            return candidate
+    return None
+
+
+def _fingerprint(*options) -> str:
+    """Return a short stable ID of the options a plan was compiled from."""
+    # zlib checksums avoid importing hashlib on every start
+    data = repr(options).encode('utf-8')
+    return f'{zlib.crc32(data):08x}{zlib.adler32(data):08x}'
+
+
+def _case_rules(section: Dict[str, Any], allow_unicode: bool, subject: str, plural: str,
+                underscore_message: str) -> List[Rule]:
+    """Compile the underscore, hyphen and case style rules of a files or directories section."""
+    use_hyphen = section.get('use-hyphen', True)
+    use_underscore = section.get('use-underscore', False)
+    use_pascal = section.get('use-pascal-case', False)
+    use_camel = section.get('use-camel-case', False)
+    use_screaming = section.get('use-screaming-snake-case', False)
+    rules = []
+
+    if not use_underscore and not use_screaming:
+        rules.append(Rule('underscore', lambda name, stem: '_' in stem, underscore_message))
+    if not use_hyphen:
+        rules.append(Rule('hyphen', lambda name, stem: '-' in stem, f"Hyphens not allowed in {subject}"))
+
+    # Any enabled style is valid
+    styles = []
+    case_options = []
+    if use_hyphen:
+        styles.append(lambda stem: is_kebab_case(stem, allow_unicode))
+        case_options.append('kebab-case')
+    if use_underscore:
+        styles.append(SNAKE_CASE)
+        case_options.append('snake_case')
+    if use_pascal:
+        styles.append(PASCAL_CASE)
+        case_options.append('PascalCase')
+    if use_camel:
+        styles.append(CAMEL_CASE)
+        case_options.append('camelCase')
+    if use_screaming:
+        styles.append(SCREAMING_SNAKE_CASE)
+        case_options.append('SCREAMING_SNAKE_CASE')
+    styles = tuple(styles)
+
+    if case_options:
+        rules.append(Rule('case-style', lambda name, stem: not any(style(stem) for style in styles),
+                          f"{plural} should use {' or '.join(case_options)}"))
+    else:
+        rules.append(Rule('case-style', lambda name, stem: True, f"{plural} should use kebab-case (default)"))
+    return rules
+
+
+def _common_rules(section: Dict[str, Any], subject: str) -> List[Rule]:
+    """Compile the space, capital, length and reject pattern rules of a section."""
+    rules = []
+
+    if not section.get('allow-spaces', False):
+        rules.append(Rule('spaces', lambda name, stem: ' ' in name, f"{subject} contains spaces"))
+
+    if not section.get('use-capital', False):
+        rules.append(Rule('lowercase', lambda name, stem: has_uppercase(name), f"{subject} should be lowercase"))
+
+    min_len = section.get('min-length', 1)
+    max_len = section.get('max-length', 100)
+    rules.append(Rule('length', lambda name, stem: len(stem) < min_len or len(stem) > max_len,
+                      f"{subject} length should be between {min_len} and {max_len}"))
+
+    for pattern in section.get('reject-patterns', []):
+        matches = re.compile(pattern).match
+        rules.append(Rule('reject-pattern', lambda name, stem, matches=matches: matches(stem) is not None,
+                          f"{subject} matches rejected pattern: {pattern}"))
+
+    return rules
+
+
+def compile_file_plans(config: Optional[Dict[str, Any]], allow_unicode: bool = False) -> FilePlans:
+    """Compile the file rules of a configuration, or the default rules without one."""
+    if not config:
+        return _default_file_plans(allow_unicode)
+
+    # Get file configuration section
+    file_config = config.get('files', {})
+    fingerprint = _fingerprint('files', file_config, allow_unicode)
+    common = _common_rules(file_config, 'Filename')
+
+    # Python files
+    python_rules = list(common)
+    py_config = file_config.get('python-files', {})
+    if py_config.get('use-underscore', True):
+        python_rules.append(Rule('python-snake-case', lambda name, stem: not SNAKE_CASE(stem),
+                                 "Python files should use snake_case"))
+
+    # Config files
+    config_rules = list(common)
+    cfg_config = file_config.get('config-files', {})
+    use_underscore = cfg_config.get('use-underscore', True)
+    use_hyphen = cfg_config.get('use-hyphen', True)
+    if not use_underscore:
+        config_rules.append(Rule('underscore', lambda name, stem: '_' in stem, "Underscores not allowed in config filename"))
+    if not use_hyphen:
+        config_rules.append(Rule('hyphen', lambda name, stem: '-' in stem, "Hyphens not allowed in config filename"))
+    if use_hyphen and not use_underscore:
+        config_rules.append(Rule('config-kebab-case', lambda name, stem: not is_kebab_case(stem, allow_unicode),
+                                 "Config files should use kebab-case (use hyphens(-) in the filename)"))
+    elif use_underscore and not use_hyphen:
+        config_rules.append(Rule('config-snake-case', lambda name, stem: not SNAKE_CASE(stem),
+                                 "Config files should use snake_case (use underscores(_) in the filename)"))
+
+    # General files
+    general_rules = common + _case_rules(file_config, allow_unicode, 'filename', 'Files',
+                                         "Underscores not allowed in filename")
+
+    return FilePlans(
+        python=RulePlan('python', tuple(python_rules), fingerprint),
+        config=RulePlan('config', tuple(config_rules), fingerprint),
+        general=RulePlan('general', tuple(general_rules), fingerprint),
+    )
+
+
+def _default_file_plans(allow_unicode: bool) -> FilePlans:
+    """Compile the rules used for files when there is no configuration."""
+    fingerprint = _fingerprint('files', None, allow_unicode)
+
+    # Check for spaces
+    spaces = Rule('spaces', lambda name, stem: ' ' in name, "Filename contains spaces")
+
+    # Check for special characters
+    if allow_unicode:
+        # Allow alphanumeric (including Unicode), hyphens, underscores, and dots
+        special = Rule('special-characters', lambda name, stem: not UNICODE_NAME_CHARACTERS(name),
+                       "Filename contains disallowed special characters")
+    else:
+        # Allow only English alphanumeric, hyphens, underscores, and dots
+        special = Rule('special-characters', lambda name, stem: not NAME_CHARACTERS(name),
+                       "Filename contains disallowed special characters")
+
+    # Check if descriptive
+    descriptive = Rule('descriptive', lambda name, stem: stem.lower() in GENERIC_FILE_NAMES,
+                       "Filename is not descriptive enough")
+
+    # Check if uppercase
+    lowercase = Rule('lowercase', lambda name, stem: has_uppercase(name), "Filename should be lowercase")
+
+    python_case = Rule('python-snake-case', lambda name, stem: not SNAKE_CASE(stem),
+                       "Python files should use snake_case (use underscores(_) between words, e.g., user_service.py)")
+    config_case = Rule('config-case', lambda name, stem: not (SNAKE_CASE(stem) or is_kebab_case(stem, allow_unicode)),
+                       "Config files should use snake_case or kebab-case")
+    general_case = Rule('kebab-case', lambda name, stem: not is_kebab_case(stem, allow_unicode),
+                        "Files should use kebab-case (use hyphens(-) between words, e.g., user-guide.md)")
+
+    return FilePlans(
+        python=RulePlan('python', (spaces, special, descriptive, python_case, lowercase), fingerprint),
+        config=RulePlan('config', (spaces, special, descriptive, config_case, lowercase), fingerprint),
+        general=RulePlan('general', (spaces, special, descriptive, general_case, lowercase), fingerprint),
+    )
+
+
+def compile_directory_plan(config: Optional[Dict[str, Any]], allow_unicode: bool = False) -> RulePlan:
+    """Compile the directory rules of a configuration, or the default rules without one.
+
+    Directory names have no extension; the name is passed as both name and stem.
+    """
+    if not config:
+        return _default_directory_plan(allow_unicode)
+
+    # Get directory configuration section
+    dir_config = config.get('directories', {})
+    rules = _common_rules(dir_config, 'Directory name')
+
+    # Check for Unicode characters when not allowed
+    if not allow_unicode:
+        rules.append(Rule('non-english', lambda name, stem: not NAME_CHARACTERS(name),
+                          "Directory name contains non-English characters (set allow-unicode: true to allow)"))
+
+    # General directory naming
+    rules.extend(_case_rules(dir_config, allow_unicode, 'directory name', 'Directory',
+                             "Underscores not allowed in directory name (use hyphens(-) instead, e.g., user-service/)"))
+
+    return RulePlan('directory', tuple(rules), _fingerprint('directories', dir_config, allow_unicode))
+
+
+def _default_directory_plan(allow_unicode: bool) -> RulePlan:
+    """Compile the rules used for directories when there is no configuration."""
+    rules = [Rule('spaces', lambda name, stem: ' ' in name, "Directory name contains spaces")]
+
+    # Check for special characters
+    if allow_unicode:
+        rules.append(Rule('special-characters', lambda name, stem: not UNICODE_NAME_CHARACTERS(name),
+                          "Directory name contains disallowed special characters"))
+    else:
+        rules.append(Rule('non-english', lambda name, stem: not NAME_CHARACTERS(name),
+                          "Directory name contains non-English characters (set allow-unicode: true to allow)"))
+
+    rules.extend([
+        Rule('descriptive', lambda name, stem: name.lower() in GENERIC_DIRECTORY_NAMES,
+             "Directory name is not descriptive enough"),
+        Rule('kebab-case', lambda name, stem: not is_kebab_case(name, allow_unicode),
+             "Directory should use kebab-case (use hyphens(-) between words, e.g., user-service/)"),
+        Rule('lowercase', lambda name, stem: has_uppercase(name), "Directory name should be lowercase"),
+    ])
+
+    return RulePlan('directory', tuple(rules), _fingerprint('directories', None, allow_unicode))
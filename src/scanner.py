@@ -0,0 +1,479 @@
+#!/usr/bin/env python3
+"""Shared repository walker for the linters."""
+
+import functools
+import os
+import re
+import stat
+import time
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    from . import git_index
+except ImportError:
+    import git_index
+
+# Directories the directory checker never reports
+SKIPPED_DIRECTORY_NAMES = {'__pycache__', 'node_modules', '.git', '.pytest_cache'}
+
+# Exclusions the directory, empty and duplicate checkers add to their own
+DEFAULT_EXCLUDE_PATTERNS = (r'\.git/', r'__pycache__', r'\.pytest_cache', r'node_modules')
+
+# How paths are enumerated: walking the working tree, or asking git
+SCANNERS = ('walk', 'git')
+
+# Directories listed ahead of the walk by each parallel job
+PREFETCH_PER_JOB = 4
+
+
+# Regex syntax that is not literal text
+_METACHARACTERS = set('.^$*+?{}[]|()')
+
+# Backreferences, named groups and inline flags change meaning, or fail to
+# compile, when a pattern is joined with others into one alternation
+_UNCOMBINABLE = re.compile(r'\\[1-9]|\(\?P[<=]|\(\?\(|\(\?[aiLmsux]')
+
+
+class ExcludeMatcher:
+    """Match paths against exclude patterns compiled once.
+
+    A path is excluded if any pattern matches anywhere in it, as with
+    re.search. Patterns that are plain text, such as node_modules or
+    \\.git/, are merged into a trie so they are tested together, and let
+    prunes() rule out whole subtrees. The other patterns are joined into
+    one alternation, except those that cannot be safely combined.
+    """
+
+    def __init__(self, patterns: Iterable[str]):
+        self.patterns = tuple(patterns)
+        literals = []
+        combined = []
+        separate = []
+        for pattern in self.patterns:
+            # Invalid patterns fail here, as they would in re.search
+            re.compile(pattern)
+            literal = _literal_text(pattern)
+            if literal is not None:
+                literals.append(literal)
+            elif _UNCOMBINABLE.search(pattern):
+                separate.append(re.compile(pattern))
+            else:
+                combined.append(pattern)
+
+        self.literal_regex = re.compile(_trie_pattern(literals)) if literals else None
+        alternatives = [self.literal_regex.pattern] if literals else []
+        alternatives.extend(f'(?:{pattern})' for pattern in combined)
+        self.regexes = [re.compile('|'.join(alternatives))] if alternatives else []
+        self.regexes.extend(separate)
+
+    def matches(self, path: str) -> bool:
+        """Check if a path matches any exclude pattern."""
+        for regex in self.regexes:
+            if regex.search(path):
+                return True
+        return False
+
+    def prunes(self, dirpath: str) -> bool:
+        """Check if every path below a directory is excluded.
+
+        Every such path starts with dirpath and a separator, so a plain text
+        pattern found there is found in all of them.
+        """
+        return self.literal_regex is not None and self.literal_regex.search(dirpath + os.sep) is not None
+
+
+def _literal_text(pattern: str) -> Optional[str]:
+    """Return the text a pattern matches if it is plain text, else None."""
+    chars = []
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == '\\':
+            if i + 1 == len(pattern) or pattern[i + 1].isalnum():
+                # \d, \b, \1 and friends are not literal
+                return None
+            chars.append(pattern[i + 1])
+            i += 2
+        elif char in _METACHARACTERS:
+            return None
+        else:
+            chars.append(char)
+            i += 1
+    return ''.join(chars)
+
+
+def _trie_pattern(literals: List[str]) -> str:
+    """Build a regex matching any of the literals, factored by common prefixes."""
+    trie = {}
+    for literal in literals:
+        node = trie
+        for char in literal:
+            node = node.setdefault(char, {})
+        node[''] = {}
+    return _trie_node_pattern(trie)
+
+
+def _trie_node_pattern(node: dict) -> str:
+    """Build the regex for a trie node."""
+    if '' in node:
+        # A shorter literal ends here; searching for it is enough
+        return ''
+    alternatives = [re.escape(char) + _trie_node_pattern(child) for char, child in sorted(node.items())]
+    if len(alternatives) == 1:
+        return alternatives[0]
+    return '(?:' + '|'.join(alternatives) + ')'
+
+
+@functools.lru_cache(maxsize=32)
+def _cached_matcher(patterns: Tuple[str, ...]) -> ExcludeMatcher:
+    return ExcludeMatcher(patterns)
+
+
+def exclude_matcher(exclude_patterns: Iterable[str]) -> ExcludeMatcher:
+    """Return the shared matcher for a list of exclude patterns."""
+    if isinstance(exclude_patterns, ExcludeMatcher):
+        return exclude_patterns
+    return _cached_matcher(tuple(exclude_patterns or ()))
+
+
+def is_excluded_path(path: str, exclude_patterns: Iterable[str]) -> bool:
+    """Check if a path matches any exclude pattern."""
+    return exclude_matcher(exclude_patterns).matches(path)
+
+
+def walk(root_path='.', exclude_patterns=None,
+         jobs=None, stats=None) -> Iterator[Tuple[str, List[os.DirEntry], List[os.DirEntry]]]:
+    """Walk the tree top-down with os.scandir, like os.walk.
+
+    Yields (root, dirs, files) lists of os.DirEntry objects in the same
+    order as os.walk, so callers can reuse the entries' cached type and
+    stat information. Excluded directories are pruned and not yielded in
+    dirs; symlinked directories, and directories whose contents are all
+    excluded, are yielded but not descended into.
+
+    With jobs greater than one, directories are listed ahead of time by a
+    thread pool. Results are still yielded in the same order. With stats,
+    directories and files visited and directories pruned are counted.
+    """
+    matcher = exclude_matcher(exclude_patterns)
+    if jobs is not None and jobs > 1:
+        yield from _parallel_walk(root_path, matcher, jobs, stats)
+        return
+
+    stack = [root_path]
+    while stack:
+        root = stack.pop()
+        listing = _list_directory(root, matcher)
+        if listing is None:
+            continue
+        dirs, files, subdirs, excluded = listing
+        if stats is not None:
+            _count_listing(stats, len(dirs) + excluded, len(files), len(subdirs))
+        yield root, dirs, files
+        stack.extend(reversed(subdirs))
+
+
+def _parallel_walk(root_path: str, matcher: ExcludeMatcher,
+                   jobs: int, stats=None) -> Iterator[Tuple[str, List[os.DirEntry], List[os.DirEntry]]]:
+    """Walk like walk(), listing the next directories on the stack in a thread pool.
+
+    Only the directories nearest the top of the stack are listed ahead, so
+    memory use stays close to that of a sequential walk.
+    """
+    # Imported here: concurrent.futures pulls in logging, which slows every start
+    from concurrent.futures import ThreadPoolExecutor
+
+    window = jobs * PREFETCH_PER_JOB
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        # Stack items are [path, future], the future is set once it is submitted
+        stack = [[root_path, None]]
+        while stack:
+            for item in stack[-window:]:
+                if item[1] is None:
+                    item[1] = executor.submit(_list_directory, item[0], matcher)
+            root, future = stack.pop()
+            listing = future.result()
+            if listing is None:
+                continue
+            dirs, files, subdirs, excluded = listing
+            if stats is not None:
+                _count_listing(stats, len(dirs) + excluded, len(files), len(subdirs))
+            yield root, dirs, files
+            stack.extend([path, None] for path in reversed(subdirs))
+
+
+def _list_directory(root: str, matcher: ExcludeMatcher) -> Optional[Tuple[List[os.DirEntry], List[os.DirEntry], List[str], int]]:
+    """List a directory for walk().
+
+    Returns (dirs, files, subdirectories to descend into, number of
+    excluded directories), or None if the directory cannot be read.
+    """
+    try:
+        with os.scandir(root) as iterator:
+            entries = list(iterator)
+    except OSError:
+        return None
+
+    dirs = []
+    files = []
+    excluded = 0
+    for entry in entries:
+        try:
+            is_dir = entry.is_dir()
+        except OSError:
+            is_dir = False
+        if not is_dir:
+            files.append(entry)
+        elif not matcher.matches(entry.path):
+            dirs.append(entry)
+        else:
+            excluded += 1
+
+    subdirs = []
+    for entry in dirs:
+        try:
+            if entry.is_symlink():
+                continue
+        except OSError:
+            continue
+        if not matcher.prunes(entry.path):
+            subdirs.append(entry.path)
+    return dirs, files, subdirs, excluded
+
+
+def _count_listing(stats, directories: int, files: int, descended: int):
+    """Count a listed directory: its files, and subdirectories that were excluded or not descended into."""
+    stats.count('directories_visited')
+    stats.count('files_visited', files)
+    stats.count('directories_pruned', directories - descended)
+
+
+class DirectoryIndex:
+    """Directory listings kept between scans of the same tree.
+
+    A long-running process, such as the linter daemon, can scan through an
+    index instead of calling scan(). A directory whose modification time is
+    unchanged has the same entries, so its listing is reused and only the
+    directory itself is stat()ed. Files are still stat()ed on every scan.
+    """
+
+    # Directories modified this recently may still change within the same
+    # mtime tick, so their listings are not kept.
+    RACY_WINDOW_NS = 2 * 10**9
+
+    def __init__(self):
+        # dirpath -> (mtime_ns, directory paths, file paths, subdirectories to descend into, excluded directories)
+        self.listings = {}
+        self.patterns = None
+        self.hits = 0
+        self.misses = 0
+
+    def scan(self, root_path='.', exclude_patterns=None, stats=None) -> Iterator[Tuple[str, Optional[os.stat_result]]]:
+        """Yield the same (path, stat) pairs as scan() with the walk scanner, counting like it with stats."""
+        matcher = exclude_matcher(exclude_patterns)
+        if matcher.patterns != self.patterns:
+            self.listings = {}
+            self.patterns = matcher.patterns
+
+        listings = {}
+        stack = [root_path]
+        while stack:
+            root = stack.pop()
+            listing = self._listing(root, matcher)
+            if listing is None:
+                continue
+            listings[root] = listing
+            _, dirs, files, subdirs, excluded = listing
+            if stats is not None:
+                _count_listing(stats, len(dirs) + excluded, len(files), len(subdirs))
+            for dirpath in dirs:
+                yield dirpath, None
+            for filepath in files:
+                if matcher.matches(filepath):
+                    if stats is not None:
+                        stats.count('files_excluded')
+                    continue
+                try:
+                    file_stat = os.stat(filepath)
+                except OSError:
+                    continue
+                if stat.S_ISREG(file_stat.st_mode):
+                    yield filepath, file_stat
+            stack.extend(reversed(subdirs))
+        # Directories that were not reached this time are forgotten
+        self.listings = listings
+
+    def _listing(self, root: str, matcher: ExcludeMatcher) -> Optional[tuple]:
+        """Return the listing of root, reusing the stored one if root is unchanged."""
+        try:
+            mtime_ns = os.stat(root).st_mtime_ns
+        except OSError:
+            return None
+        listing = self.listings.get(root)
+        if listing is not None and listing[0] == mtime_ns:
+            self.hits += 1
+            return listing
+
+        self.misses += 1
+        entries = _list_directory(root, matcher)
+        if entries is None:
+            return None
+        dirs, files, subdirs, excluded = entries
+        if int(time.time() * 10**9) - mtime_ns < self.RACY_WINDOW_NS:
+            # Never matches, so the directory is listed again next time
+            mtime_ns = None
+        return mtime_ns, [entry.path for entry in dirs], [entry.path for entry in files], subdirs, excluded
+
+    def summary(self) -> str:
+        """Describe how many directory listings were reused."""
+        lookups = self.hits + self.misses
+        rate = self.hits / lookups * 100 if lookups else 0.0
+        return f"Directory index: {lookups} lookups, {self.hits} hits ({rate:.1f}%), {len(self.listings)} directories"
+
+
+def git_entries(root_path='.', exclude_patterns=None,
+                untracked=False) -> Optional[Tuple[List[str], List[str]]]:
+    """Return (files, directories) that git knows about under root_path.
+
+    Only files in the index are listed, plus untracked files that are not
+    ignored when untracked is set. Directories are those that contain a
+    listed file. Exclusion works like walk(): a file inside an excluded
+    directory is skipped even if its own path does not match. Returns None
+    outside a git repository.
+    """
+    paths = git_index.listed_files(root_path, untracked)
+    if paths is None:
+        return None
+    return listed_entries(root_path, paths, exclude_patterns)
+
+
+def listed_entries(root_path='.', paths=(), exclude_patterns=None) -> Tuple[List[str], List[str]]:
+    """Return (files, directories) for paths relative to root_path, such as files given on the command line.
+
+    Directories are those that contain a listed file, and exclusion works
+    as in git_entries().
+    """
+    matcher = exclude_matcher(exclude_patterns)
+    files = []
+    directories = []
+    excluded = {}
+    for path in paths:
+        path = os.path.relpath(path, root_path) if os.path.isabs(path) else os.path.normpath(path)
+        if _contents_excluded(root_path, os.path.dirname(path), matcher, excluded, directories):
+            continue
+        filepath = os.path.join(root_path, path)
+        if not matcher.matches(filepath):
+            files.append(filepath)
+    return files, directories
+
+
+def _contents_excluded(root_path: str, directory: str, matcher: ExcludeMatcher,
+                       excluded: Dict[str, bool], directories: List[str]) -> bool:
+    """Check if everything in a directory is excluded, recording directories that are not."""
+    if not directory:
+        return False
+    if directory not in excluded:
+        dirpath = os.path.join(root_path, directory)
+        hidden = (_contents_excluded(root_path, os.path.dirname(directory), matcher, excluded, directories)
+                  or matcher.matches(dirpath))
+        if not hidden:
+            directories.append(dirpath)
+        excluded[directory] = hidden or matcher.prunes(dirpath)
+    return excluded[directory]
+
+
+def scan(root_path='.', exclude_patterns=None, scanner='walk',
+         untracked=False, jobs=None, stats=None, filenames=None) -> Iterator[Tuple[str, Optional[os.stat_result]]]:
+    """Yield (path, None) for each directory and (path, stat) for each file.
+
+    Excluded files and directories are left out, as are paths that are not
+    regular files. With the git scanner, paths come from git_entries() and
+    the walker is used outside a git repository. With filenames, only those
+    files and the directories containing them are scanned, and nothing is
+    walked. With stats, walked paths are counted.
+    """
+    exclude_patterns = exclude_matcher(exclude_patterns)
+
+    if filenames is not None or scanner == 'git':
+        if filenames is not None:
+            entries = listed_entries(root_path, filenames, exclude_patterns)
+        else:
+            entries = git_entries(root_path, exclude_patterns, untracked)
+        if entries is not None:
+            files, directories = entries
+            if stats is not None:
+                stats.count('directories_visited', len(directories))
+                stats.count('files_visited', len(files))
+            for dirpath in directories:
+                yield dirpath, None
+            for filepath in files:
+                try:
+                    file_stat = os.stat(filepath)
+                except OSError:
+                    continue
+                if stat.S_ISREG(file_stat.st_mode):
+                    yield filepath, file_stat
+            return
+
+    for _, dirs, files in walk(root_path, exclude_patterns, jobs, stats):
+        for entry in dirs:
+            yield entry.path, None
+        for entry in files:
+            if exclude_patterns.matches(entry.path):
+                if stats is not None:
+                    stats.count('files_excluded')
+                continue
+            try:
+                if not entry.is_file():
+                    continue
+                file_stat = entry.stat()
+            except OSError:
+                continue
+            yield entry.path, file_stat
+
+
+def iter_all_files(root_path='.', exclude_patterns=None, scanner='walk', untracked=False, jobs=None,
+                   stats=None) -> Iterator[str]:
+    """Yield all files in the repository as they are found."""
+    exclude_patterns = exclude_matcher(exclude_patterns)
+
+    if scanner == 'git':
+        entries = git_entries(root_path, exclude_patterns, untracked)
+        if entries is not None:
+            if stats is not None:
+                stats.count('files_visited', len(entries[0]))
+            yield from entries[0]
+            return
+
+    for _, _, files in walk(root_path, exclude_patterns, jobs, stats):
+        for entry in files:
+            if not exclude_patterns.matches(entry.path):
+                yield entry.path
+            elif stats is not None:
+                stats.count('files_excluded')
+
+
+def find_all_files(root_path='.', exclude_patterns=None, scanner='walk', untracked=False, jobs=None, stats=None) -> List[str]:
+    """Find all files in the repository."""
+    return list(iter_all_files(root_path, exclude_patterns, scanner, untracked, jobs, stats))
+
+
+def find_directories(root_path='.', exclude_patterns=None, scanner='walk', untracked=False, jobs=None,
+                     stats=None) -> List[str]:
+    """Find all directories in the repository."""
+    directories = []
+    exclude_patterns = exclude_matcher(exclude_patterns)
+
+    entries = git_entries(root_path, exclude_patterns, untracked) if scanner == 'git' else None
+    if entries is not None:
+        candidates = entries[1]
+    else:
+        candidates = [entry.path for _, dirs, _ in walk(root_path, exclude_patterns, jobs, stats) for entry in dirs]
+
+    for dirpath in candidates:
+        dirname = os.path.basename(dirpath)
+        # Only add if not excluded by DirectoryChecker's exclusion logic
+        if not dirname.startswith('.') and dirname not in SKIPPED_DIRECTORY_NAMES:
+            directories.append(dirpath)
+
+    return directories
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""Helpers for state files the linters keep between runs."""
+
+import os
+from contextlib import contextmanager
+from typing import Any, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+
+def default_state_dir(root_path: str = '.') -> Optional[str]:
+    """Return the linter state directory inside the repository's .git directory."""
+    git_dir = os.path.join(root_path, '.git')
+    if os.path.isdir(git_dir):
+        return os.path.join(git_dir, 'filename-linter')
+    return None
+
+
+@contextmanager
+def file_lock(path: str):
+    """Hold an exclusive advisory lock on path + '.lock' while the block runs."""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path + '.lock', 'a') as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def read_json(path: str) -> Any:
+    """Read a JSON state file, returning None if it is missing or corrupt."""
+    import json
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except Exception:
+        return None
+
+
+def write_json_atomic(path: str, data: Any):
+    """Write a JSON state file so that readers never see a partial file."""
+    import json
+    write_bytes_atomic(path, json.dumps(data, separators=(',', ':')).encode('utf-8'))
+
+
+def write_bytes_atomic(path: str, data: bytes):
+    """Write a state file so that readers never see a partial file."""
+    import tempfile
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=os.path.basename(path) + '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
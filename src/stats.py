@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""Phase timings and counters of one run, printed by --stats."""
+
+import argparse
+import sys
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+# Output formats of --stats
+STATS_FORMATS = ('text', 'json')
+
+
+class Stats:
+    """Collect where a run spends its time and how much work it does.
+
+    Phases accumulate wall and CPU time under a name, such as walk,
+    exclude, rules, hashing or output. Phases can nest; each reports only
+    its own time, without that of the phases inside it, so phases add up to
+    no more than the total. Counters track paths visited and pruned and
+    bytes read, rule counters how often each rule fired per check, and
+    caches their hits and misses.
+
+    Code that can be instrumented takes a Stats or None. With None, it
+    runs without timing or counting: per-path functions are only wrapped
+    by timed() when stats are collected.
+    """
+
+    VERSION = 1
+
+    def __init__(self):
+        self.started = (time.perf_counter(), time.process_time())
+        # name -> [wall seconds, CPU seconds, calls]
+        self.phases = OrderedDict()
+        self.counters = OrderedDict()
+        # check -> rule ID -> times fired
+        self.rules = OrderedDict()
+        # name -> (hits, misses, entries)
+        self.caches = OrderedDict()
+        # [wall start, CPU start, wall of nested phases, CPU of nested phases] of each running phase
+        self._running = []
+
+    def _start(self):
+        self._running.append([time.perf_counter(), time.process_time(), 0.0, 0.0])
+
+    def _stop(self, name: str):
+        wall_start, cpu_start, nested_wall, nested_cpu = self._running.pop()
+        wall = time.perf_counter() - wall_start
+        cpu = time.process_time() - cpu_start
+        phase = self.phases.get(name)
+        if phase is None:
+            phase = self.phases[name] = [0.0, 0.0, 0]
+        phase[0] += wall - nested_wall
+        phase[1] += cpu - nested_cpu
+        phase[2] += 1
+        if self._running:
+            self._running[-1][2] += wall
+            self._running[-1][3] += cpu
+
+    def phase(self, name: str) -> '_Phase':
+        """Return a context that times its block as the named phase."""
+        return _Phase(self, name)
+
+    def timed(self, name: str, func: Callable) -> Callable:
+        """Wrap func so that each call is timed as the named phase."""
+        def timed_call(*args, **kwargs):
+            self._start()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self._stop(name)
+        return timed_call
+
+    def timed_iter(self, name: str, iterable: Iterable) -> Iterator:
+        """Yield the items of iterable, timing the work of producing each one as the named phase."""
+        iterator = iter(iterable)
+        while True:
+            self._start()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                self._stop(name)
+            yield item
+
+    def count(self, name: str, amount: int = 1):
+        """Add amount to a counter."""
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def count_rule(self, check: str, rule_id: str, amount: int = 1):
+        """Record that a rule of a check fired amount times."""
+        rules = self.rules.get(check)
+        if rules is None:
+            rules = self.rules[check] = OrderedDict()
+        rules[rule_id] = rules.get(rule_id, 0) + amount
+
+    def count_rules(self, check: str, verdict: Iterable[Tuple[str, str]]):
+        """Record each rule of a (rule ID, message) verdict as fired once."""
+        for rule_id, _ in verdict:
+            self.count_rule(check, rule_id)
+
+    def add_cache(self, name: str, hits: int, misses: int, entries: int):
+        """Record the lookups of a cache, adding to earlier ones of the same name."""
+        old_hits, old_misses, _ = self.caches.get(name, (0, 0, 0))
+        self.caches[name] = (old_hits + hits, old_misses + misses, entries)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return everything collected, with the total time so far."""
+        wall = time.perf_counter() - self.started[0]
+        cpu = time.process_time() - self.started[1]
+        caches = OrderedDict()
+        for name, (hits, misses, entries) in self.caches.items():
+            lookups = hits + misses
+            caches[name] = {'hits': hits, 'misses': misses, 'hit_rate': hits / lookups if lookups else 0.0,
+                            'entries': entries}
+        return {
+            'version': self.VERSION,
+            'wall': wall,
+            'cpu': cpu,
+            'phases': OrderedDict((name, {'wall': phase_wall, 'cpu': phase_cpu, 'calls': calls})
+                                  for name, (phase_wall, phase_cpu, calls) in self.phases.items()),
+            'counters': OrderedDict(self.counters),
+            'caches': caches,
+            'rules': OrderedDict((check, OrderedDict(rules)) for check, rules in self.rules.items()),
+        }
+
+    def format_text(self) -> str:
+        """Describe the run for people."""
+        data = self.to_dict()
+        lines = [f"Time: {data['wall'] * 1000:.1f} ms wall, {data['cpu'] * 1000:.1f} ms CPU"]
+        if data['phases']:
+            lines.append("Phases:")
+            for name, phase in data['phases'].items():
+                lines.append(f"  {name:<12} {phase['wall'] * 1000:10.1f} ms wall {phase['cpu'] * 1000:10.1f} ms CPU"
+                             f" {phase['calls']:>9} {'call' if phase['calls'] == 1 else 'calls'}")
+        if data['counters']:
+            lines.append("Counters:")
+            width = max(len(name) for name in data['counters'])
+            for name, value in data['counters'].items():
+                lines.append(f"  {name.replace('_', ' '):<{width}} {value:>12}")
+        if data['caches']:
+            lines.append("Caches:")
+            for name, cache in data['caches'].items():
+                lookups = cache['hits'] + cache['misses']
+                lines.append(f"  {name.replace('_', ' ').capitalize()}: {lookups} lookups, {cache['hits']} hits "
+                             f"({cache['hit_rate'] * 100:.1f}%), {cache['entries']} entries")
+        if data['rules']:
+            lines.append("Rules fired:")
+            for check, rules in data['rules'].items():
+                for rule_id, fired in sorted(rules.items(), key=lambda item: (-item[1], item[0])):
+                    lines.append(f"  {check + '/' + rule_id:<36} {fired:>8}")
+        return '\n'.join(lines)
+
+    def report(self, stats_format: str = 'text', output_format: str = 'text'):
+        """Print the statistics: text to stderr, next to the errors, or JSON to stdout.
+
+        When violations are printed on stdout, as JSON Lines or SARIF,
+        JSON statistics go to stderr instead, so stdout stays one document.
+        """
+        if stats_format == 'json':
+            # Imported here: json is only needed for machine-readable stats
+            import json
+            print(json.dumps(self.to_dict()), file=sys.stdout if output_format == 'text' else sys.stderr)
+        else:
+            print(self.format_text(), file=sys.stderr)
+
+
+class _Phase:
+    """Context that times its block as a phase of a Stats."""
+
+    def __init__(self, stats: Stats, name: str):
+        self.stats = stats
+        self.name = name
+
+    def __enter__(self):
+        self.stats._start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stats._stop(self.name)
+        return False
+
+
+class _NoPhase:
+    """Context that does nothing, used in place of a phase when stats are off."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+_NO_PHASE = _NoPhase()
+
+
+def timed_phase(stats: Optional[Stats], name: str):
+    """Return a context timing the named phase, or one that does nothing without stats."""
+    return stats.phase(name) if stats is not None else _NO_PHASE
+
+
+def timed(stats: Optional[Stats], name: str, func: Callable) -> Callable:
+    """Return func timed as the named phase, or func itself without stats."""
+    return stats.timed(name, func) if stats is not None else func
+
+
+def add_stats_arguments(parser: argparse.ArgumentParser):
+    """Add --stats and --stats-format to a command line parser."""
+    parser.add_argument('--stats', action='store_true',
+                        help='Print phase timings, path counts, cache hit rates and rule counts')
+    parser.add_argument('--stats-format', choices=STATS_FORMATS,
+                        help='Print --stats as text on stderr or as JSON on stdout, or on stderr with --format jsonl or '
+                             'sarif (implies --stats; default: text)')
+
+
+def stats_from_args(args: argparse.Namespace) -> Optional[Stats]:
+    """Return a Stats if --stats or --stats-format was given, else None."""
+    if args.stats or args.stats_format:
+        return Stats()
+    return None
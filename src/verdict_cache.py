@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""Bounded cache of naming verdicts for repeated basenames."""
+
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+
+class VerdictCache:
+    """Map (basename, rule plan fingerprint) to the (rule ID, message) pairs it violates.
+
+    Naming checks depend only on the basename and the compiled rules, so a
+    verdict can be reused for every path that ends in the same name, such as
+    index.ts or __init__.py. The least recently used verdicts are evicted
+    once maxsize is reached.
+    """
+
+    DEFAULT_MAXSIZE = 65536
+
+    def __init__(self, maxsize: int = DEFAULT_MAXSIZE):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, name: str, fingerprint: str) -> Optional[Tuple[Tuple[str, str], ...]]:
+        """Return the cached verdict, or None."""
+        key = (name, fingerprint)
+        verdict = self.entries.get(key)
+        if verdict is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return verdict
+
+    def put(self, name: str, fingerprint: str, verdict: Tuple[Tuple[str, str], ...]):
+        """Store a verdict, evicting the least recently used one if full."""
+        self.entries[(name, fingerprint)] = verdict
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+    def summary(self) -> str:
+        """Describe the hit rate of the cache."""
+        lookups = self.hits + self.misses
+        rate = self.hits / lookups * 100 if lookups else 0.0
+        return f"Verdict cache: {lookups} lookups, {self.hits} hits ({rate:.1f}%), {len(self.entries)} entries"
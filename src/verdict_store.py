@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""Persistent store of per-path verdicts, so unchanged paths are not checked again."""
+
+import os
+import time
+import zlib
+from typing import List, Optional
+
+SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS plans (kind TEXT PRIMARY KEY, fingerprint TEXT NOT NULL)",
+    "CREATE TABLE IF NOT EXISTS verdicts (kind TEXT NOT NULL, path TEXT NOT NULL, identity TEXT NOT NULL, "
+    "errors TEXT NOT NULL, PRIMARY KEY (kind, path))",
+)
+
+
+def store_fingerprint(*parts: object) -> str:
+    """Summarise everything a verdict depends on besides the path, e.g. rules and exclusions."""
+    text = repr(parts).encode('utf-8')
+    return f"{zlib.crc32(text):08x}{zlib.adler32(text):08x}"
+
+
+class VerdictStore:
+    """Map (path, stat identity) to the errors a checker reported for it.
+
+    Errors are strings; the directory checker stores the listing of each
+    directory, see DirectoryChecker.check_tree().
+
+    Verdicts live in a SQLite database, in a separate namespace per kind of
+    check, e.g. 'directories'. Each kind records the fingerprint of the
+    rules that produced its verdicts; when the configuration changes, the
+    fingerprint changes and the old verdicts are discarded. All verdicts of
+    a kind are read at once. Saving writes only the rows that were added,
+    changed or pruned, in a single transaction.
+    """
+
+    VERSION = 3
+
+    # Files modified this recently may still change within the same mtime
+    # tick, so their verdicts are not stored.
+    RACY_WINDOW_NS = 2 * 10**9
+
+    def __init__(self, db_file: str, kind: str, fingerprint: str):
+        self.db_file = db_file
+        self.kind = kind
+        self.fingerprint = fingerprint
+        self.entries = {}
+        # Entries looked up or stored during this run
+        self.used = {}
+        # Entries stored during this run, and whether the stored rows are discarded
+        self.updated = {}
+        self.reset = False
+        self.hits = 0
+        self.misses = 0
+        self.load()
+
+    @staticmethod
+    def identity(file_stat: os.stat_result) -> str:
+        """Return the identity of a stat result; a change means the path must be checked again."""
+        return f"{file_stat.st_dev}:{file_stat.st_ino}:{file_stat.st_size}:{file_stat.st_mtime_ns}"
+
+    def _connect(self):
+        """Open the database, creating its tables if needed."""
+        # Imported here: sqlite3 is only needed when a store is used
+        import sqlite3
+        os.makedirs(os.path.dirname(self.db_file) or '.', exist_ok=True)
+        connection = sqlite3.connect(self.db_file, timeout=10)
+        version = connection.execute("PRAGMA user_version").fetchone()[0]
+        if version != self.VERSION:
+            connection.execute("DROP TABLE IF EXISTS plans")
+            connection.execute("DROP TABLE IF EXISTS verdicts")
+            connection.execute(f"PRAGMA user_version = {self.VERSION}")
+        for statement in SCHEMA:
+            connection.execute(statement)
+        return connection
+
+    def load(self):
+        """Read the verdicts of this kind, unless they were made by other rules."""
+        try:
+            connection = self._connect()
+            try:
+                row = connection.execute("SELECT fingerprint FROM plans WHERE kind = ?", (self.kind,)).fetchone()
+                if row is None or row[0] != self.fingerprint:
+                    self.reset = True
+                    return
+                for path, identity, errors in connection.execute(
+                        "SELECT path, identity, errors FROM verdicts WHERE kind = ?", (self.kind,)):
+                    # Errors are split on a hit; most paths have none
+                    self.entries[path] = (identity, errors)
+            finally:
+                connection.close()
+        except Exception:
+            # A missing, locked or corrupt store only costs a full check
+            self.entries = {}
+            self.reset = True
+
+    def get(self, path: str, identity: str) -> Optional[List[str]]:
+        """Return the stored errors of path, or None if it is new or changed."""
+        entry = self.entries.get(path)
+        if entry is not None and entry[0] == identity:
+            self.used[path] = entry
+            self.hits += 1
+            return entry[1].split('\0') if entry[1] else []
+        self.misses += 1
+        return None
+
+    def put(self, path: str, identity: str, errors: List[str], file_stat: Optional[os.stat_result] = None):
+        """Store the errors of path, unless file_stat shows it was modified too recently to trust."""
+        if file_stat is not None and int(time.time() * 10**9) - file_stat.st_mtime_ns < self.RACY_WINDOW_NS:
+            return
+        self.used[path] = self.updated[path] = (identity, '\0'.join(errors))
+
+    def save(self, prune: bool = True):
+        """Write the added and changed verdicts back.
+
+        With prune, verdicts not used in this run are deleted, which drops
+        paths that were deleted. When the rules changed, the stored verdicts
+        of this kind are replaced. Write errors are ignored.
+        """
+        if self.reset:
+            # Nothing was loaded, so every verdict is new
+            entries = self.used
+            removed = []
+        else:
+            entries = self.updated
+            removed = [path for path in self.entries if path not in self.used] if prune else []
+            if not entries and not removed:
+                return
+        try:
+            connection = self._connect()
+            try:
+                with connection:
+                    if self.reset:
+                        connection.execute("DELETE FROM verdicts WHERE kind = ?", (self.kind,))
+                        connection.execute("INSERT OR REPLACE INTO plans (kind, fingerprint) VALUES (?, ?)",
+                                           (self.kind, self.fingerprint))
+                    connection.executemany("DELETE FROM verdicts WHERE kind = ? AND path = ?",
+                                           ((self.kind, path) for path in removed))
+                    connection.executemany(
+                        "INSERT OR REPLACE INTO verdicts (kind, path, identity, errors) VALUES (?, ?, ?, ?)",
+                        ((self.kind, path, identity, errors) for path, (identity, errors) in entries.items()))
+            finally:
+                connection.close()
+        except Exception:
+            pass
+
+    def summary(self) -> str:
+        """Describe how many verdicts were replayed."""
+        lookups = self.hits + self.misses
+        rate = self.hits / lookups * 100 if lookups else 0.0
+        return f"Verdict store: {lookups} lookups, {self.hits} hits ({rate:.1f}%), {len(self.used)} entries"
+
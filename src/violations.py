@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""Violations found by the checks, and writers that report them as they are found."""
+
+import argparse
+import os
+import sys
+from collections import OrderedDict, namedtuple
+from typing import Iterable, Optional
+
+try:
+    from .rule_plan import RULE_DESCRIPTIONS
+    from .stats import Stats, timed
+except ImportError:
+    from rule_plan import RULE_DESCRIPTIONS
+    from stats import Stats, timed
+
+# Output formats of --format
+OUTPUT_FORMATS = ('text', 'jsonl', 'sarif')
+
+# Severity of a violation that fails the check
+ERROR = 'error'
+
+# Separates the fields of an encoded violation
+_FIELD_SEPARATOR = '\x1f'
+
+
+class Violation(namedtuple('Violation', ['path', 'check', 'rule_id', 'severity', 'message', 'suggestion'])):
+    """A rule that a path breaks.
+
+    check names the check that found it, as in --checks, and rule_id the
+    rule within that check. suggestion is a name the path could be renamed
+    to, or None. str() gives the error line the text output prints.
+    """
+
+    __slots__ = ()
+
+    def __str__(self):
+        return f"{self.path}: {self.message}"
+
+    def encode(self) -> str:
+        """Return the violation as one line without its path, for a verdict store."""
+        return _FIELD_SEPARATOR.join((self.check, self.rule_id, self.severity, self.message, self.suggestion or ''))
+
+    @classmethod
+    def decode(cls, path: str, text: str) -> 'Violation':
+        """Return the violation of path that encode() returned as text."""
+        check, rule_id, severity, message, suggestion = text.split(_FIELD_SEPARATOR)
+        return cls(path, check, rule_id, severity, message, suggestion or None)
+
+
+class TextWriter:
+    """Print each violation as a 'path: message' line on stderr."""
+
+    # Suggested names are not shown, so they need not be computed
+    suggests = False
+
+    def __init__(self, stream=None):
+        self.stream = stream if stream is not None else sys.stderr
+
+    def write(self, violation: Violation):
+        print(violation, file=self.stream)
+
+    def close(self):
+        pass
+
+
+class JsonLinesWriter:
+    """Print each violation as a JSON object on a line of its own, on stdout."""
+
+    suggests = True
+
+    def __init__(self, stream=None):
+        # Imported here: json is only needed for machine-readable output
+        import json
+        self.dumps = json.dumps
+        self.stream = stream if stream is not None else sys.stdout
+
+    def write(self, violation: Violation):
+        self.stream.write(self.dumps({
+            'path': violation.path,
+            'check': violation.check,
+            'rule_id': violation.rule_id,
+            'severity': violation.severity,
+            'message': violation.message,
+            'suggested_name': violation.suggestion,
+        }) + '\n')
+        # Consumers see each violation as soon as it is found
+        self.stream.flush()
+
+    def close(self):
+        pass
+
+
+class SarifWriter:
+    """Print a SARIF 2.1.0 log on stdout, with each violation written as it is found.
+
+    Results are written inside the run's results array as they arrive.
+    The rules they refer to are only known at the end, so close() writes
+    the tool section after the results and ends the document; until then
+    it is not valid JSON. Rule IDs are qualified by their check, e.g.
+    'files/lowercase', and suggested names are result properties.
+    """
+
+    SCHEMA = 'https://json.schemastore.org/sarif-2.1.0.json'
+    VERSION = '2.1.0'
+
+    suggests = True
+
+    def __init__(self, tool_name: str, stream=None):
+        # Imported here: json and urllib are only needed for machine-readable output
+        import json
+        from urllib.parse import quote
+        self.dumps = json.dumps
+        self.quote = quote
+        self.tool_name = tool_name
+        self.stream = stream if stream is not None else sys.stdout
+        # SARIF rule ID -> (index, description from RULE_DESCRIPTIONS), in order of first use
+        self.rules = OrderedDict()
+        self.stream.write(f'{{"version": "{self.VERSION}", "$schema": "{self.SCHEMA}", "runs": [{{"results": [')
+        self.separator = '\n'
+
+    def write(self, violation: Violation):
+        rule_id = f"{violation.check}/{violation.rule_id}"
+        rule = self.rules.get(rule_id)
+        if rule is None:
+            # The message of a violation may depend on options or the path; the rule's description does not
+            rule = self.rules[rule_id] = (len(self.rules), RULE_DESCRIPTIONS.get(rule_id, rule_id))
+        result = {
+            'ruleId': rule_id,
+            'ruleIndex': rule[0],
+            'level': violation.severity,
+            'message': {'text': violation.message},
+            'locations': [{'physicalLocation': {'artifactLocation': self.artifact_location(violation.path)}}],
+        }
+        if violation.suggestion is not None:
+            result['properties'] = {'suggestedName': violation.suggestion}
+        self.stream.write(self.separator + self.dumps(result))
+        self.stream.flush()
+        self.separator = ',\n'
+
+    def artifact_location(self, path: str):
+        """Return the SARIF location of a path: relative to the source root, or an absolute file URI."""
+        path = path.replace(os.sep, '/')
+        if path.startswith('/'):
+            return {'uri': 'file://' + self.quote(path)}
+        if path.startswith('./'):
+            path = path[2:]
+        return {'uri': self.quote(path), 'uriBaseId': '%SRCROOT%'}
+
+    def close(self):
+        rules = [{'id': rule_id, 'shortDescription': {'text': description}}
+                 for rule_id, (_, description) in self.rules.items()]
+        tool = {'driver': {'name': self.tool_name, 'rules': rules}}
+        self.stream.write(f'\n], "tool": {self.dumps(tool)}}}]}}\n')
+        self.stream.flush()
+
+
+def create_writer(output_format: str, tool_name: str):
+    """Return the writer of an output format; tool_name identifies the linter in SARIF logs."""
+    if output_format == 'jsonl':
+        return JsonLinesWriter()
+    if output_format == 'sarif':
+        return SarifWriter(tool_name)
+    return TextWriter()
+
+
+def write_violations(violations: Iterable[Violation], writer, stats: Optional[Stats] = None) -> int:
+    """Write each violation as it arrives and return exit code: 1 if there were any.
+
+    With stats, writing is timed as the output phase and each violation
+    counts as its rule firing once.
+    """
+    write = timed(stats, 'output', writer.write)
+    found = False
+    for violation in violations:
+        write(violation)
+        if stats is not None:
+            stats.count_rule(violation.check, violation.rule_id)
+        found = True
+    return 1 if found else 0
+
+
+def add_format_argument(parser: argparse.ArgumentParser):
+    """Add --format to a command line parser."""
+    parser.add_argument('--format', choices=OUTPUT_FORMATS, default='text',
+                        help='Print violations as text on stderr, or as JSON Lines or SARIF on stdout, '
+                             'each as soon as it is found (default: text)')
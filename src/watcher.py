@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""Report paths that change in a working tree, with inotify or by polling."""
+
+import os
+import select
+import struct
+import sys
+import time
+from typing import Dict, Iterable, Optional, Set
+
+try:
+    from .scanner import DirectoryIndex, exclude_matcher, walk
+except ImportError:
+    from scanner import DirectoryIndex, exclude_matcher, walk
+
+# Changes that arrive this soon after the first one are reported together
+SETTLE_SECONDS = 0.1
+
+
+class InotifyWatcher:
+    """Watch every scanned directory of a tree with Linux inotify.
+
+    Directories that are created or moved into the tree are watched as
+    they appear. Raises OSError if inotify is unavailable or the watch
+    limit is reached, so callers can fall back to PollingWatcher.
+    """
+
+    IN_MODIFY = 0x00000002
+    IN_ATTRIB = 0x00000004
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_Q_OVERFLOW = 0x00004000
+    IN_IGNORED = 0x00008000
+    IN_ONLYDIR = 0x01000000
+    IN_ISDIR = 0x40000000
+    IN_NONBLOCK = 0o4000
+    IN_CLOEXEC = 0o2000000
+
+    WATCH_MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO
+                  | IN_CREATE | IN_DELETE | IN_ONLYDIR)
+
+    EVENT_HEADER = struct.Struct('iIII')
+
+    def __init__(self, root_path: str = '.', exclude_patterns: Optional[Iterable[str]] = None):
+        if not sys.platform.startswith('linux'):
+            raise OSError('inotify is only available on Linux')
+        # Imported here: ctypes is only needed for inotify
+        import ctypes
+        import ctypes.util
+
+        self.libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self.get_errno = ctypes.get_errno
+        self.root_path = root_path
+        self.matcher = exclude_matcher(exclude_patterns)
+        self.directories = {}
+        self.fd = self.libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        if self.fd < 0:
+            raise self._error('inotify_init1')
+        try:
+            self.add_tree(root_path)
+        except OSError:
+            self.close()
+            raise
+
+    def _error(self, function: str) -> OSError:
+        """Return the OSError of a failed libc call."""
+        errno = self.get_errno()
+        return OSError(errno, f"{function}: {os.strerror(errno)}")
+
+    def add_tree(self, dirpath: str):
+        """Watch dirpath and every directory below it that a scan descends into."""
+        for root, _, _ in walk(dirpath, self.matcher):
+            wd = self.libc.inotify_add_watch(self.fd, os.fsencode(root), self.WATCH_MASK)
+            if wd < 0:
+                errno = self.get_errno()
+                if errno in (2, 20):  # ENOENT, ENOTDIR: removed while walking
+                    continue
+                raise self._error('inotify_add_watch')
+            self.directories[wd] = root
+
+    def wait(self, timeout: Optional[float] = None) -> Set[str]:
+        """Wait for changes and return the changed paths, or an empty set on timeout.
+
+        A change that cannot be attributed to a path, such as an event queue
+        overflow, is reported as a change of the root directory.
+        """
+        changed = set()
+        if not select.select([self.fd], [], [], timeout)[0]:
+            return changed
+        while True:
+            self._read_events(changed)
+            if not select.select([self.fd], [], [], SETTLE_SECONDS)[0]:
+                return changed
+
+    def _read_events(self, changed: Set[str]):
+        """Read the pending events and add their paths to changed."""
+        try:
+            data = os.read(self.fd, 65536)
+        except BlockingIOError:
+            return
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = self.EVENT_HEADER.unpack_from(data, offset)
+            offset += self.EVENT_HEADER.size
+            name = os.fsdecode(data[offset:offset + length].rstrip(b'\0'))
+            offset += length
+
+            if mask & self.IN_Q_OVERFLOW:
+                changed.add(self.root_path)
+                continue
+            if mask & self.IN_IGNORED:
+                self.directories.pop(wd, None)
+                continue
+            directory = self.directories.get(wd)
+            if directory is None:
+                continue
+            path = os.path.join(directory, name) if name else directory
+            changed.add(path)
+            if mask & self.IN_ISDIR and mask & (self.IN_CREATE | self.IN_MOVED_TO):
+                if not self.matcher.matches(path) and not self.matcher.prunes(path) and not os.path.islink(path):
+                    self.add_tree(path)
+
+    def close(self):
+        """Stop watching."""
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+class PollingWatcher:
+    """Find changes by scanning the tree every interval seconds.
+
+    Files are compared by size, modification time and inode, so this works
+    on any platform and filesystem, at the cost of a stat() per file and
+    directory on every poll.
+    """
+
+    def __init__(self, root_path: str = '.', exclude_patterns: Optional[Iterable[str]] = None, interval: float = 1.0):
+        self.root_path = root_path
+        self.exclude_patterns = exclude_matcher(exclude_patterns).patterns
+        self.interval = interval
+        self.index = DirectoryIndex()
+        self.snapshot = self._snapshot()
+
+    def _snapshot(self) -> Dict[str, Optional[tuple]]:
+        """Map every scanned path to its identity, or None for directories."""
+        snapshot = {}
+        for path, file_stat in self.index.scan(self.root_path, self.exclude_patterns):
+            if file_stat is None:
+                snapshot[path] = None
+            else:
+                snapshot[path] = (file_stat.st_size, file_stat.st_mtime_ns, file_stat.st_ino)
+        return snapshot
+
+    def wait(self, timeout: Optional[float] = None) -> Set[str]:
+        """Poll until something changes and return the changed paths, or an empty set on timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            delay = self.interval if deadline is None else min(self.interval, max(deadline - time.monotonic(), 0))
+            time.sleep(delay)
+            snapshot = self._snapshot()
+            changed = {path for path in snapshot.keys() | self.snapshot.keys()
+                       if snapshot.get(path, ()) != self.snapshot.get(path, ())}
+            self.snapshot = snapshot
+            if changed or (deadline is not None and time.monotonic() >= deadline):
+                return changed
+
+    def close(self):
+        """Stop watching."""
+
+
+def create_watcher(root_path: str = '.', exclude_patterns: Optional[Iterable[str]] = None, interval: float = 1.0):
+    """Return an InotifyWatcher if possible, else a PollingWatcher."""
+    try:
+        return InotifyWatcher(root_path, exclude_patterns)
+    except (OSError, AttributeError):
+        return PollingWatcher(root_path, exclude_patterns, interval)
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""Tests for the synthetic repository generator and the benchmark runner."""
+
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+# Add benchmarks and src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from run_benchmarks import RESULTS_VERSION, PhaseTimer, compare, run_benchmarks
+from synthetic_repo import RepoSpec, generate_repo
+
+TINY_SPEC = RepoSpec(depth=1, fanout=2, files_per_directory=10, duplicate_ratio=0.2, empty_ratio=0.1,
+                     max_size=256, seed=7)
+
+
+def read_tree(root):
+    """Return {relative path: contents} of every file under root."""
+    tree = {}
+    for dirpath, _, filenames in os.walk(root):
+        for filename in filenames:
+            path = os.path.join(dirpath, filename)
+            with open(path, 'rb') as f:
+                tree[os.path.relpath(path, root)] = f.read()
+    return tree
+
+
+def test_generator_is_deterministic():
+    """Test that a spec always produces the same tree, and another seed does not."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        first = os.path.join(temp_dir, 'first')
+        second = os.path.join(temp_dir, 'second')
+        other = os.path.join(temp_dir, 'other')
+        counts = generate_repo(first, TINY_SPEC)
+        assert generate_repo(second, RepoSpec.from_dict(TINY_SPEC.to_dict())) == counts
+        assert read_tree(first) == read_tree(second)
+
+        generate_repo(other, RepoSpec.from_dict(dict(TINY_SPEC.to_dict(), seed=8)))
+        assert read_tree(other) != read_tree(first)
+
+        assert counts['files'] == 30 and counts['directories'] == 2
+        assert counts['files'] == len(read_tree(first))
+        assert counts['bytes'] == sum(len(data) for data in read_tree(first).values())
+
+
+def test_invalid_spec_rejected():
+    """Test that impossible file sizes are rejected."""
+    for sizes in [{'min_size': 0}, {'min_size': 100, 'max_size': 10}]:
+        try:
+            RepoSpec(**sizes)
+        except ValueError:
+            continue
+        assert False, f"{sizes} accepted"
+
+
+def test_results_cover_every_checker_and_phase():
+    """Test that each checker gets end-to-end and per-phase timings."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        counts = generate_repo(temp_dir, TINY_SPEC)
+        stderr = io.StringIO()
+        with contextlib.redirect_stderr(stderr):
+            results = run_benchmarks(temp_dir, repeat=1, min_time=0)
+        # Errors are timed, not shown
+        assert stderr.getvalue() == ''
+
+        assert set(results) == {'FileNameChecker', 'DirectoryChecker', 'EmptyFileChecker', 'DuplicateFileChecker'}
+        assert set(results['FileNameChecker']['phases']) == {'walk', 'exclude', 'rules', 'output'}
+        assert set(results['DuplicateFileChecker']['phases']) == {'walk', 'exclude', 'hashing', 'output'}
+        for result in results.values():
+            assert set(result['end_to_end']) == {'wall', 'cpu'}
+            assert result['end_to_end']['wall'] > 0
+            assert result['loops'] == 1
+        assert results['EmptyFileChecker']['errors'] == counts['empty_files']
+
+
+def test_measurements_last_min_time():
+    """Test that fast checkers run several times per repeat, and the timings are per run."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        generate_repo(temp_dir, TINY_SPEC)
+        start = time.perf_counter()
+        results = run_benchmarks(temp_dir, repeat=2, checkers=['EmptyFileChecker'], min_time=0.2)
+        elapsed = time.perf_counter() - start
+        result = results['EmptyFileChecker']
+        assert result['loops'] > 1
+        # The phases and the end-to-end runs each last about min_time
+        assert elapsed >= 0.2
+        assert result['end_to_end']['wall'] * result['loops'] * 2 < elapsed
+
+
+def test_phase_timer_keeps_median():
+    """Test that one outlying repeat does not move the kept timing."""
+    timer = PhaseTimer()
+    for wall in [0.2, 0.1, 5.0]:
+        timer.totals['walk'] = (wall * 2, wall)
+        timer.end_repeat(loops=2)
+    assert timer.phases == {'walk': {'wall': 0.2, 'cpu': 0.1}}
+
+
+def test_compare_flags_regressions():
+    """Test that only end-to-end slowdowns above the threshold and the noise floor count as regressions."""
+    def results(end_to_end, walk):
+        return {'version': RESULTS_VERSION, 'checkers': {'FileNameChecker': {
+            'end_to_end': {'wall': end_to_end, 'cpu': end_to_end},
+            'phases': {'walk': {'wall': walk, 'cpu': walk}},
+            'errors': 0,
+        }}}
+
+    baseline = results(1.0, 0.1)
+    with contextlib.redirect_stdout(io.StringIO()):
+        assert compare(baseline, results(1.05, 0.5), threshold=0.1) == []
+        regressions = compare(baseline, results(1.2, 0.1), threshold=0.1)
+        # Doubling a 2 ms run is within the noise floor
+        assert compare(results(0.002, 0.001), results(0.004, 0.001), threshold=0.1, noise_floor=0.005) == []
+        assert len(compare(results(0.002, 0.001), results(0.004, 0.001), threshold=0.1, noise_floor=0.001)) == 1
+        # Checkers missing from the baseline are skipped
+        assert compare({'checkers': {}}, results(5.0, 5.0)) == []
+    assert len(regressions) == 1 and regressions[0].startswith('FileNameChecker: +20.0%')
+
+
+if __name__ == '__main__':
+    test_generator_is_deterministic()
+    test_invalid_spec_rejected()
+    test_results_cover_every_checker_and_phase()
+    test_measurements_last_min_time()
+    test_phase_timer_keeps_median()
+    test_compare_flags_regressions()
+    print("All benchmark tests passed!")
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""Tests for cached configuration loading."""
+
+import os
+import sys
+import tempfile
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import config_loader
+
+
+def write_config(path, content):
+    """Write a config file."""
+    with open(path, 'w') as f:
+        f.write(content)
+
+
+def test_load_config_parses_yaml():
+    """Test that configs are parsed and unreadable ones give {}."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        config_file = os.path.join(temp_dir, 'config.yaml')
+        write_config(config_file, 'files:\n  use-underscore: true\n  reject-patterns:\n    - "^tmp.*$"\n')
+
+        config = config_loader.load_config(config_file, cache_file=os.path.join(temp_dir, 'cache'))
+        assert config == {'files': {'use-underscore': True, 'reject-patterns': ['^tmp.*$']}}
+        assert config_loader.load_config(os.path.join(temp_dir, 'missing.yaml')) == {}
+
+        write_config(config_file, 'files: [unclosed\n')
+        assert config_loader.load_config(config_file, cache_file='') == {}
+
+
+def test_cache_skips_parsing():
+    """Test that a cached config is loaded without parsing YAML again."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        config_file = os.path.join(temp_dir, 'config.yaml')
+        cache_file = os.path.join(temp_dir, 'cache')
+        write_config(config_file, 'empty-files:\n  allow-empty: true\n')
+        config_loader.load_config(config_file, cache_file=cache_file)
+        assert os.path.exists(cache_file)
+
+        parse = config_loader._parse
+        config_loader._loaded.clear()
+        config_loader._parse = None
+        try:
+            first = config_loader.load_config(config_file, cache_file=cache_file)
+            second = config_loader.load_config(config_file, cache_file=cache_file)
+        finally:
+            config_loader._parse = parse
+
+        assert first == {'empty-files': {'allow-empty': True}}
+        # Every caller gets its own copy
+        first['empty-files']['allow-empty'] = False
+        assert second == {'empty-files': {'allow-empty': True}}
+
+
+def test_cache_follows_content_changes():
+    """Test that an edited config is parsed again, and a corrupt cache is ignored."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        config_file = os.path.join(temp_dir, 'config.yaml')
+        cache_file = os.path.join(temp_dir, 'cache')
+        write_config(config_file, 'duplicate-files:\n  allow-duplicates: false\n')
+        config_loader.load_config(config_file, cache_file=cache_file)
+
+        write_config(config_file, 'duplicate-files:\n  allow-duplicates: true\n')
+        assert config_loader.load_config(config_file, cache_file=cache_file) == {'duplicate-files': {'allow-duplicates': True}}
+
+        with open(cache_file, 'wb') as f:
+            f.write(b'not marshal data')
+        config_loader._loaded.clear()
+        assert config_loader.load_config(config_file, cache_file=cache_file) == {'duplicate-files': {'allow-duplicates': True}}
+
+
+if __name__ == '__main__':
+    test_load_config_parses_yaml()
+    test_cache_skips_parsing()
+    test_cache_follows_content_changes()
+    print("All config loader tests passed!")
@@ -129,6 +129,116 @@ def test_file_hash():
         assert hash1 != hash2_new, "Different files should have different hash"
 
 
+def test_same_size_different_content():
+    """Test that files sharing only their size are not duplicates."""
+    checker = DuplicateFileChecker()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        file1 = os.path.join(temp_dir, 'file1.txt')
+        file2 = os.path.join(temp_dir, 'file2.txt')
+
+        with open(file1, 'w') as f:
+            f.write('content one')
+        with open(file2, 'w') as f:
+            f.write('content two')
+
+        assert checker.find_duplicates([file1, file2]) == []
+
+
+def test_large_files_differing_in_middle():
+    """Test that large files with equal first and last blocks are fully compared."""
+    checker = DuplicateFileChecker()
+    block = checker.PARTIAL_HASH_SIZE
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        file1 = os.path.join(temp_dir, 'file1.bin')
+        file2 = os.path.join(temp_dir, 'file2.bin')
+        file3 = os.path.join(temp_dir, 'file3.bin')
+
+        with open(file1, 'wb') as f:
+            f.write(b'a' * block + b'x' * block + b'z' * block)
+        with open(file2, 'wb') as f:
+            f.write(b'a' * block + b'y' * block + b'z' * block)
+        with open(file3, 'wb') as f:
+            f.write(b'a' * block + b'x' * block + b'z' * block)
+
+        assert checker.find_duplicates([file1, file2, file3]) == [[file1, file3]]
+
+
+def test_duplicate_groups_order():
+    """Test that groups are sorted and ordered by first appearance."""
+    checker = DuplicateFileChecker()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        paths = {}
+        for name, content in [('b.txt', 'two'), ('a.txt', 'one'), ('d.txt', 'two'), ('c.txt', 'one')]:
+            paths[name] = os.path.join(temp_dir, name)
+            with open(paths[name], 'w') as f:
+                f.write(content)
+
+        groups = checker.find_duplicates([paths['b.txt'], paths['a.txt'], paths['d.txt'], paths['c.txt']])
+        assert groups == [[paths['b.txt'], paths['d.txt']], [paths['a.txt'], paths['c.txt']]]
+
+
+def test_parallel_hashing_matches_sequential():
+    """Test that parallel hashing gives the same groups as sequential hashing."""
+    block = DuplicateFileChecker.PARTIAL_HASH_SIZE
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        paths = []
+        for i in range(12):
+            path = os.path.join(temp_dir, f'file{i:02d}.bin')
+            with open(path, 'wb') as f:
+                f.write(b'h' * block + bytes([i % 3]) * block + b't' * block)
+            paths.append(path)
+        paths.reverse()
+
+        sequential = DuplicateFileChecker(jobs=1).find_duplicates(paths)
+        parallel = DuplicateFileChecker(jobs=4).find_duplicates(paths)
+        assert parallel == sequential
+        assert len(parallel) == 3 and all(len(group) == 4 for group in parallel)
+
+
+def test_hardlinks_read_once():
+    """Test that hardlinked paths are hashed once and count as duplicates by default."""
+    checker = DuplicateFileChecker(jobs=1)
+    block = checker.PARTIAL_HASH_SIZE
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        file1 = os.path.join(temp_dir, 'file1.bin')
+        link1 = os.path.join(temp_dir, 'link1.bin')
+        with open(file1, 'wb') as f:
+            f.write(b'x' * (3 * block))
+        os.link(file1, link1)
+
+        hashed = []
+        get_file_hash = checker.get_file_hash
+        checker.get_file_hash = lambda filepath: hashed.append(filepath) or get_file_hash(filepath)
+
+        assert checker.find_duplicates([file1, link1]) == [[file1, link1]]
+        assert hashed == [file1], f"Hardlinked file should be read once: {hashed}"
+
+
+def test_hardlink_modes():
+    """Test reporting and ignoring hardlinks separately from content duplicates."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        file1 = os.path.join(temp_dir, 'file1.txt')
+        link1 = os.path.join(temp_dir, 'link1.txt')
+        copy1 = os.path.join(temp_dir, 'copy1.txt')
+        with open(file1, 'w') as f:
+            f.write('shared content')
+        os.link(file1, link1)
+
+        assert DuplicateFileChecker(hardlinks='duplicate').check_files([file1, link1]) == 1
+        assert DuplicateFileChecker(hardlinks='report').check_files([file1, link1]) == 1
+        assert DuplicateFileChecker(hardlinks='ignore').check_files([file1, link1]) == 0
+
+        # A real copy is still a duplicate of the linked file
+        with open(copy1, 'w') as f:
+            f.write('shared content')
+        assert DuplicateFileChecker(hardlinks='ignore').find_duplicates([file1, link1, copy1]) == [[copy1, file1]]
+
+
 if __name__ == '__main__':
     test_duplicate_detection()
     test_unique_files()
@@ -136,4 +246,10 @@ if __name__ == '__main__':
     test_allow_duplicates_flag()
     test_config_file()
     test_file_hash()
+    test_same_size_different_content()
+    test_large_files_differing_in_middle()
+    test_duplicate_groups_order()
+    test_parallel_hashing_matches_sequential()
+    test_hardlinks_read_once()
+    test_hardlink_modes()
     print("All duplicate file tests passed!")
@@ -2,6 +2,7 @@
 """Tests for empty file checker."""
 
 import os
+import subprocess
 import sys
 import tempfile
 
@@ -89,10 +90,44 @@ def test_config_file():
         os.unlink(config_file)
 
 
+def test_git_index_source():
+    """Test finding empty files from the git index without walking the tree."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        subprocess.run(['git', 'init', '-q', temp_dir], check=True)
+        for name, content in [('empty.txt', ''), ('__init__.py', ''), ('content.txt', 'text')]:
+            with open(os.path.join(temp_dir, name), 'w') as f:
+                f.write(content)
+        subprocess.run(['git', 'add', '.'], cwd=temp_dir, check=True)
+
+        cwd = os.getcwd()
+        os.chdir(temp_dir)
+        try:
+            checker = EmptyFileChecker(source='git-index')
+            assert sorted(checker.find_empty_in_index()) == [os.path.join('.', '__init__.py'), os.path.join('.', 'empty.txt')]
+            assert checker.check_index() == 1
+
+            # Untracked files given explicitly are checked on the filesystem
+            with open('untracked.txt', 'w') as f:
+                pass
+            assert checker.check_index(['content.txt']) == 0
+            assert checker.check_index(['untracked.txt']) == 1
+        finally:
+            os.chdir(cwd)
+
+        # Outside a repository the caller falls back to the filesystem
+        with tempfile.TemporaryDirectory() as other_dir:
+            os.chdir(other_dir)
+            try:
+                assert EmptyFileChecker(source='git-index').check_index() is None
+            finally:
+                os.chdir(cwd)
+
+
 if __name__ == '__main__':
     test_empty_file_detection()
     test_non_empty_file()
     test_allowed_empty_files()
     test_allow_empty_flag()
     test_config_file()
+    test_git_index_source()
     print("All empty file tests passed!")
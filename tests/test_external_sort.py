@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""Tests for external sorting and bounded-memory duplicate detection."""
+
+import os
+import random
+import sys
+import tempfile
+import tracemalloc
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from external_sort import ExternalSorter, repeated_runs
+from duplicate_file_checker import DuplicateFileChecker
+
+
+def test_sorter_in_memory():
+    """Test sorting without spilling."""
+    sorter = ExternalSorter(memory_budget=1024 * 1024)
+    for record in [(3, 'c'), (1, 'a'), (2, 'b')]:
+        sorter.add(record)
+    assert list(sorter) == [(1, 'a'), (2, 'b'), (3, 'c')]
+    assert sorter.runs == []
+
+
+def test_sorter_spills_and_merges():
+    """Test that spilled runs merge into sorted output and are cleaned up."""
+    rng = random.Random(42)
+    records = [(rng.randrange(50), f'path-{i}') for i in range(500)]
+
+    # A one byte budget spills every record and forces run compaction
+    sorter = ExternalSorter(memory_budget=1)
+    for record in records:
+        sorter.add(record)
+    temp_dir = sorter.temp_dir
+    assert len(sorter.runs) <= ExternalSorter.MAX_RUNS
+
+    assert list(sorter) == sorted(records)
+    assert not os.path.exists(temp_dir)
+
+
+def test_sorter_spills_at_budget():
+    """Test that the buffer spills when the memory its records take reaches the budget."""
+    budget = 1024 * 1024
+    buffered = []
+
+    class MeasuredSorter(ExternalSorter):
+        def _spill(self):
+            buffered.append(tracemalloc.get_traced_memory()[0])
+            super()._spill()
+
+    sorter = MeasuredSorter(memory_budget=budget)
+    tracemalloc.start()
+    try:
+        for i in range(20000):
+            # A (size, index, path, dev, ino, mtime_ns) record, as the duplicate check buffers
+            path = f'./src/module-{i:06d}/file-name-{i:06d}.py'
+            sorter.add((1000 + i, i, path, 2049, 10 ** 7 + i, 1700000000 * 10 ** 9 + i))
+            if buffered:
+                break
+    finally:
+        tracemalloc.stop()
+        sorter.close()
+
+    assert buffered, 'the sorter never spilled'
+    assert 0.8 * budget <= buffered[0] <= 1.2 * budget
+
+
+def test_repeated_runs():
+    """Test that only runs of two or more records are yielded."""
+    records = [(1, 'a'), (2, 'b'), (2, 'c'), (3, 'd'), (4, 'e'), (4, 'f'), (4, 'g')]
+    assert list(repeated_runs(iter(records), 1)) == [
+        ((2, 'b'), (2, 'b')), ((2, 'b'), (2, 'c')),
+        ((4, 'e'), (4, 'e')), ((4, 'e'), (4, 'f')), ((4, 'e'), (4, 'g')),
+    ]
+
+
+def test_external_duplicates_match_in_memory():
+    """Test that bounded-memory detection finds the same groups in the same order."""
+    checker = DuplicateFileChecker(jobs=2)
+    block = checker.PARTIAL_HASH_SIZE
+    rng = random.Random(7)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        paths = []
+        for i in range(40):
+            path = os.path.join(temp_dir, f'file{i:02d}.bin')
+            variant = rng.randrange(6)
+            with open(path, 'wb') as f:
+                if variant < 3:
+                    f.write(b'small %d' % variant)
+                else:
+                    f.write(b'h' * block + bytes([variant]) * block + b't' * block)
+            paths.append(path)
+        rng.shuffle(paths)
+
+        expected = []
+        for group in checker.find_duplicates(paths):
+            expected.extend((filepath, group[0]) for filepath in group)
+
+        assert list(checker.iter_duplicates_external(iter(paths), memory_budget=256)) == expected
+
+
+if __name__ == '__main__':
+    test_sorter_in_memory()
+    test_sorter_spills_and_merges()
+    test_sorter_spills_at_budget()
+    test_repeated_runs()
+    test_external_duplicates_match_in_memory()
+    print("All external sort tests passed!")
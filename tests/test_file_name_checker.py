@@ -1,12 +1,15 @@
 #!/usr/bin/env python3
 """Tests for file name checker."""
 
+import contextlib
+import io
 import tempfile
 import os
 import sys
 import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 from file_name_checker import FileNameChecker
+from stats import Stats
 
 
 def test_kebab_case():
@@ -245,6 +248,38 @@ def test_file_unicode_support():
         os.unlink(config_file)
 
 
+def test_parallel_check_files():
+    """Test that checking in worker processes keeps errors in input order and reports the workers' work."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        filepaths = []
+        for i in range(40):
+            name = f'File_{i}.md' if i % 3 == 0 else f'file-{i}.md'
+            filepath = os.path.join(temp_dir, name)
+            with open(filepath, 'w') as f:
+                f.write('test')
+            filepaths.append(filepath)
+        filepaths.append(os.path.join(temp_dir, 'missing_file.md'))
+
+        sequential = FileNameChecker().find_errors(filepaths)
+        checker = FileNameChecker(jobs=2)
+        checker.PARALLEL_THRESHOLD = 0
+        assert checker.find_errors_parallel(filepaths) == sequential
+        assert len(sequential) == 14 * 2
+        assert checker.verdict_cache.misses == 40
+        # The workers' verdicts end up in this process's cache
+        assert len(checker.verdict_cache.entries) == 40
+        assert checker.find_errors(filepaths) == sequential
+        assert checker.verdict_cache.hits == 40
+
+        stats = Stats()
+        checker = FileNameChecker(jobs=2, stats=stats)
+        checker.PARALLEL_THRESHOLD = 0
+        with contextlib.redirect_stderr(io.StringIO()):
+            assert checker.check_files(filepaths) == 1
+        assert stats.counters['files_checked_in_workers'] == len(filepaths)
+        assert stats.rules['files'] == {'kebab-case': 14, 'lowercase': 14}
+
+
 if __name__ == '__main__':
     test_kebab_case()
     test_snake_case()
@@ -258,4 +293,5 @@ if __name__ == '__main__':
     test_camel_case_with_config()
     test_screaming_snake_case_with_config()
     test_file_unicode_support()
+    test_parallel_check_files()
     print("All file tests passed!")
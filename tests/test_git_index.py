@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""Tests for git index helpers."""
+
+import os
+import subprocess
+import sys
+import tempfile
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import git_index
+from duplicate_file_checker import DuplicateFileChecker
+
+
+def make_repo(temp_dir, files):
+    """Create a git repository with the given files staged."""
+    subprocess.run(['git', 'init', '-q', temp_dir], check=True)
+    for name, content in files.items():
+        path = os.path.join(temp_dir, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            f.write(content)
+    subprocess.run(['git', 'add', '.'], cwd=temp_dir, check=True)
+
+
+def test_index_entries():
+    """Test reading blob IDs from the index."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        make_repo(temp_dir, {'docs/user-guide.md': 'guide', 'empty.txt': ''})
+
+        entries = git_index.index_entries(temp_dir)
+        assert set(entries) == {os.path.join('docs', 'user-guide.md'), 'empty.txt'}
+        mode, object_id = entries['empty.txt']
+        assert mode == '100644'
+        assert object_id == 'e69de29bb2d1d6434b8b29ae775ad8c2e48c5391'
+
+        guide = os.path.join(temp_dir, 'docs', 'user-guide.md')
+        assert entries[os.path.join('docs', 'user-guide.md')][1] == git_index.blob_hash(guide, os.path.getsize(guide))
+
+
+def test_index_entries_outside_repo():
+    """Test that index lookups report no repository."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        assert git_index.index_entries(temp_dir) is None
+
+
+def test_duplicates_from_index():
+    """Test duplicate detection from blob IDs with unstaged changes hashed."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        make_repo(temp_dir, {'one.txt': 'same', 'two.txt': 'same', 'three.txt': 'other'})
+        cwd = os.getcwd()
+        os.chdir(temp_dir)
+        try:
+            checker = DuplicateFileChecker(source='git-index')
+            files = ['./one.txt', './two.txt', './three.txt']
+            assert checker.find_duplicates(files) == [['./one.txt', './two.txt']]
+
+            # An unstaged edit is picked up from the working tree
+            with open('three.txt', 'w') as f:
+                f.write('same')
+            assert checker.find_duplicates(files) == [['./one.txt', './three.txt', './two.txt']]
+        finally:
+            os.chdir(cwd)
+
+
+def test_listed_files():
+    """Test listing tracked and untracked files while honouring .gitignore."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        make_repo(temp_dir, {'.gitignore': 'build/\n', 'src/main.py': 'main', 'gone.txt': 'gone'})
+        os.remove(os.path.join(temp_dir, 'gone.txt'))
+        os.makedirs(os.path.join(temp_dir, 'build'))
+        for name in ['new.txt', os.path.join('build', 'output.bin')]:
+            with open(os.path.join(temp_dir, name), 'w') as f:
+                f.write(name)
+
+        assert git_index.listed_files(temp_dir) == ['.gitignore', 'src/main.py']
+        assert git_index.listed_files(temp_dir, untracked=True) == ['.gitignore', 'new.txt', 'src/main.py']
+
+
+if __name__ == '__main__':
+    test_index_entries()
+    test_index_entries_outside_repo()
+    test_duplicates_from_index()
+    test_listed_files()
+    print("All git index tests passed!")
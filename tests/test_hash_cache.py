@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""Tests for the persistent content hash cache."""
+
+import os
+import sys
+import tempfile
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from hash_cache import HashCache
+from duplicate_file_checker import DuplicateFileChecker
+
+
+def write_old_file(path, content):
+    """Write a file and move its mtime out of the racy window."""
+    with open(path, 'w') as f:
+        f.write(content)
+    os.utime(path, (1000000000, 1000000000))
+
+
+def test_cache_round_trip():
+    """Test that stored digests survive a save and reload."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cache_file = os.path.join(temp_dir, 'state', 'hash-cache.json')
+        file1 = os.path.join(temp_dir, 'file1.txt')
+        write_old_file(file1, 'content')
+
+        cache = HashCache(cache_file)
+        assert cache.get(os.stat(file1), 'full') is None
+        cache.put(os.stat(file1), 'full', 'abc')
+        cache.save()
+
+        reloaded = HashCache(cache_file)
+        assert reloaded.get(os.stat(file1), 'full') == 'abc'
+        assert reloaded.hits == 1
+
+
+def test_cache_invalidated_by_change():
+    """Test that a modified file misses the cache."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cache_file = os.path.join(temp_dir, 'hash-cache.json')
+        file1 = os.path.join(temp_dir, 'file1.txt')
+        write_old_file(file1, 'content')
+
+        cache = HashCache(cache_file)
+        cache.put(os.stat(file1), 'full', 'abc')
+        write_old_file(file1, 'changed content')
+        assert cache.get(os.stat(file1), 'full') is None
+
+
+def test_recently_modified_not_cached():
+    """Test that files inside the racy window are not stored."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cache = HashCache(os.path.join(temp_dir, 'hash-cache.json'))
+        file1 = os.path.join(temp_dir, 'file1.txt')
+        with open(file1, 'w') as f:
+            f.write('content')
+
+        cache.put(os.stat(file1), 'full', 'abc')
+        assert cache.get(os.stat(file1), 'full') is None
+
+
+def test_prune_drops_unused_entries():
+    """Test that pruning keeps only entries used in the current run."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cache_file = os.path.join(temp_dir, 'hash-cache.json')
+        file1 = os.path.join(temp_dir, 'file1.txt')
+        file2 = os.path.join(temp_dir, 'file2.txt')
+        write_old_file(file1, 'one')
+        write_old_file(file2, 'two')
+
+        cache = HashCache(cache_file)
+        cache.put(os.stat(file1), 'full', 'hash1')
+        cache.put(os.stat(file2), 'full', 'hash2')
+        cache.save()
+
+        cache = HashCache(cache_file)
+        cache.get(os.stat(file1), 'full')
+        cache.save(prune=False)
+        assert len(HashCache(cache_file).entries) == 2
+
+        cache.save(prune=True)
+        assert list(HashCache(cache_file).entries) == [HashCache.identity(os.stat(file1))]
+
+
+def test_start_run_keeps_used_entries():
+    """Test that a new run in the same process keeps only the entries the last run used."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        file1 = os.path.join(temp_dir, 'file1.txt')
+        file2 = os.path.join(temp_dir, 'file2.txt')
+        write_old_file(file1, 'one')
+        write_old_file(file2, 'two')
+
+        cache = HashCache(os.path.join(temp_dir, 'hash-cache.json'))
+        cache.put(os.stat(file1), 'full', 'abc')
+        cache.put(os.stat(file2), 'full', 'def')
+        cache.start_run()
+        assert cache.get(os.stat(file1), 'full') == 'abc'
+
+        cache.start_run()
+        assert cache.get(os.stat(file1), 'full') == 'abc'
+        assert cache.get(os.stat(file2), 'full') is None
+
+
+def test_checker_skips_unchanged_files():
+    """Test that the duplicate checker does not rehash cached files."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cache_file = os.path.join(temp_dir, 'hash-cache.json')
+        content = 'x' * (3 * DuplicateFileChecker.PARTIAL_HASH_SIZE)
+        file1 = os.path.join(temp_dir, 'file1.txt')
+        file2 = os.path.join(temp_dir, 'file2.txt')
+        write_old_file(file1, content)
+        write_old_file(file2, content)
+
+        checker = DuplicateFileChecker(cache_file=cache_file)
+        assert checker.find_duplicates([file1, file2]) == [[file1, file2]]
+        checker.save_cache()
+
+        checker = DuplicateFileChecker(cache_file=cache_file)
+        hashed = []
+        checker.get_file_hash = lambda filepath: hashed.append(filepath) or ''
+        assert checker.find_duplicates([file1, file2]) == [[file1, file2]]
+        assert hashed == [], f"Cached files should not be rehashed: {hashed}"
+
+
+if __name__ == '__main__':
+    test_cache_round_trip()
+    test_cache_invalidated_by_change()
+    test_recently_modified_not_cached()
+    test_prune_drops_unused_entries()
+    test_start_run_keeps_used_entries()
+    test_checker_skips_unchanged_files()
+    print("All hash cache tests passed!")
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""Tests for the incremental duplicate check manifest."""
+
+import os
+import sys
+import tempfile
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from hash_manifest import HashManifest
+from duplicate_file_checker import DuplicateFileChecker, check_incremental
+
+
+def write_file(path, content):
+    """Write a text file."""
+    with open(path, 'w') as f:
+        f.write(content)
+
+
+def test_manifest_round_trip():
+    """Test that entries and digests survive a save and reload."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        manifest_file = os.path.join(temp_dir, 'state', 'manifest.json')
+        file1 = os.path.join(temp_dir, 'file1.txt')
+        write_file(file1, 'content')
+
+        manifest = HashManifest(manifest_file)
+        assert not manifest.loaded
+        key = HashManifest.key(file1)
+        manifest.update(key, os.stat(file1))
+        manifest.set_digest(key, 'abc')
+        manifest.head = 'deadbeef'
+        manifest.save()
+
+        reloaded = HashManifest(manifest_file)
+        assert reloaded.loaded
+        assert reloaded.head == 'deadbeef'
+        assert reloaded.digest(key) == 'abc'
+        assert reloaded.with_size(7) == [key]
+
+
+def test_manifest_forgets_digest_of_changed_file():
+    """Test that a changed stat drops the stored digest."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        manifest = HashManifest(os.path.join(temp_dir, 'manifest.json'))
+        file1 = os.path.join(temp_dir, 'file1.txt')
+        write_file(file1, 'content')
+        key = HashManifest.key(file1)
+        manifest.update(key, os.stat(file1))
+        manifest.set_digest(key, 'abc')
+
+        write_file(file1, 'new content')
+        manifest.update(key, os.stat(file1))
+        assert manifest.digest(key) is None
+        assert manifest.with_size(7) == []
+
+
+def test_incremental_finds_duplicate_of_unchanged_file():
+    """Test that a changed file is matched against unchanged files in the manifest."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        manifest = HashManifest(os.path.join(temp_dir, 'manifest.json'))
+        original = os.path.join(temp_dir, 'original.txt')
+        other = os.path.join(temp_dir, 'other.txt')
+        changed = os.path.join(temp_dir, 'changed.txt')
+        write_file(original, 'same content')
+        write_file(other, 'something else')
+        write_file(changed, 'different')
+
+        checker = DuplicateFileChecker(jobs=1)
+        checker.update_manifest(manifest, [original, other, changed])
+
+        write_file(changed, 'same content')
+        hashed = []
+        get_file_hash = checker.get_file_hash
+        checker.get_file_hash = lambda filepath: hashed.append(filepath) or get_file_hash(filepath)
+
+        groups = checker.find_duplicates_incremental([changed], manifest)
+        assert groups == [sorted([HashManifest.key(original), HashManifest.key(changed)])]
+        assert HashManifest.key(other) not in hashed, "Files of another size should not be hashed"
+
+
+def test_check_incremental_builds_and_reuses_manifest():
+    """Test the incremental entry point with explicit changed files."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cwd = os.getcwd()
+        os.chdir(temp_dir)
+        try:
+            write_file('user-guide.md', 'guide')
+            write_file('api-docs.md', 'docs')
+            manifest_file = os.path.join('state', 'manifest.json')
+            checker = DuplicateFileChecker(exclude_patterns=['state'], jobs=1)
+
+            assert check_incremental(checker, [], manifest_file) == 0
+            assert HashManifest(manifest_file).loaded
+
+            write_file('guide-copy.md', 'guide')
+            assert check_incremental(checker, ['guide-copy.md'], manifest_file) == 1
+            assert HashManifest.key('guide-copy.md') in HashManifest(manifest_file).entries
+        finally:
+            os.chdir(cwd)
+
+
+if __name__ == '__main__':
+    test_manifest_round_trip()
+    test_manifest_forgets_digest_of_changed_file()
+    test_incremental_finds_duplicate_of_unchanged_file()
+    test_check_incremental_builds_and_reuses_manifest()
+    print("All hash manifest tests passed!")
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""Tests that the hook modules import quickly."""
+
+import os
+import re
+import subprocess
+import sys
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+
+# Modules that cost milliseconds to import and are only needed by some runs
+HEAVY_MODULES = ['yaml', 'pathlib', 'concurrent.futures', 'multiprocessing', 'subprocess',
+                 'tempfile', 'json', 'logging']
+
+# Generous, so that slow CI machines do not fail; typical imports take 20-50 ms
+IMPORT_BUDGET_US = 250000
+
+
+def import_times(module):
+    """Import module in a fresh interpreter and return {module: cumulative microseconds}."""
+    code = f"import sys; sys.path.insert(0, {SRC_DIR!r}); import {module}"
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                            stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True)
+    assert result.returncode == 0, result.stderr
+    times = {}
+    for line in result.stderr.splitlines():
+        match = re.match(r'import time:\s+\d+ \|\s+(\d+) \| ( *)(\S+)$', line)
+        if match:
+            times[match.group(3)] = int(match.group(1))
+    return times
+
+
+def test_hooks_skip_heavy_imports():
+    """Test that importing a hook does not pull in modules it only needs sometimes."""
+    for module in ['file_name_checker', 'directory_checker', 'empty_file_checker']:
+        times = import_times(module)
+        assert module in times
+        imported = [name for name in HEAVY_MODULES if name in times]
+        assert imported == [], f"{module} imports {imported}"
+        assert 'hashlib' not in times, module
+
+
+def test_import_time_budget():
+    """Test that every hook imports within the budget."""
+    for module in ['file_name_checker', 'directory_checker', 'empty_file_checker',
+                   'duplicate_file_checker', 'naming_linter']:
+        times = import_times(module)
+        assert times[module] < IMPORT_BUDGET_US, f"{module} took {times[module]} us to import"
+        assert 'yaml' not in times, module
+
+
+if __name__ == '__main__':
+    test_hooks_skip_heavy_imports()
+    test_import_time_budget()
+    print("All import time tests passed!")
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""Tests for the linter daemon, its client and the directory index."""
+
+import contextlib
+import io
+import json
+import os
+import socket
+import sys
+import tempfile
+import threading
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import linter_client
+from linter_daemon import LinterDaemon
+from scanner import DirectoryIndex, scan
+
+
+def make_tree(root):
+    """Create a small tree with a naming error, an empty file and a duplicate."""
+    os.makedirs(os.path.join(root, '.git'))
+    os.makedirs(os.path.join(root, 'docs', 'guides'))
+    os.makedirs(os.path.join(root, 'node_modules', 'pkg'))
+    with open(os.path.join(root, 'BadName.md'), 'w') as f:
+        f.write('same\n')
+    with open(os.path.join(root, 'docs', 'user-guide.md'), 'w') as f:
+        f.write('same\n')
+    open(os.path.join(root, 'docs', 'guides', 'empty-page.md'), 'w').close()
+    open(os.path.join(root, 'node_modules', 'pkg', 'index.js'), 'w').close()
+
+
+def age_directories(root):
+    """Move directory mtimes out of the index's racy window."""
+    for dirpath, _, _ in os.walk(root):
+        os.utime(dirpath, (1000000000, 1000000000))
+
+
+def scanned(entries):
+    """Reduce scan results to comparable (path, size) pairs."""
+    return [(path, None if file_stat is None else file_stat.st_size) for path, file_stat in entries]
+
+
+def test_directory_index_matches_scan():
+    """Test that scanning through the index gives the same results as scan()."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        make_tree(temp_dir)
+        age_directories(temp_dir)
+        patterns = [r'node_modules', r'\.git/']
+        index = DirectoryIndex()
+
+        expected = scanned(scan(temp_dir, patterns))
+        assert scanned(index.scan(temp_dir, patterns)) == expected
+        assert index.hits == 0
+
+        assert scanned(index.scan(temp_dir, patterns)) == expected
+        assert index.hits == index.misses
+
+        # A new file changes its directory's mtime, so the listing is read again
+        with open(os.path.join(temp_dir, 'docs', 'new-page.md'), 'w') as f:
+            f.write('new\n')
+        assert scanned(index.scan(temp_dir, patterns)) == scanned(scan(temp_dir, patterns))
+        assert any(path.endswith('new-page.md') for path, _ in scanned(index.scan(temp_dir, patterns)))
+
+        # Changed patterns invalidate every listing
+        assert scanned(index.scan(temp_dir, [r'\.git/'])) == scanned(scan(temp_dir, [r'\.git/']))
+
+
+def test_daemon_answers_checks():
+    """Test that the client gets the daemon's results, and falls back once it stops."""
+    if not hasattr(socket, 'AF_UNIX'):
+        return
+    with tempfile.TemporaryDirectory() as temp_dir:
+        make_tree(temp_dir)
+        cwd = os.getcwd()
+        os.chdir(temp_dir)
+        try:
+            socket_path = linter_client.default_socket_path('.')
+            daemon = LinterDaemon()
+            thread = threading.Thread(target=daemon.serve, args=(socket_path,))
+            thread.start()
+            try:
+                for _ in range(100):
+                    if linter_client.request({'command': 'status'}, socket_path) is not None:
+                        break
+                    threading.Event().wait(0.05)
+
+                for _ in range(2):
+                    stderr = io.StringIO()
+                    with contextlib.redirect_stderr(stderr):
+                        exit_code = linter_client.run_check(['--exclude', 'node_modules', '--exclude', r'\.git/'], socket_path)
+                    assert exit_code == 1
+                    errors = stderr.getvalue()
+                    assert './BadName.md: Filename should be lowercase' in errors
+                    assert './docs/guides/empty-page.md: File is empty' in errors
+                    assert 'Duplicate of' in errors
+                    assert 'node_modules' not in errors
+                assert len(daemon.checker_sets) == 1
+
+                # Statistics cover this check only and reuse its checkers
+                exit_code, stdout, _ = daemon.check(['--exclude', 'node_modules', '--exclude', r'\.git/',
+                                                     '--stats-format', 'json'])
+                stats = json.loads(stdout)
+                assert stats['caches']['verdict_cache']['misses'] == 0
+                assert stats['counters']['files_visited'] == 3
+                assert stats['counters']['directories_pruned'] == 2
+                assert len(daemon.checker_sets) == 1
+
+                stderr = io.StringIO()
+                with contextlib.redirect_stderr(stderr):
+                    exit_code = linter_client.run_check(['--checks', 'nothing'], socket_path)
+                assert exit_code == 2
+                assert 'invalid checks' in stderr.getvalue()
+
+                # An invalid exclude pattern fails its check, and the daemon keeps serving
+                stderr = io.StringIO()
+                with contextlib.redirect_stderr(stderr):
+                    exit_code = linter_client.run_check(['--exclude', '('], socket_path)
+                assert exit_code == 2
+                assert 'naming-linter:' in stderr.getvalue()
+                with contextlib.redirect_stderr(io.StringIO()):
+                    exit_code = linter_client.run_check(['--exclude', 'node_modules', '--exclude', r'\.git/'], socket_path)
+                assert exit_code == 1
+                assert linter_client.request({'command': 'status'}, socket_path)['requests'] == 6
+
+                response = daemon.handle({'command': 'check', 'cwd': '/elsewhere', 'args': []})
+                assert 'error' in response
+            finally:
+                linter_client.request({'command': 'stop'}, socket_path)
+                thread.join()
+
+            assert not os.path.exists(socket_path)
+            assert linter_client.run_check([], socket_path) is None
+        finally:
+            os.chdir(cwd)
+
+
+def test_client_gives_up_on_silent_daemon():
+    """Test that a daemon that accepts but never answers counts as no daemon."""
+    if not hasattr(socket, 'AF_UNIX'):
+        return
+    with tempfile.TemporaryDirectory() as temp_dir:
+        socket_path = os.path.join(temp_dir, 'daemon.sock')
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+            server.bind(socket_path)
+            server.listen(1)
+            assert linter_client.request({'command': 'status'}, socket_path, response_timeout=0.1) is None
+
+
+if __name__ == '__main__':
+    test_directory_index_matches_scan()
+    test_daemon_answers_checks()
+    test_client_gives_up_on_silent_daemon()
+    print("All linter daemon tests passed!")
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""Tests for the combined single-pass linter."""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from directory_checker import DirectoryChecker
+from duplicate_file_checker import DuplicateFileChecker
+from empty_file_checker import EmptyFileChecker
+from file_name_checker import FileNameChecker
+import naming_linter
+from naming_linter import check_repository, parse_checks
+
+
+def run_linter(root, checks=('files', 'directories', 'empty-files', 'duplicate-files'), **options):
+    """Run the given checks over root and return (exit code, error lines)."""
+    checkers = (
+        FileNameChecker() if 'files' in checks else None,
+        DirectoryChecker() if 'directories' in checks else None,
+        EmptyFileChecker(allow_empty=options.get('allow_empty', False)) if 'empty-files' in checks else None,
+        DuplicateFileChecker(allow_duplicates=options.get('allow_duplicates', False), cache_file='')
+        if 'duplicate-files' in checks else None,
+    )
+    stderr = io.StringIO()
+    with contextlib.redirect_stderr(stderr):
+        exit_code = check_repository(root, *checkers)
+    return exit_code, stderr.getvalue().splitlines()
+
+
+def test_reports_all_checks():
+    """Test that one walk reports file, directory, empty and duplicate errors."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        os.makedirs(os.path.join(temp_dir, 'Bad_Dir'))
+        with open(os.path.join(temp_dir, 'BadName.py'), 'w') as f:
+            f.write('print(1)\n')
+        open(os.path.join(temp_dir, 'empty-file.txt'), 'w').close()
+        for name in ['copy-one.txt', 'copy-two.txt']:
+            with open(os.path.join(temp_dir, name), 'w') as f:
+                f.write('same content\n')
+
+        exit_code, errors = run_linter(temp_dir)
+
+        assert exit_code == 1
+        assert any('BadName.py' in error for error in errors)
+        assert any('Bad_Dir' in error for error in errors)
+        assert any('empty-file.txt: File is empty' in error for error in errors)
+        assert any('Duplicate of' in error and 'copy-one.txt' in error for error in errors)
+
+
+def test_clean_tree_passes():
+    """Test that a tree without issues passes."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        os.makedirs(os.path.join(temp_dir, 'docs'))
+        with open(os.path.join(temp_dir, 'docs', 'user-guide.md'), 'w') as f:
+            f.write('# Guide\n')
+
+        exit_code, errors = run_linter(temp_dir)
+
+        assert exit_code == 0
+        assert errors == []
+
+
+def test_allow_options():
+    """Test that empty and duplicate files can be allowed."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        open(os.path.join(temp_dir, 'empty-file.txt'), 'w').close()
+        for name in ['copy-one.txt', 'copy-two.txt']:
+            with open(os.path.join(temp_dir, name), 'w') as f:
+                f.write('same content\n')
+
+        exit_code, errors = run_linter(temp_dir, allow_empty=True, allow_duplicates=True)
+
+        assert exit_code == 0
+        assert errors == []
+
+
+def make_problem_tree(root):
+    """Create a tree with one problem for each check."""
+    os.makedirs(os.path.join(root, 'Bad_Dir'))
+    with open(os.path.join(root, 'BadName.py'), 'w') as f:
+        f.write('print(1)\n')
+    open(os.path.join(root, 'empty-file.txt'), 'w').close()
+    for name in ['copy-one.txt', 'copy-two.txt']:
+        with open(os.path.join(root, name), 'w') as f:
+            f.write('same content\n')
+
+
+def test_errors_grouped_by_check():
+    """Test that each check's errors follow a heading, in check order."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        make_problem_tree(temp_dir)
+
+        exit_code, errors = run_linter(temp_dir)
+
+        assert exit_code == 1
+        headings = [line for line in errors if line.endswith('):')]
+        assert headings == ['File names (2 errors):', 'Directory names (2 errors):',
+                            'Empty files (1 error):', 'Duplicate files (2 errors):']
+        duplicate_lines = errors[errors.index('Duplicate files (2 errors):') + 1:]
+        assert len(duplicate_lines) == 2
+        assert all('Duplicate' in line for line in duplicate_lines)
+
+
+def test_subset_of_checks():
+    """Test that only the selected checks run."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        make_problem_tree(temp_dir)
+
+        exit_code, errors = run_linter(temp_dir, checks=('empty-files',))
+        assert exit_code == 1
+        assert errors[0] == 'Empty files (1 error):'
+        assert len(errors) == 2 and 'empty-file.txt: File is empty' in errors[1]
+
+        exit_code, errors = run_linter(temp_dir, checks=())
+        assert exit_code == 0
+        assert errors == []
+
+
+def make_vendored_tree(root):
+    """Create a clean tree with badly named files under .git and node_modules."""
+    os.makedirs(os.path.join(root, '.git', 'refs', 'heads'))
+    os.makedirs(os.path.join(root, 'node_modules', 'pkg'))
+    with open(os.path.join(root, '.git', 'HEAD'), 'w') as f:
+        f.write('ref: refs/heads/main\n')
+    with open(os.path.join(root, 'node_modules', 'pkg', 'Bad_Name.js'), 'w') as f:
+        f.write('module.exports = 1;\n')
+    with open(os.path.join(root, 'user-guide.md'), 'w') as f:
+        f.write('# Guide\n')
+
+
+def test_default_exclusions_without_config():
+    """Test that .git and node_modules are skipped without a config, whichever checks run."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        make_vendored_tree(temp_dir)
+        cwd = os.getcwd()
+        os.chdir(temp_dir)
+        try:
+            for checks in [[], ['--checks', 'files']]:
+                stderr = io.StringIO()
+                with contextlib.redirect_stderr(stderr):
+                    exit_code = naming_linter.main(checks)
+                assert exit_code == 0, stderr.getvalue()
+                assert stderr.getvalue() == ''
+        finally:
+            os.chdir(cwd)
+
+
+def test_filenames_limit_checks():
+    """Test that given files, and their directories, are checked instead of the whole tree, except for duplicates."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        make_problem_tree(temp_dir)
+        make_vendored_tree(temp_dir)
+        os.makedirs(os.path.join(temp_dir, 'Other_Dir'))
+        with open(os.path.join(temp_dir, 'Other_Dir', 'good-file.md'), 'w') as f:
+            f.write('# Good\n')
+        cwd = os.getcwd()
+        os.chdir(temp_dir)
+        try:
+            stderr = io.StringIO()
+            with contextlib.redirect_stderr(stderr):
+                exit_code = naming_linter.main(['empty-file.txt', 'Other_Dir/good-file.md',
+                                                'node_modules/pkg/Bad_Name.js'])
+        finally:
+            os.chdir(cwd)
+
+        errors = stderr.getvalue()
+        assert exit_code == 1
+        assert 'empty-file.txt: File is empty' in errors
+        assert 'Other_Dir' in errors
+        # Files and directories that were not given are not checked by name
+        assert 'BadName.py' not in errors and 'Bad_Dir' not in errors
+        assert 'Bad_Name.js' not in errors
+        # Duplicates are still found across the repository
+        assert 'Duplicate files (2 errors):' in errors
+
+
+def test_parse_checks():
+    """Test parsing of --checks values."""
+    assert parse_checks('duplicate-files,files') == ['files', 'duplicate-files']
+    assert parse_checks('directories') == ['directories']
+    for value in ['names', 'files,dirs', ',']:
+        try:
+            parse_checks(value)
+            assert False, value
+        except argparse.ArgumentTypeError:
+            pass
+
+
+if __name__ == '__main__':
+    test_reports_all_checks()
+    test_clean_tree_passes()
+    test_allow_options()
+    test_errors_grouped_by_check()
+    test_subset_of_checks()
+    test_default_exclusions_without_config()
+    test_filenames_limit_checks()
+    test_parse_checks()
+    print("All naming linter tests passed!")
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""Tests for near-duplicate file detection."""
+
+import contextlib
+import io
+import os
+import sys
+import tempfile
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from near_duplicate import NearDuplicateDetector
+from duplicate_file_checker import DuplicateFileChecker
+
+
+def write_lines(path, lines):
+    """Write lines to a text file."""
+    with open(path, 'w') as f:
+        f.write('\n'.join(lines) + '\n')
+
+
+def sample_lines(prefix, count=60):
+    """Return distinct lines of sample source code."""
+    return [f"{prefix}_value_{i} = compute('{prefix}', {i * 7919})" for i in range(count)]
+
+
+def test_one_changed_line_is_near_duplicate():
+    """Test that a copy with one edited line is reported."""
+    detector = NearDuplicateDetector(threshold=0.8)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        original = os.path.join(temp_dir, 'original.py')
+        vendored = os.path.join(temp_dir, 'vendored.py')
+        unrelated = os.path.join(temp_dir, 'unrelated.py')
+        lines = sample_lines('alpha')
+        write_lines(original, lines)
+        lines[30] = 'patched = True'
+        write_lines(vendored, lines)
+        write_lines(unrelated, sample_lines('beta'))
+
+        pairs = detector.find_pairs([unrelated, vendored, original])
+        assert [(first, second) for first, second, _ in pairs] == [(original, vendored)]
+        assert pairs[0][2] >= 0.8
+
+
+def test_exact_and_small_files_skipped():
+    """Test that identical files and tiny files are not reported."""
+    detector = NearDuplicateDetector()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        file1 = os.path.join(temp_dir, 'file1.py')
+        file2 = os.path.join(temp_dir, 'file2.py')
+        write_lines(file1, sample_lines('gamma'))
+        write_lines(file2, sample_lines('gamma'))
+        assert detector.find_pairs([file1, file2]) == []
+
+        tiny = os.path.join(temp_dir, 'tiny.txt')
+        write_lines(tiny, ['one line'])
+        assert detector.fingerprint(tiny) is None
+
+
+def test_binary_files_skipped():
+    """Test that binary files are not fingerprinted."""
+    detector = NearDuplicateDetector()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        binary = os.path.join(temp_dir, 'image.bin')
+        with open(binary, 'wb') as f:
+            f.write(b'\x89PNG\0\0' + b'\n'.join(line.encode() for line in sample_lines('delta')))
+        assert detector.fingerprint(binary) is None
+
+
+def test_checker_reports_near_duplicates():
+    """Test near-duplicate reporting through the duplicate checker."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        original = os.path.join(temp_dir, 'original.py')
+        vendored = os.path.join(temp_dir, 'vendored.py')
+        lines = sample_lines('epsilon')
+        write_lines(original, lines)
+        lines[5] = 'patched = True'
+        write_lines(vendored, lines)
+
+        assert DuplicateFileChecker().check_files([original, vendored]) == 0
+        assert DuplicateFileChecker(near_duplicates=True).check_files([original, vendored]) == 1
+        assert DuplicateFileChecker(near_duplicates=True, similarity_threshold=1.0).check_files([original, vendored]) == 0
+
+
+def write_cluster(directory, count):
+    """Write count copies of one file, each with a different line edited, and return their paths."""
+    paths = []
+    for i in range(count):
+        lines = sample_lines('zeta', 200)
+        lines[i % len(lines)] = f'patched_{i} = True'
+        path = os.path.join(directory, f'copy-{i:03d}.py')
+        write_lines(path, lines)
+        paths.append(path)
+    return paths
+
+
+def test_large_cluster_reported_against_first():
+    """Test that a cluster larger than a bucket cap is reported, one pair per copy."""
+    detector = NearDuplicateDetector(threshold=0.8)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for count in [70, 200]:
+            cluster_dir = os.path.join(temp_dir, str(count))
+            os.makedirs(cluster_dir)
+            paths = write_cluster(cluster_dir, count)
+            unrelated = os.path.join(cluster_dir, 'unrelated.py')
+            write_lines(unrelated, sample_lines('eta'))
+
+            pairs = detector.find_pairs(list(reversed(paths)) + [unrelated])
+            assert [(first, second) for first, second, _ in pairs] == [(paths[0], path) for path in paths[1:]]
+            assert all(similarity >= 0.8 for _, _, similarity in pairs)
+            assert not detector.budget_exceeded
+
+
+def test_time_budget():
+    """Test that a spent time budget stops the search with a warning."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        paths = write_cluster(temp_dir, 70)
+        detector = NearDuplicateDetector(time_budget=0)
+        stderr = io.StringIO()
+        with contextlib.redirect_stderr(stderr):
+            assert detector.find_pairs(paths) == []
+        assert detector.budget_exceeded
+        assert 'time budget' in stderr.getvalue()
+
+
+if __name__ == '__main__':
+    test_one_changed_line_is_near_duplicate()
+    test_exact_and_small_files_skipped()
+    test_binary_files_skipped()
+    test_checker_reports_near_duplicates()
+    test_large_cluster_reported_against_first()
+    test_time_budget()
+    print("All near-duplicate tests passed!")
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""Tests for compiled naming rule plans."""
+
+import os
+import sys
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from rule_plan import check_name, compile_directory_plan, compile_file_plans, is_kebab_case, split_words, suggest_name
+
+
+def test_default_file_plans():
+    """Test that the default plans report rule IDs with their messages."""
+    plans = compile_file_plans(None)
+
+    assert check_name(plans.general, 'user-guide.md', 'user-guide') == []
+    assert [rule_id for rule_id, _ in check_name(plans.general, 'User Guide.md', 'User Guide')] == [
+        'spaces', 'special-characters', 'kebab-case', 'lowercase']
+    assert check_name(plans.python, 'user-service.py', 'user-service') == [
+        ('python-snake-case', 'Python files should use snake_case (use underscores(_) between words, e.g., user_service.py)')]
+    assert check_name(plans.config, 'app_config.yaml', 'app_config') == []
+
+
+def test_config_file_plans():
+    """Test that options and reject patterns are resolved into rules."""
+    config = {'files': {'use-hyphen': False, 'use-pascal-case': True, 'use-capital': True,
+                        'reject-patterns': ['^temp.*$'], 'config-files': {'use-underscore': False}}}
+    plans = compile_file_plans(config)
+
+    assert check_name(plans.general, 'UserGuide.md', 'UserGuide') == []
+    assert check_name(plans.general, 'temp-notes.md', 'temp-notes') == [
+        ('reject-pattern', 'Filename matches rejected pattern: ^temp.*$'),
+        ('hyphen', 'Hyphens not allowed in filename'),
+        ('case-style', 'Files should use PascalCase'),
+    ]
+    assert [rule_id for rule_id, _ in check_name(plans.config, 'app_config.yaml', 'app_config')] == [
+        'underscore', 'config-kebab-case']
+
+
+def test_directory_plans():
+    """Test default and configured directory plans."""
+    assert check_name(compile_directory_plan(None), 'user-service', 'user-service') == []
+    assert [rule_id for rule_id, _ in check_name(compile_directory_plan(None), 'tmp', 'tmp')] == ['descriptive']
+
+    plan = compile_directory_plan({'directories': {'use-capital': True, 'use-pascal-case': True, 'min-length': 3}})
+    assert check_name(plan, 'Components', 'Components') == []
+    assert [rule_id for rule_id, _ in check_name(plan, 'ab', 'ab')] == ['length']
+
+
+def test_plans_are_immutable_and_fingerprinted():
+    """Test that plans are tuples whose fingerprint follows their options."""
+    plans = compile_file_plans({'files': {'use-underscore': True}})
+    assert isinstance(plans.general.rules, tuple)
+    try:
+        plans.general.rules[0].message = 'changed'
+    except AttributeError:
+        pass
+    else:
+        assert False, 'rule was modified'
+
+    assert plans.general.fingerprint == compile_file_plans({'files': {'use-underscore': True}}).general.fingerprint
+    assert plans.general.fingerprint != compile_file_plans({'files': {'use-underscore': False}}).general.fingerprint
+    assert compile_file_plans(None).general.fingerprint != compile_file_plans(None, allow_unicode=True).general.fingerprint
+
+
+def test_is_kebab_case():
+    """Test kebab-case detection with and without Unicode characters."""
+    assert is_kebab_case('user-guide')
+    assert is_kebab_case('readme')
+    assert not is_kebab_case('user_guide')
+    assert not is_kebab_case('değişim-notları')
+    assert is_kebab_case('değişim-notları', allow_unicode=True)
+
+
+def test_suggest_name():
+    """Test that suggested names follow the plan, keep the extension and are None when renaming cannot help."""
+    plans = compile_file_plans(None)
+    assert split_words('HTTPServer_config v2') == ['HTTP', 'Server', 'config', 'v2']
+    assert suggest_name(plans.general, 'User Guide.MD') == 'user-guide.md'
+    assert suggest_name(plans.python, 'UserService.py') == 'user_service.py'
+    assert suggest_name(plans.general, 'Test.md') is None
+    assert suggest_name(plans.general, '---.md') is None
+    assert suggest_name(compile_directory_plan(None), 'My_Components', has_suffix=False) == 'my-components'
+
+    pascal_only = compile_file_plans({'files': {'use-hyphen': False, 'use-pascal-case': True, 'use-capital': True}})
+    assert suggest_name(pascal_only.general, 'user-card.tsx') == 'UserCard.tsx'
+
+
+if __name__ == '__main__':
+    test_default_file_plans()
+    test_config_file_plans()
+    test_directory_plans()
+    test_plans_are_immutable_and_fingerprinted()
+    test_is_kebab_case()
+    test_suggest_name()
+    print("All rule plan tests passed!")
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""Tests for the shared repository walker."""
+
+import os
+import re
+import subprocess
+import sys
+import tempfile
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from scanner import ExcludeMatcher, exclude_matcher, find_all_files, find_directories, git_entries, scan, walk
+
+
+def make_tree(root):
+    """Create a small tree with nested, hidden and skipped directories."""
+    for directory in ['src/utils', 'docs', '.hidden', 'node_modules/pkg', 'build/out']:
+        os.makedirs(os.path.join(root, directory))
+    for path in ['README.md', 'src/main.py', 'src/utils/helpers.py', 'docs/guide.md',
+                 '.hidden/secret.txt', 'node_modules/pkg/index.js', 'build/out/app.bin']:
+        with open(os.path.join(root, path), 'w') as f:
+            f.write(path)
+
+
+def test_walk_matches_os_walk():
+    """Test that walk yields the same roots, directories and files as os.walk."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        make_tree(temp_dir)
+
+        expected = [(root, sorted(dirs), sorted(files)) for root, dirs, files in os.walk(temp_dir)]
+        actual = [(root, sorted(entry.name for entry in dirs), sorted(entry.name for entry in files))
+                  for root, dirs, files in walk(temp_dir)]
+
+        assert sorted(actual) == sorted(expected)
+
+
+def test_walk_prunes_excluded_directories():
+    """Test that excluded directories are neither yielded nor descended into."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        make_tree(temp_dir)
+
+        roots = [root for root, _, _ in walk(temp_dir, [r'build'])]
+        assert not any('build' in root for root in roots)
+
+        files = find_all_files(temp_dir, [r'build', r'node_modules'])
+        assert os.path.join(temp_dir, 'src', 'utils', 'helpers.py') in files
+        assert not any('build' in path or 'node_modules' in path for path in files)
+
+
+def test_walk_does_not_follow_directory_symlinks():
+    """Test that symlinked directories are listed but not descended into."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        make_tree(temp_dir)
+        os.symlink(os.path.join(temp_dir, 'src'), os.path.join(temp_dir, 'link'))
+
+        files = find_all_files(temp_dir)
+        assert not any(os.sep + 'link' + os.sep in path for path in files)
+
+
+def test_find_directories_skips_hidden_and_common():
+    """Test that hidden and common tool directories are not returned."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        make_tree(temp_dir)
+
+        names = {os.path.relpath(path, temp_dir) for path in find_directories(temp_dir, [r'node_modules'])}
+        assert names == {'src', os.path.join('src', 'utils'), 'docs', 'build', os.path.join('build', 'out')}
+
+
+def test_git_scanner():
+    """Test that the git scanner lists only files git knows about."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        make_tree(temp_dir)
+        with open(os.path.join(temp_dir, '.gitignore'), 'w') as f:
+            f.write('build/\nnode_modules/\n')
+        subprocess.run(['git', 'init', '-q', temp_dir], check=True)
+        subprocess.run(['git', 'add', 'README.md', 'src', '.gitignore'], cwd=temp_dir, check=True)
+
+        files, directories = git_entries(temp_dir, [r'utils'])
+        assert files == [os.path.join(temp_dir, name) for name in ['.gitignore', 'README.md', os.path.join('src', 'main.py')]]
+        assert directories == [os.path.join(temp_dir, 'src')]
+
+        files = find_all_files(temp_dir, scanner='git', untracked=True)
+        assert os.path.join(temp_dir, 'docs', 'guide.md') in files
+        assert not any('build' in path or 'node_modules' in path for path in files)
+
+        scanned = dict(scan(temp_dir, scanner='git'))
+        assert scanned[os.path.join(temp_dir, 'src')] is None
+        assert scanned[os.path.join(temp_dir, 'README.md')].st_size == len('README.md')
+
+
+def test_git_scanner_falls_back_to_walk():
+    """Test that the git scanner walks the tree outside a repository."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        make_tree(temp_dir)
+
+        assert git_entries(temp_dir) is None
+        assert sorted(find_all_files(temp_dir, scanner='git')) == sorted(find_all_files(temp_dir))
+
+
+def test_exclude_matcher_matches_like_re_search():
+    """Test that the combined matcher agrees with searching each pattern."""
+    patterns = [r'\.git/', r'node_modules', r'__pycache__', r'\.pytest_cache', r'.*\.tmp$',
+                r'^\./docs', r'(a)\1', r'(?i)README', r'foo|bar', r'\d+']
+    paths = ['./.git/HEAD', './.git', './src/node_modules/x.js', './notes.tmp', './notes.tmp.md',
+             './docs/guide.md', './src/docs', './aa.txt', './readme.md', './food.txt', './v2.txt', './src/main.py']
+
+    for count in range(len(patterns) + 1):
+        matcher = ExcludeMatcher(patterns[:count])
+        for path in paths:
+            expected = any(re.search(pattern, path) for pattern in patterns[:count])
+            assert matcher.matches(path) == expected, (patterns[:count], path)
+
+
+def test_exclude_matcher_prunes_literal_subtrees():
+    """Test that plain text patterns rule out whole directories."""
+    matcher = ExcludeMatcher([r'\.git/', r'build/', r'.*\.tmp$'])
+    assert matcher.prunes(os.path.join('.', '.git'))
+    assert matcher.prunes(os.path.join('.', 'src', 'build'))
+    assert not matcher.prunes(os.path.join('.', 'src'))
+    assert not ExcludeMatcher([r'^\./build/']).prunes(os.path.join('.', 'build'))
+
+
+def test_exclude_matcher_is_shared_and_validates():
+    """Test that matchers are cached per pattern list and invalid patterns fail."""
+    assert exclude_matcher([r'node_modules']) is exclude_matcher([r'node_modules'])
+    try:
+        ExcludeMatcher([r'(unclosed'])
+    except re.error:
+        pass
+    else:
+        assert False, 'invalid pattern was accepted'
+
+
+def test_walk_does_not_descend_into_pruned_directories():
+    """Test that a directory whose contents are all excluded is listed but not entered."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        make_tree(temp_dir)
+        roots = [root for root, _, _ in walk(temp_dir, [r'build/'])]
+        dirs = [entry.name for _, dirs, _ in walk(temp_dir, [r'build/']) for entry in dirs]
+
+        assert os.path.join(temp_dir, 'build') not in roots
+        assert 'build' in dirs
+        assert not any('build' + os.sep in path for path in find_all_files(temp_dir, [r'build/']))
+
+
+def test_parallel_walk_matches_sequential():
+    """Test that parallel walks yield the same results in the same order."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        make_tree(temp_dir)
+        for i in range(30):
+            directory = os.path.join(temp_dir, 'many', f'dir{i}', 'nested')
+            os.makedirs(directory)
+            with open(os.path.join(directory, 'file.txt'), 'w') as f:
+                f.write(str(i))
+
+        def listing(jobs):
+            return [(root, [entry.name for entry in dirs], [entry.name for entry in files])
+                    for root, dirs, files in walk(temp_dir, [r'node_modules'], jobs)]
+
+        sequential = listing(None)
+        for jobs in [2, 8]:
+            assert listing(jobs) == sequential
+        assert find_all_files(temp_dir, jobs=4) == find_all_files(temp_dir)
+        assert find_directories(temp_dir, jobs=4) == find_directories(temp_dir)
+
+
+if __name__ == '__main__':
+    test_walk_matches_os_walk()
+    test_walk_prunes_excluded_directories()
+    test_walk_does_not_follow_directory_symlinks()
+    test_find_directories_skips_hidden_and_common()
+    test_exclude_matcher_matches_like_re_search()
+    test_exclude_matcher_prunes_literal_subtrees()
+    test_exclude_matcher_is_shared_and_validates()
+    test_walk_does_not_descend_into_pruned_directories()
+    test_parallel_walk_matches_sequential()
+    test_git_scanner()
+    test_git_scanner_falls_back_to_walk()
+    print("All scanner tests passed!")
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""Tests for run statistics and the --stats option."""
+
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import empty_file_checker
+import naming_linter
+from directory_checker import DirectoryChecker
+from duplicate_file_checker import DuplicateFileChecker
+from empty_file_checker import EmptyFileChecker
+from file_name_checker import FileNameChecker
+from naming_linter import check_repository
+from stats import Stats, timed, timed_phase
+
+
+def make_tree(root):
+    """Create a tree with a naming error, an empty file, a duplicate and an excluded directory."""
+    os.makedirs(os.path.join(root, 'docs'))
+    os.makedirs(os.path.join(root, 'node_modules', 'pkg'))
+    with open(os.path.join(root, 'BadName.md'), 'w') as f:
+        f.write('same\n')
+    with open(os.path.join(root, 'docs', 'user-guide.md'), 'w') as f:
+        f.write('same\n')
+    open(os.path.join(root, 'docs', 'empty-page.md'), 'w').close()
+    open(os.path.join(root, 'node_modules', 'pkg', 'index.js'), 'w').close()
+
+
+def test_nested_phases_report_own_time():
+    """Test that a phase does not include the time of phases nested in it."""
+    stats = Stats()
+    with stats.phase('outer'):
+        time.sleep(0.02)
+        for _ in range(3):
+            with stats.phase('inner'):
+                time.sleep(0.01)
+
+    phases = stats.to_dict()['phases']
+    assert phases['outer']['calls'] == 1
+    assert phases['inner']['calls'] == 3
+    assert phases['inner']['wall'] >= 0.03
+    assert 0.02 <= phases['outer']['wall'] < 0.03 + phases['inner']['wall'] / 2
+    assert sum(phase['wall'] for phase in phases.values()) <= stats.to_dict()['wall']
+
+
+def test_timed_calls_and_iterators():
+    """Test that timed functions and iterators count calls and keep their results."""
+    stats = Stats()
+    double = stats.timed('double', lambda value: value * 2)
+    assert [double(value) for value in stats.timed_iter('produce', range(4))] == [0, 2, 4, 6]
+
+    phases = stats.to_dict()['phases']
+    assert phases['double']['calls'] == 4
+    # One more call finds the iterator exhausted
+    assert phases['produce']['calls'] == 5
+
+
+def test_nothing_is_timed_without_stats():
+    """Test that without stats, functions are not wrapped and phases do nothing."""
+    def func():
+        return 1
+
+    assert timed(None, 'rules', func) is func
+    with timed_phase(None, 'walk'):
+        pass
+    stats = Stats()
+    assert timed(stats, 'rules', func) is not func
+    with timed_phase(stats, 'walk'):
+        pass
+    assert stats.phases['walk'][2] == 1
+
+
+def test_counters_and_caches():
+    """Test that counters and cache lookups accumulate."""
+    stats = Stats()
+    stats.count('files_visited')
+    stats.count('files_visited', 2)
+    stats.count_rules('files', [('lowercase', 'Filename should be lowercase'), ('kebab-case', 'Use kebab-case')])
+    stats.count_rule('files', 'lowercase')
+    stats.add_cache('verdict_cache', 3, 1, 4)
+    stats.add_cache('verdict_cache', 1, 3, 6)
+
+    data = stats.to_dict()
+    assert data['version'] == Stats.VERSION
+    assert data['counters'] == {'files_visited': 3}
+    assert data['rules'] == {'files': {'lowercase': 2, 'kebab-case': 1}}
+    assert data['caches']['verdict_cache'] == {'hits': 4, 'misses': 4, 'hit_rate': 0.5, 'entries': 6}
+
+    text = stats.format_text()
+    for heading in ['Time:', 'Counters:', 'Caches:', 'Rules fired:']:
+        assert heading in text
+    assert 'Verdict cache: 8 lookups, 4 hits (50.0%), 6 entries' in text
+    # Rules are listed most frequent first
+    assert text.index('files/lowercase') < text.index('files/kebab-case')
+
+
+def test_check_repository_collects_stats():
+    """Test that one pass counts paths, pruned directories, bytes read and fired rules."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        make_tree(temp_dir)
+        stats = Stats()
+        checkers = (FileNameChecker(exclude_patterns=['node_modules'], stats=stats), DirectoryChecker(stats=stats),
+                    EmptyFileChecker(stats=stats), DuplicateFileChecker(cache_file='', stats=stats))
+        with contextlib.redirect_stderr(io.StringIO()):
+            assert check_repository(temp_dir, *checkers, stats=stats) == 1
+
+        data = stats.to_dict()
+        assert data['counters']['files_visited'] == 3
+        assert data['counters']['directories_visited'] == 2
+        assert data['counters']['directories_pruned'] == 1
+        assert data['counters']['files_hashed'] == 2
+        assert data['counters']['bytes_read'] == 10
+        assert data['rules']['files']['lowercase'] == 1
+        assert data['rules']['empty-files'] == {'empty-file': 1}
+        assert data['rules']['duplicate-files'] == {'duplicate': 2}
+        assert {'walk', 'exclude', 'rules', 'hashing', 'output'} <= set(data['phases'])
+
+
+def test_main_prints_json_stats():
+    """Test that --stats-format json prints one JSON document on stdout, apart from the errors."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        make_tree(temp_dir)
+        cwd = os.getcwd()
+        os.chdir(temp_dir)
+        try:
+            stdout = io.StringIO()
+            stderr = io.StringIO()
+            with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+                exit_code = naming_linter.main(['--checks', 'files,empty-files', '--exclude', 'node_modules',
+                                            '--stats-format', 'json'])
+        finally:
+            os.chdir(cwd)
+
+        assert exit_code == 1
+        data = json.loads(stdout.getvalue())
+        assert data['rules'] == {'files': {'kebab-case': 1, 'lowercase': 1}, 'empty-files': {'empty-file': 1}}
+        assert 'verdict_cache' in data['caches']
+        assert 'setup' in data['phases']
+        assert 'Statistics:' not in stderr.getvalue()
+        assert './BadName.md: Filename should be lowercase' in stderr.getvalue()
+
+
+def test_json_stats_with_machine_readable_output():
+    """Test that with --format jsonl or sarif, JSON stats go to stderr and stdout stays one format."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        make_tree(temp_dir)
+        cwd = os.getcwd()
+        argv = sys.argv
+        os.chdir(temp_dir)
+        try:
+            outputs = {}
+            for output_format in ['sarif', 'jsonl']:
+                stdout = io.StringIO()
+                stderr = io.StringIO()
+                sys.argv = ['empty-file-linter', '--format', output_format, '--stats-format', 'json']
+                with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+                    assert empty_file_checker.main() == 1
+                outputs[output_format] = stdout.getvalue(), stderr.getvalue()
+
+            stdout = io.StringIO()
+            with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(io.StringIO()):
+                naming_linter.main(['--format', 'jsonl', '--stats-format', 'json'])
+            outputs['naming-linter'] = stdout.getvalue(), ''
+        finally:
+            sys.argv = argv
+            os.chdir(cwd)
+
+        stdout, stderr = outputs['sarif']
+        run = json.loads(stdout)['runs'][0]
+        assert [result['ruleId'] for result in run['results']] == ['empty-files/empty-file']
+        assert json.loads(stderr)['rules'] == {'empty-files': {'empty-file': 1}}
+
+        stdout, stderr = outputs['jsonl']
+        records = [json.loads(line) for line in stdout.splitlines()]
+        assert [record['rule_id'] for record in records] == ['empty-file']
+        assert json.loads(stderr)['rules'] == {'empty-files': {'empty-file': 1}}
+
+        records = [json.loads(line) for line in outputs['naming-linter'][0].splitlines()]
+        assert records and all('rule_id' in record for record in records)
+
+
+if __name__ == '__main__':
+    test_nested_phases_report_own_time()
+    test_timed_calls_and_iterators()
+    test_nothing_is_timed_without_stats()
+    test_counters_and_caches()
+    test_check_repository_collects_stats()
+    test_main_prints_json_stats()
+    test_json_stats_with_machine_readable_output()
+    print("All stats tests passed!")
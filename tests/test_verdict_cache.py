@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""Tests for the naming verdict cache."""
+
+import os
+import sys
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from directory_checker import DirectoryChecker
+from file_name_checker import FileNameChecker
+from verdict_cache import VerdictCache
+
+
+def test_lru_eviction():
+    """Test that the least recently used verdict is evicted."""
+    cache = VerdictCache(maxsize=2)
+    cache.put('a.md', 'plan', ())
+    cache.put('b.md', 'plan', ())
+    assert cache.get('a.md', 'plan') == ()
+    cache.put('c.md', 'plan', ())
+
+    assert cache.get('b.md', 'plan') is None
+    assert cache.get('a.md', 'plan') == ()
+    assert cache.get('a.md', 'other-plan') is None
+    assert (cache.hits, cache.misses) == (2, 2)
+    assert cache.summary() == "Verdict cache: 4 lookups, 2 hits (50.0%), 2 entries"
+
+
+def test_repeated_basenames_reuse_verdicts():
+    """Test that repeated names are checked once and reported with each path."""
+    checker = FileNameChecker()
+    first = checker.check_file('./src/UserGuide.md')
+    second = checker.check_file('./docs/UserGuide.md')
+
+    assert first and [error.replace('./src/', './docs/') for error in first] == second
+    assert (checker.verdict_cache.hits, checker.verdict_cache.misses) == (1, 1)
+
+
+def test_shared_cache_keeps_files_and_directories_apart():
+    """Test that file and directory verdicts for the same name do not mix."""
+    cache = VerdictCache()
+    file_checker = FileNameChecker(verdict_cache=cache)
+    directory_checker = DirectoryChecker(verdict_cache=cache)
+
+    assert directory_checker.check_directory('./tmp') == ['./tmp: Directory name is not descriptive enough']
+    assert file_checker.check_file('./tmp') == ['./tmp: Filename is not descriptive enough']
+    assert cache.hits == 0
+
+
+if __name__ == '__main__':
+    test_lru_eviction()
+    test_repeated_basenames_reuse_verdicts()
+    test_shared_cache_keeps_files_and_directories_apart()
+    print("All verdict cache tests passed!")
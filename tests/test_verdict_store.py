@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""Tests for the persistent verdict store."""
+
+import os
+import sys
+import tempfile
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from directory_checker import DirectoryChecker
+from scanner import find_directories
+from verdict_store import VerdictStore
+
+
+def write_old_file(path, content):
+    """Write a file and move its mtime out of the racy window."""
+    with open(path, 'w') as f:
+        f.write(content)
+    os.utime(path, (1000000000, 1000000000))
+
+
+def test_store_round_trip():
+    """Test that verdicts survive a save and reload, and changed identities miss."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db_file = os.path.join(temp_dir, 'state', 'verdicts.sqlite3')
+        store = VerdictStore(db_file, 'directories', 'plan-1')
+        assert store.get('./Bad_Dir', '') is None
+        store.put('./Bad_Dir', '', ['./Bad_Dir: first', './Bad_Dir: second'])
+        store.put('./good-dir', '', [])
+        store.save()
+
+        reloaded = VerdictStore(db_file, 'directories', 'plan-1')
+        assert reloaded.get('./Bad_Dir', '') == ['./Bad_Dir: first', './Bad_Dir: second']
+        assert reloaded.get('./good-dir', '') == []
+        assert reloaded.get('./good-dir', 'other-identity') is None
+        assert reloaded.hits == 2
+
+        # Kinds do not see each other's verdicts
+        assert VerdictStore(db_file, 'empty-files', 'plan-1').get('./good-dir', '') is None
+
+
+def test_fingerprint_change_invalidates():
+    """Test that verdicts made by other rules are discarded."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db_file = os.path.join(temp_dir, 'verdicts.sqlite3')
+        store = VerdictStore(db_file, 'directories', 'plan-1')
+        store.put('./docs', '', [])
+        store.save()
+
+        changed = VerdictStore(db_file, 'directories', 'plan-2')
+        assert changed.get('./docs', '') is None
+        changed.save()
+        assert VerdictStore(db_file, 'directories', 'plan-1').get('./docs', '') is None
+
+
+def test_prune_and_racy_files():
+    """Test that unused verdicts are pruned and recently modified files are not stored."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db_file = os.path.join(temp_dir, 'verdicts.sqlite3')
+        old_file = os.path.join(temp_dir, 'old-file.txt')
+        new_file = os.path.join(temp_dir, 'new-file.txt')
+        write_old_file(old_file, 'old')
+        with open(new_file, 'w') as f:
+            f.write('new')
+
+        store = VerdictStore(db_file, 'empty-files', 'plan')
+        store.put('./deleted.txt', 'identity', [])
+        for path in [old_file, new_file]:
+            file_stat = os.stat(path)
+            store.put(path, VerdictStore.identity(file_stat), [], file_stat)
+        store.save()
+
+        reloaded = VerdictStore(db_file, 'empty-files', 'plan')
+        assert reloaded.get(old_file, VerdictStore.identity(os.stat(old_file))) == []
+        assert reloaded.get(new_file, VerdictStore.identity(os.stat(new_file))) is None
+        reloaded.save(prune=True)
+        assert set(VerdictStore(db_file, 'empty-files', 'plan').entries) == {old_file}
+
+
+class RecordingWriter:
+    """Remember the violations written to it."""
+
+    suggests = True
+
+    def __init__(self):
+        self.violations = []
+
+    def write(self, violation):
+        self.violations.append(violation)
+
+
+def age(path):
+    """Move the mtime of a path out of the racy window."""
+    os.utime(path, (1000000000, 1000000000))
+
+
+def test_tree_replays_unchanged_directories():
+    """Test that only new or changed directories are listed again, with the same violations as a walk."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db_file = os.path.join(temp_dir, 'state', 'verdicts.sqlite3')
+        root = os.path.join(temp_dir, 'repo')
+        for dirpath in ['Bad_Dir/sub-dir', 'docs/Other_Dir', 'node_modules/Some_Pkg', '.hidden/Inner_Dir']:
+            os.makedirs(os.path.join(root, dirpath))
+        for dirpath, _, _ in os.walk(root):
+            age(dirpath)
+
+        checker = DirectoryChecker()
+        expected = RecordingWriter()
+        checker.check_directories(find_directories(root), expected)
+        # Bad_Dir, Other_Dir and Inner_Dir break two rules each; node_modules is excluded
+        assert len(expected.violations) == 6
+
+        directory_count = sum(1 for _ in os.walk(root))
+        listed = []
+        list_directory = checker._list_directory
+        checker._list_directory = lambda root, *args: listed.append(root) or list_directory(root, *args)
+        for _ in range(2):
+            listed.clear()
+            store = VerdictStore(db_file, 'directories', checker.store_fingerprint())
+            writer = RecordingWriter()
+            assert checker.check_tree(root, [], store, writer) == 1
+            store.save()
+            assert writer.violations == expected.violations
+        # The second run only stat()ed the directories
+        assert listed == []
+        assert store.hits == directory_count and store.misses == 0
+
+        # A new directory changes its parent, which alone is listed again
+        os.makedirs(os.path.join(root, 'docs', 'New_Dir'))
+        store = VerdictStore(db_file, 'directories', checker.store_fingerprint())
+        writer = RecordingWriter()
+        checker.check_tree(root, [], store, writer)
+        assert listed == [os.path.join(root, 'docs'), os.path.join(root, 'docs', 'New_Dir')]
+        assert any(violation.path.endswith('New_Dir') for violation in writer.violations)
+
+        # Other exclude patterns give another fingerprint
+        assert checker.store_fingerprint([r'docs']) != checker.store_fingerprint()
+
+
+def test_save_writes_changed_rows_only():
+    """Test that saving a run without changes does not touch the database, and a change keeps the other rows."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db_file = os.path.join(temp_dir, 'verdicts.sqlite3')
+        store = VerdictStore(db_file, 'directories', 'plan')
+        for name in ['first', 'second', 'third']:
+            store.put(name, 'identity', [name])
+        store.save()
+
+        store = VerdictStore(db_file, 'directories', 'plan')
+        connections = []
+        connect = store._connect
+        store._connect = lambda: connections.append(1) or connect()
+        for name in ['first', 'second', 'third']:
+            store.get(name, 'identity')
+        store.save()
+        assert connections == []
+
+        store.put('second', 'changed', ['second again'])
+        store.save()
+        assert connections == [1]
+        reloaded = VerdictStore(db_file, 'directories', 'plan')
+        assert reloaded.entries == {'first': ('identity', 'first'), 'second': ('changed', 'second again'),
+                                    'third': ('identity', 'third')}
+
+
+if __name__ == '__main__':
+    test_store_round_trip()
+    test_fingerprint_change_invalidates()
+    test_prune_and_racy_files()
+    test_tree_replays_unchanged_directories()
+    test_save_writes_changed_rows_only()
+    print("All verdict store tests passed!")
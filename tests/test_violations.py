@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""Tests for violations and the text, JSON Lines and SARIF writers."""
+
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import directory_checker
+from directory_checker import DirectoryChecker
+from duplicate_file_checker import DuplicateFileChecker
+from empty_file_checker import EmptyFileChecker
+from file_name_checker import FileNameChecker
+from naming_linter import check_repository
+from rule_plan import RULE_DESCRIPTIONS, compile_directory_plan, compile_file_plans
+from stats import Stats
+from verdict_store import VerdictStore
+from violations import ERROR, JsonLinesWriter, SarifWriter, TextWriter, Violation, write_violations
+
+BAD_NAME = Violation('./docs/BadName.md', 'files', 'lowercase', ERROR, 'Filename should be lowercase', 'bad-name.md')
+EMPTY = Violation('./docs/empty-page.md', 'empty-files', 'empty-file', ERROR, 'File is empty', None)
+
+
+class RecordingWriter:
+    """Remember the violations written to it."""
+
+    suggests = True
+
+    def __init__(self):
+        self.violations = []
+
+    def write(self, violation):
+        self.violations.append(violation)
+
+
+def test_violation_text_and_encoding():
+    """Test that a violation prints as its error line and survives a verdict store round trip."""
+    assert str(BAD_NAME) == './docs/BadName.md: Filename should be lowercase'
+    assert Violation.decode(BAD_NAME.path, BAD_NAME.encode()) == BAD_NAME
+    assert Violation.decode(EMPTY.path, EMPTY.encode()) == EMPTY
+
+
+def test_writers():
+    """Test that each format writes one record per violation, with rule ID, severity and suggested name."""
+    stream = io.StringIO()
+    writer = TextWriter(stream)
+    assert write_violations([BAD_NAME, EMPTY], writer) == 1
+    assert stream.getvalue().splitlines() == [str(BAD_NAME), str(EMPTY)]
+
+    stream = io.StringIO()
+    writer = JsonLinesWriter(stream)
+    write_violations([BAD_NAME, EMPTY], writer)
+    records = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert records[0] == {'path': './docs/BadName.md', 'check': 'files', 'rule_id': 'lowercase', 'severity': 'error',
+                          'message': 'Filename should be lowercase', 'suggested_name': 'bad-name.md'}
+    assert records[1]['suggested_name'] is None
+
+    stream = io.StringIO()
+    writer = SarifWriter('naming-linter', stream)
+    write_violations([BAD_NAME, EMPTY, BAD_NAME._replace(path='/abs/My File.md')], writer)
+    writer.close()
+    log = json.loads(stream.getvalue())
+    assert log['version'] == '2.1.0'
+    run = log['runs'][0]
+    assert run['tool']['driver']['name'] == 'naming-linter'
+    assert [rule['id'] for rule in run['tool']['driver']['rules']] == ['files/lowercase', 'empty-files/empty-file']
+    first, second, third = run['results']
+    assert first['ruleId'] == 'files/lowercase' and first['ruleIndex'] == 0 and first['level'] == 'error'
+    assert first['locations'][0]['physicalLocation']['artifactLocation'] == {'uri': 'docs/BadName.md',
+                                                                             'uriBaseId': '%SRCROOT%'}
+    assert first['properties'] == {'suggestedName': 'bad-name.md'}
+    assert 'properties' not in second and second['ruleIndex'] == 1
+    assert third['locations'][0]['physicalLocation']['artifactLocation'] == {'uri': 'file:///abs/My%20File.md'}
+
+
+def test_sarif_rule_descriptions_are_static():
+    """Test that SARIF rules are described independently of the first violation's message."""
+    duplicate = Violation('./b.txt', 'duplicate-files', 'duplicate', ERROR, 'Duplicate of ./a.txt', None)
+    stream = io.StringIO()
+    writer = SarifWriter('naming-linter', stream)
+    write_violations([duplicate, duplicate._replace(path='./c.txt')], writer)
+    writer.close()
+    run = json.loads(stream.getvalue())['runs'][0]
+    assert run['tool']['driver']['rules'] == [{'id': 'duplicate-files/duplicate', 'shortDescription': {
+        'text': RULE_DESCRIPTIONS['duplicate-files/duplicate']}}]
+    assert [result['message']['text'] for result in run['results']] == ['Duplicate of ./a.txt'] * 2
+
+
+def test_every_rule_has_a_description():
+    """Test that every rule a plan can contain is described."""
+    sections = [{}, {'use-hyphen': False, 'use-pascal-case': True, 'reject-patterns': ['^x'],
+                     'python-files': {}, 'config-files': {'use-underscore': False}},
+                {'use-underscore': True, 'config-files': {'use-hyphen': False}}]
+    for allow_unicode in (False, True):
+        plans = list(compile_file_plans(None, allow_unicode))
+        plans.append(compile_directory_plan(None, allow_unicode))
+        for section in sections:
+            plans.extend(compile_file_plans({'files': section}, allow_unicode))
+            plans.append(compile_directory_plan({'directories': section}, allow_unicode))
+        for plan in plans:
+            check = 'directories' if plan.category == 'directory' else 'files'
+            for rule in plan.rules:
+                assert f"{check}/{rule.rule_id}" in RULE_DESCRIPTIONS, (check, rule.rule_id)
+
+
+def test_empty_sarif_log():
+    """Test that a run without violations still writes a valid SARIF log."""
+    stream = io.StringIO()
+    writer = SarifWriter('filename-linter', stream)
+    assert write_violations([], writer) == 0
+    writer.close()
+    assert json.loads(stream.getvalue())['runs'][0]['results'] == []
+
+
+def test_write_violations_counts_rules():
+    """Test that written violations count as fired rules, per check."""
+    stats = Stats()
+    write_violations([BAD_NAME, BAD_NAME, EMPTY], TextWriter(io.StringIO()), stats)
+    assert stats.rules == {'files': {'lowercase': 2}, 'empty-files': {'empty-file': 1}}
+    assert stats.phases['output'][2] == 3
+
+
+def test_checkers_stream_violations():
+    """Test that violations reach the writer while the check is still running, with suggested names."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        paths = [os.path.join(temp_dir, name) for name in ('UserGuide.md', 'notes.md', 'My Notes.txt')]
+        for path in paths:
+            open(path, 'w').close()
+
+        writer = RecordingWriter()
+        checker = FileNameChecker()
+        seen = []
+        original = checker.file_violations
+
+        def file_violations(filepath, suggest=True):
+            seen.append(len(writer.violations))
+            return original(filepath, suggest)
+
+        checker.file_violations = file_violations
+        assert checker.check_files(paths, writer) == 1
+        # The first file's violations were written before the last file was checked
+        assert seen[-1] > 0
+        assert {violation.suggestion for violation in writer.violations} == {'user-guide.md', 'my-notes.txt'}
+        assert all(violation.check == 'files' for violation in writer.violations)
+
+        writer = RecordingWriter()
+        assert EmptyFileChecker().check_files(paths, writer=writer) == 1
+        assert [violation.rule_id for violation in writer.violations] == ['empty-file'] * 3
+
+        # Without a writer, errors are printed as text, as before
+        stderr = io.StringIO()
+        with contextlib.redirect_stderr(stderr):
+            assert FileNameChecker().check_files(paths) == 1
+        assert f"{paths[0]}: Filename should be lowercase" in stderr.getvalue()
+
+
+def test_verdict_store_replays_violations():
+    """Test that violations replayed from the verdict store keep their rule IDs and suggestions."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        root = os.path.join(temp_dir, 'repo')
+        os.makedirs(os.path.join(root, 'My_Dir'))
+        for dirpath in [root, os.path.join(root, 'My_Dir')]:
+            os.utime(dirpath, (1000000000, 1000000000))
+        db_file = os.path.join(temp_dir, 'verdicts.sqlite3')
+        checker = DirectoryChecker()
+
+        results = []
+        for _ in range(2):
+            store = VerdictStore(db_file, 'directories', checker.store_fingerprint())
+            writer = RecordingWriter()
+            checker.check_tree(root, [], store, writer)
+            store.save()
+            results.append(writer.violations)
+        assert store.hits == 2
+        assert results[0] == results[1]
+        assert results[0][0].suggestion == 'my-dir'
+
+
+def test_check_repository_jsonl():
+    """Test that the single-pass check writes every check's violations as JSON Lines."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        os.makedirs(os.path.join(temp_dir, 'Bad_Dir'))
+        with open(os.path.join(temp_dir, 'BadName.md'), 'w') as f:
+            f.write('same\n')
+        with open(os.path.join(temp_dir, 'Bad_Dir', 'copy.md'), 'w') as f:
+            f.write('same\n')
+        open(os.path.join(temp_dir, 'empty-page.md'), 'w').close()
+
+        stream = io.StringIO()
+        checkers = (FileNameChecker(), DirectoryChecker(), EmptyFileChecker(), DuplicateFileChecker(cache_file=''))
+        assert check_repository(temp_dir, *checkers, writer=JsonLinesWriter(stream)) == 1
+        records = [json.loads(line) for line in stream.getvalue().splitlines()]
+
+        assert {record['check'] for record in records} == {'files', 'directories', 'empty-files', 'duplicate-files'}
+        by_path = {}
+        for record in records:
+            by_path.setdefault(os.path.basename(record['path']), []).append(record)
+        assert {record['suggested_name'] for record in by_path['Bad_Dir']} == {'bad-dir'}
+        assert [record['rule_id'] for record in by_path['empty-page.md']] == ['empty-file']
+        assert {record['rule_id'] for record in by_path['copy.md']} == {'duplicate'}
+        # Duplicates are only known once the walk is done
+        assert records[-1]['check'] == 'duplicate-files'
+
+
+def test_main_writes_sarif():
+    """Test that --format sarif prints a SARIF log on stdout and keeps the exit code."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        os.makedirs(os.path.join(temp_dir, 'Bad_Dir'))
+        cwd = os.getcwd()
+        argv = sys.argv
+        os.chdir(temp_dir)
+        try:
+            stdout = io.StringIO()
+            stderr = io.StringIO()
+            sys.argv = ['directory-linter', '--format', 'sarif']
+            with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+                exit_code = directory_checker.main()
+        finally:
+            sys.argv = argv
+            os.chdir(cwd)
+
+        assert exit_code == 1
+        assert stderr.getvalue() == ''
+        run = json.loads(stdout.getvalue())['runs'][0]
+        assert run['tool']['driver']['name'] == 'directory-linter'
+        assert {result['ruleId'] for result in run['results']} == {'directories/kebab-case', 'directories/lowercase'}
+        assert run['results'][0]['locations'][0]['physicalLocation']['artifactLocation']['uri'] == 'Bad_Dir'
+
+
+if __name__ == '__main__':
+    test_violation_text_and_encoding()
+    test_writers()
+    test_sarif_rule_descriptions_are_static()
+    test_every_rule_has_a_description()
+    test_empty_sarif_log()
+    test_write_violations_counts_rules()
+    test_checkers_stream_violations()
+    test_verdict_store_replays_violations()
+    test_check_repository_jsonl()
+    test_main_writes_sarif()
+    print("All violation tests passed!")
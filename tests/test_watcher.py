@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""Tests for watch mode: change watchers and incremental re-linting."""
+
+import contextlib
+import io
+import os
+import shutil
+import sys
+import tempfile
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from directory_checker import DirectoryChecker
+from duplicate_file_checker import DuplicateFileChecker
+from empty_file_checker import EmptyFileChecker
+from file_name_checker import FileNameChecker
+from naming_linter import IncrementalLinter, check_repository, watch_repository
+from watcher import InotifyWatcher, PollingWatcher
+
+
+def write_file(path, content):
+    """Write a file, creating its directory."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as f:
+        f.write(content)
+
+
+def make_checkers():
+    """Create one checker of each kind."""
+    return (FileNameChecker(), DirectoryChecker(), EmptyFileChecker(),
+            DuplicateFileChecker(cache_file=''))
+
+
+def full_errors(root):
+    """Return the sorted error lines of a full check of root."""
+    stderr = io.StringIO()
+    with contextlib.redirect_stderr(stderr):
+        check_repository(root, *make_checkers())
+    return sorted(line for line in stderr.getvalue().splitlines() if not line.endswith('):'))
+
+
+def incremental_errors(linter):
+    """Return the sorted errors an incremental linter currently knows about."""
+    return sorted(error for errors in linter.errors().values() for error in errors)
+
+
+def test_incremental_update_matches_full_scan():
+    """Test that updating changed paths gives the same errors as a full scan."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        write_file(os.path.join(temp_dir, 'docs', 'user-guide.md'), 'guide\n')
+        write_file(os.path.join(temp_dir, 'BadName.md'), 'same\n')
+        linter = IncrementalLinter(temp_dir, *make_checkers())
+        linter.full_scan()
+        assert incremental_errors(linter) == full_errors(temp_dir)
+
+        bad = os.path.join(temp_dir, 'BadName.md')
+        good = os.path.join(temp_dir, 'good-name.md')
+        copy = os.path.join(temp_dir, 'docs', 'copy-of-name.md')
+        new_dir = os.path.join(temp_dir, 'New_Dir')
+        os.rename(bad, good)
+        write_file(copy, 'same\n')
+        write_file(os.path.join(new_dir, 'sub', 'empty-page.md'), '')
+        linter.update([bad, good, copy, new_dir])
+        assert incremental_errors(linter) == full_errors(temp_dir)
+        assert any('Duplicate of' in error for error in incremental_errors(linter))
+
+        shutil.rmtree(new_dir)
+        write_file(copy, 'changed\n')
+        linter.update([new_dir, copy])
+        assert incremental_errors(linter) == full_errors(temp_dir) == []
+
+
+def test_unchanged_files_not_rehashed():
+    """Test that duplicate checks after an update only read changed files."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for name in ['first-copy.txt', 'second-copy.txt']:
+            write_file(os.path.join(temp_dir, name), 'same\n')
+            os.utime(os.path.join(temp_dir, name), (1000000000, 1000000000))
+        checkers = make_checkers()
+        linter = IncrementalLinter(temp_dir, *checkers)
+        linter.full_scan()
+
+        read_paths = []
+        original = checkers[3].get_partial_hash
+        checkers[3].get_partial_hash = lambda path, size: read_paths.append(path) or original(path, size)
+        third = os.path.join(temp_dir, 'third-copy.txt')
+        write_file(third, 'same\n')
+        linter.update([third])
+        assert read_paths == [third]
+        assert len(linter.errors()['duplicate-files']) == 3
+
+
+def test_default_exclusions_not_linted_or_watched():
+    """Test that .git and node_modules are neither linted nor watched when only file names are checked."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        write_file(os.path.join(temp_dir, '.git', 'HEAD'), 'ref: refs/heads/main\n')
+        write_file(os.path.join(temp_dir, '.git', 'refs', 'heads', 'main'), '0' * 40 + '\n')
+        write_file(os.path.join(temp_dir, 'node_modules', 'pkg', 'Bad_Name.js'), 'module.exports = 1;\n')
+        write_file(os.path.join(temp_dir, 'docs', 'user-guide.md'), 'guide\n')
+        linter = IncrementalLinter(temp_dir, FileNameChecker(), None, None, None)
+        linter.full_scan()
+        assert incremental_errors(linter) == []
+
+        try:
+            watcher = InotifyWatcher(temp_dir, linter.exclude_patterns)
+        except (OSError, AttributeError):
+            return  # Not Linux, or no inotify
+        try:
+            assert sorted(watcher.directories.values()) == [temp_dir, os.path.join(temp_dir, 'docs')]
+        finally:
+            watcher.close()
+
+
+def test_watch_reports_new_and_resolved_errors():
+    """Test that watch mode prints all errors once, then only the changes."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        bad = os.path.join(temp_dir, 'BadName.md')
+        write_file(bad, 'content\n')
+
+        class ScriptedWatcher:
+            """Apply one change per wait() and report it."""
+
+            def wait(self, timeout=None):
+                os.rename(bad, os.path.join(temp_dir, 'good-name.md'))
+                return {bad, os.path.join(temp_dir, 'good-name.md')}
+
+            def close(self):
+                pass
+
+        stderr = io.StringIO()
+        with contextlib.redirect_stderr(stderr):
+            exit_code = watch_repository(temp_dir, *make_checkers(), watcher=ScriptedWatcher(), max_updates=1)
+        lines = stderr.getvalue().splitlines()
+
+        assert exit_code == 0
+        assert lines[0] == 'File names (2 errors):'
+        assert 'File names (0 new, 2 resolved):' in lines
+        assert any(line.startswith('- ') and 'BadName.md' in line for line in lines)
+        assert not any(line.startswith('+ ') for line in lines)
+
+
+def test_polling_watcher_detects_changes():
+    """Test that polling reports created, modified and deleted paths."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        existing = os.path.join(temp_dir, 'existing-file.txt')
+        write_file(existing, 'one\n')
+        watcher = PollingWatcher(temp_dir, interval=0.01)
+
+        created = os.path.join(temp_dir, 'docs', 'new-file.txt')
+        write_file(created, 'new\n')
+        write_file(existing, 'changed content\n')
+        changed = watcher.wait(timeout=1)
+        assert changed == {created, os.path.dirname(created), existing}
+
+        os.unlink(existing)
+        assert watcher.wait(timeout=1) == {existing}
+        assert watcher.wait(timeout=0.05) == set()
+
+
+def test_inotify_watcher_detects_changes():
+    """Test that inotify reports changes, including inside new directories."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        try:
+            watcher = InotifyWatcher(temp_dir)
+        except (OSError, AttributeError):
+            return  # Not Linux, or no inotify
+        try:
+            new_dir = os.path.join(temp_dir, 'new-dir')
+            os.makedirs(new_dir)
+            assert new_dir in watcher.wait(timeout=2)
+
+            created = os.path.join(new_dir, 'new-file.txt')
+            write_file(created, 'new\n')
+            assert created in watcher.wait(timeout=2)
+            assert watcher.wait(timeout=0.05) == set()
+        finally:
+            watcher.close()
+
+
+if __name__ == '__main__':
+    test_incremental_update_matches_full_scan()
+    test_unchanged_files_not_rehashed()
+    test_default_exclusions_not_linted_or_watched()
+    test_watch_reports_new_and_resolved_errors()
+    test_polling_watcher_detects_changes()
+    test_inotify_watcher_detects_changes()
+    print("All watcher tests passed!")